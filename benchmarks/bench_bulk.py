@@ -0,0 +1,85 @@
+# Measures how many objects per second can be made and added to a window, by
+# building a 100x100 grid of squares and of circles.
+#
+# Two ways of building the grid are timed:
+# - making each object and adding it with Window.add
+# - making every object and then adding them all with Window.add_many
+# The number of calls made to the canvas per object is counted as well, since
+# with a real window each call goes through tkinter and costs far more than it
+# does here. This runs on the headless backend.
+#
+# Usage:
+#     python benchmarks/bench_bulk.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+SIDE = 100
+COUNT = SIDE * SIDE
+
+
+def _square(window, x, y):
+    return Square(window, 4, (x * 4 + 2, y * 4 + 2))
+
+
+def _circle(window, x, y):
+    return Circle(window, 2, (x * 4 + 2, y * 4 + 2))
+
+
+# Counts every call made to the window's canvas.
+def _count_calls(window):
+    canvas = window._canvas
+    calls = [0]
+    for name in ["create_polygon", "create_oval", "itemconfigure", "coords",
+                 "tag_raise", "tag_lower", "addtag_withtag", "delete"]:
+        def counted(*args, _method=getattr(canvas, name), **options):
+            calls[0] += 1
+            return _method(*args, **options)
+        setattr(canvas, name, counted)
+    return calls
+
+
+def _one_at_a_time(window, make):
+    for x in range(SIDE):
+        for y in range(SIDE):
+            window.add(make(window, x, y))
+
+
+def _all_at_once(window, make):
+    shapes = [make(window, x, y) for x in range(SIDE) for y in range(SIDE)]
+    window.add_many(shapes)
+
+
+# Returns the objects per second of the best of three builds, and the canvas
+# calls per object.
+def _bench(build, make):
+    best = None
+    for i in range(3):
+        window = Window(SIDE * 4, SIDE * 4, "white", "bench",
+                        lambda window: None, backend=HeadlessBackend())
+        calls = _count_calls(window)
+        start = time.perf_counter()
+        build(window, make)
+        seconds = time.perf_counter() - start
+        if best is None or seconds < best:
+            best = seconds
+    return COUNT / best, calls[0] / COUNT
+
+
+def main():
+    print("%dx%d grid" % (SIDE, SIDE))
+    print("%-30s %16s %16s" % ("", "objects/second", "calls/object"))
+    for shape, make in [("squares", _square), ("circles", _circle)]:
+        for name, build in [("add", _one_at_a_time),
+                            ("add_many", _all_at_once)]:
+            print("%-30s %16.0f %16.1f" %
+                  (("%s, %s" % (shape, name),) + _bench(build, make)))
+
+
+if __name__ == "__main__":
+    main()
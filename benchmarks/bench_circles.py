@@ -0,0 +1,84 @@
+# Compares circles drawn as canvas ovals with circles drawn the old way, as
+# 200-point polygons.
+#
+# The old way is reproduced with a Polygon made of the same 200 points the old
+# Circle used. Creation (making the object and adding it to the window) and
+# moving are timed for small and large circles, and for a turned Oval, which is
+# still drawn as a polygon but with as many points as its size needs. This runs
+# on the headless backend, so it measures the library's own work rather than
+# tkinter's.
+#
+# Usage:
+#     python benchmarks/bench_circles.py
+
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+COUNT = 2000
+MOVES = 5
+
+
+# Returns the 200 points the old Circle was made of.
+def _old_circle_points(radius, center):
+    points = []
+    for i in range(200):
+        theta = (math.pi * 2) * float(i) / 200
+        points.append((round(radius * math.cos(theta)) + center[0],
+                       round(radius * math.sin(theta)) + center[1]))
+    return points
+
+
+def _old_circle(window, radius, center):
+    return Polygon(window, _old_circle_points(radius, center))
+
+
+def _new_circle(window, radius, center):
+    return Circle(window, radius, center)
+
+
+def _turned_oval(window, radius, center):
+    oval = Oval(window, radius, radius // 2, center)
+    oval.rotate(30)
+    return oval
+
+
+# Returns the microseconds it takes to make and add one shape, and to move
+# one shape.
+def _bench(make, radius):
+    window = Window(400, 400, "white", "bench", lambda window: None,
+                    backend=HeadlessBackend())
+    start = time.perf_counter()
+    shapes = []
+    for i in range(COUNT):
+        shape = make(window, radius, (i % 400, i // 5 % 400))
+        window.add(shape)
+        shapes.append(shape)
+    create = (time.perf_counter() - start) / COUNT * 1e6
+    start = time.perf_counter()
+    for i in range(MOVES):
+        for shape in shapes:
+            shape.move(1, 1)
+    move = (time.perf_counter() - start) / (COUNT * MOVES) * 1e6
+    return create, move
+
+
+def main():
+    print("microseconds per shape, %d shapes" % COUNT)
+    print("%-28s %10s %10s" % ("", "create", "move"))
+    for radius in [3, 40]:
+        for name, make in [("200-point polygon (old)", _old_circle),
+                           ("Circle", _new_circle),
+                           ("Oval turned 30 degrees", _turned_oval)]:
+            create, move = _bench(make, radius)
+            print("%-28s %10.1f %10.1f" %
+                  ("%s, r=%d" % (name, radius), create, move))
+
+
+if __name__ == "__main__":
+    main()
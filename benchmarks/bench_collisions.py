@@ -0,0 +1,109 @@
+# Times Window.get_collisions on scenes of moving bodies.
+#
+# Squares, circles and turned ovals are spread over a 1280x960 window and all
+# of them are moved every frame, so every frame has to update the index as
+# well as find the collisions. The checking every pair approach games used
+# before is timed alongside for comparison, using the same overlap test, on
+# the smaller scenes (it takes far too long on the big ones). This runs on the
+# headless backend, so moving costs what the library does rather than what
+# tkinter does. The "move" column shows that part on its own, and "detection"
+# is get_collisions without it, which is what has to fit in a frame alongside
+# drawing (16 ms at 60 frames per second).
+#
+# Usage:
+#     python benchmarks/bench_collisions.py
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+from cs110graphics import _overlap
+
+SIZES = [500, 1000, 2000, 4000]
+FRAMES = 10
+WIDTH = 1280
+HEIGHT = 960
+
+
+def _scene(count):
+    window = Window(WIDTH, HEIGHT, "white", "bench", lambda window: None,
+                    backend=HeadlessBackend())
+    rng = random.Random(1)
+    bodies = []
+    for i in range(count):
+        center = (rng.randrange(WIDTH), rng.randrange(HEIGHT))
+        kind = i % 3
+        if kind == 0:
+            body = Square(window, rng.randrange(6, 20), center)
+            body.rotate(rng.randrange(90))
+        elif kind == 1:
+            body = Circle(window, rng.randrange(3, 10), center)
+        else:
+            body = Oval(window, rng.randrange(4, 12), rng.randrange(2, 6),
+                        center)
+            body.rotate(rng.randrange(180))
+        window.add(body)
+        velocity = (rng.choice([-2, -1, 1, 2]), rng.choice([-2, -1, 1, 2]))
+        bodies.append((body, velocity))
+    return window, bodies
+
+
+def _move(bodies, frame):
+    # bodies turn around every 20 frames so they stay in the window
+    sign = 1 if frame // 20 % 2 == 0 else -1
+    for body, (dx, dy) in bodies:
+        body.move(dx * sign, dy * sign)
+
+
+# Checks every pair's bounding boxes, and then their shapes if the boxes
+# overlap.
+def _every_pair(window, bodies):
+    shapes = [(body, body._bounds(), body._shape())
+              for body, velocity in bodies]
+    pairs = []
+    for i in range(len(shapes)):
+        first, (ax0, ay0, ax1, ay1), first_shape = shapes[i]
+        for j in range(i + 1, len(shapes)):
+            second, (bx0, by0, bx1, by1), second_shape = shapes[j]
+            if ax0 > bx1 or bx0 > ax1 or ay0 > by1 or by0 > ay1:
+                continue
+            if _overlap(first_shape, second_shape):
+                pairs.append((first, second))
+    return pairs
+
+
+# Returns the average milliseconds per frame of moving every body and then
+# running find, and how many pairs were found on the last frame.
+def _time(window, bodies, find):
+    start = time.perf_counter()
+    for frame in range(FRAMES):
+        _move(bodies, frame)
+        pairs = find(window, bodies)
+    return (time.perf_counter() - start) / FRAMES * 1000, len(pairs)
+
+
+def main():
+    print("milliseconds per frame, moving every body each frame")
+    print("%8s %10s %16s %10s %14s %8s" %
+          ("bodies", "move", "get_collisions", "detection", "every pair",
+           "pairs"))
+    for count in SIZES:
+        window, bodies = _scene(count)
+        move, pairs = _time(window, bodies, lambda window, bodies: [])
+        found, pairs = _time(window, bodies,
+                             lambda window, bodies: window.get_collisions())
+        if count <= 1000:
+            every, pairs = _time(window, bodies, _every_pair)
+            every = "%14.1f" % every
+        else:
+            every = "%14s" % "-"
+        print("%8d %10.1f %16.1f %10.1f %s %8d" %
+              (count, move, found, found - move, every, pairs))
+
+
+if __name__ == "__main__":
+    main()
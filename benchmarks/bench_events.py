@@ -0,0 +1,114 @@
+# Counts the memory allocated for Event objects, measured with tracemalloc.
+#
+# The old Event is reproduced as it was: a regular object which copied five
+# fields out of tkinter's event (making two tuples) and rebuilt its lookup
+# dictionaries on every call to get_button and get_description. 10,000 events
+# are made and each one is asked for its location, button and description, the
+# way a handler would. Everything is kept alive until it's measured, so the
+# numbers are what 10,000 events cost before the garbage collector gets to
+# them. The stand-in tkinter events are made beforehand and aren't counted.
+#
+# Usage:
+#     python benchmarks/bench_events.py
+
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+EVENTS = 10000
+
+
+# What tkinter gives a binding, with only the fields Event reads.
+class _TkEvent:
+    def __init__(self, i):
+        self.x = i % 400
+        self.y = i // 400
+        self.x_root = self.x + 200
+        self.y_root = self.y + 200
+        self.num = 1
+        self.keysym = "??"
+        self.type = "4"
+
+
+# The old Event.
+class _OldEvent:
+    def __init__(self, event):
+        self._type = event.type
+        self._location = (event.x, event.y)
+        self._rootLocation = (event.x_root, event.y_root)
+        self._keysym = event.keysym
+        self._num = event.num
+
+    def get_button(self):
+        if self._num == "??":
+            return None
+        numTranslation = {
+            1: "Left Mouse Button",
+            2: "Middle Mouse Button",
+            3: "Right Mouse Button"
+        }
+        return numTranslation[self._num]
+
+    def get_description(self):
+        descriptionTranslation = {
+            '2': "Key Press",
+            '3': "Key Release",
+            '4': "Mouse Press",
+            '5': "Mouse Release",
+            '6': "Mouse Move",
+            '7': "Mouse Enter",
+            '8': "Mouse Leave",
+        }
+        return descriptionTranslation[self._type]
+
+    def get_mouse_location(self):
+        return self._location
+
+
+# Makes and reads an event for each tkinter event, keeping everything. Returns
+# the results so they stay alive while memory is measured.
+def _handle(make, tk_events):
+    kept = []
+    for tk_event in tk_events:
+        event = make(tk_event)
+        kept.append((event, event.get_mouse_location(), event.get_button(),
+                     event.get_description()))
+    return kept
+
+
+# Returns (blocks, bytes) allocated by handling the events, along with the
+# peak bytes in use and the microseconds per event.
+def _bench(make):
+    tk_events = [_TkEvent(i) for i in range(EVENTS)]
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = _handle(make, tk_events)
+    after = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    blocks = sum(stat.count_diff for stat in stats)
+    size = sum(stat.size_diff for stat in stats)
+    del kept
+    start = time.perf_counter()
+    for i in range(10):
+        _handle(make, tk_events)
+    speed = (time.perf_counter() - start) / (10 * EVENTS) * 1e6
+    return blocks, size, peak, speed
+
+
+def main():
+    print("per %d events" % EVENTS)
+    print("%-12s %10s %12s %12s %14s" %
+          ("", "blocks", "bytes", "peak bytes", "us per event"))
+    for name, make in [("old Event", _OldEvent), ("Event", Event)]:
+        print("%-12s %10d %12d %12d %14.2f" % ((name,) + _bench(make)))
+
+
+if __name__ == "__main__":
+    main()
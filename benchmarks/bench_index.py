@@ -0,0 +1,122 @@
+# Compares Window.objects_at and Window.objects_in with scanning every object.
+#
+# 10,000 squares, circles and turned ovals are spread over a 2000x2000 window.
+# The brute force scan checks each object's bounding box (and, for points, its
+# outline) the same way the index does, so both return the same objects. The
+# cost of keeping the index up to date is timed as well, by moving a tenth of
+# the objects before every query. This runs on the headless backend.
+#
+# Usage:
+#     python benchmarks/bench_index.py
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+COUNT = 10000
+SIZE = 2000
+QUERIES = 500
+
+
+def _scene():
+    window = Window(SIZE, SIZE, "white", "bench", lambda window: None,
+                    backend=HeadlessBackend())
+    rng = random.Random(1)
+    shapes = []
+    for i in range(COUNT):
+        center = (rng.randrange(SIZE), rng.randrange(SIZE))
+        kind = i % 3
+        if kind == 0:
+            shape = Square(window, rng.randrange(4, 40), center)
+        elif kind == 1:
+            shape = Circle(window, rng.randrange(2, 20), center)
+        else:
+            shape = Oval(window, rng.randrange(4, 30), rng.randrange(2, 15),
+                         center)
+            shape.rotate(rng.randrange(360))
+        window.add(shape)
+        shapes.append(shape)
+    return window, shapes
+
+
+def _scan_at(window, point):
+    found = []
+    for graphic in window._graphics:
+        x0, y0, x1, y1 = graphic._bounds()
+        if x0 <= point[0] <= x1 and y0 <= point[1] <= y1 and \
+           graphic._contains(point):
+            found.append(graphic)
+    return found
+
+
+def _scan_in(window, bbox):
+    found = []
+    for graphic in window._graphics:
+        x0, y0, x1, y1 = graphic._bounds()
+        if x0 <= bbox[2] and bbox[0] <= x1 and y0 <= bbox[3] and \
+           bbox[1] <= y1:
+            found.append(graphic)
+    return found
+
+
+# Returns the average microseconds per call of query on each argument.
+def _time(query, arguments):
+    start = time.perf_counter()
+    for argument in arguments:
+        query(argument)
+    return (time.perf_counter() - start) / len(arguments) * 1e6
+
+
+def main():
+    window, shapes = _scene()
+    rng = random.Random(2)
+    points = [(rng.randrange(SIZE), rng.randrange(SIZE))
+              for i in range(QUERIES)]
+    boxes = []
+    for i in range(QUERIES):
+        x, y = rng.randrange(SIZE - 100), rng.randrange(SIZE - 100)
+        boxes.append((x, y, x + 100, y + 100))
+    # builds the index before timing queries
+    window.objects_at((0, 0))
+    for point in points[:50]:
+        assert set(window.objects_at(point)) == set(_scan_at(window, point))
+    for bbox in boxes[:50]:
+        assert set(window.objects_in(bbox)) == set(_scan_in(window, bbox))
+
+    print("microseconds per query, %d objects" % COUNT)
+    print("%-34s %12s %12s" % ("", "scan", "index"))
+    print("%-34s %12.1f %12.1f" % (
+        "objects_at(point)",
+        _time(lambda point: _scan_at(window, point), points),
+        _time(window.objects_at, points)))
+    print("%-34s %12.1f %12.1f" % (
+        "objects_in(100x100 box)",
+        _time(lambda bbox: _scan_in(window, bbox), boxes[:50]),
+        _time(window.objects_in, boxes)))
+
+    # moving objects makes the index update them before the next query
+    moving = shapes[:COUNT // 10]
+
+    def moved_then_at(point):
+        for shape in moving:
+            shape.move(1, 0)
+        return window.objects_at(point)
+
+    def moved_then_scan(point):
+        for shape in moving:
+            shape.move(1, 0)
+        return _scan_at(window, point)
+
+    print("%-34s %12.1f %12.1f" % (
+        "%d moves, then objects_at" % len(moving),
+        _time(moved_then_scan, points[:50]),
+        _time(moved_then_at, points[:50])))
+
+
+if __name__ == "__main__":
+    main()
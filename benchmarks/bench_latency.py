@@ -0,0 +1,222 @@
+# Measures how quickly the main loop started by StartGraphicsSystem responds.
+#
+# Two things are measured:
+# - keypress-to-handler latency: another thread sends key presses at random
+#   moments, the way input arrives from outside the program, and the time
+#   until handle_key_press runs is recorded. Each press is a byte written to a
+#   pipe which the main loop watches, the same way it watches its connection
+#   to the display, so a press is only noticed when the loop next checks for
+#   events. With a display, the loop turns each press into a real <Key> event
+#   on the canvas; without one, it calls the handler itself.
+# - timer jitter: a Timer asks to run at 60 Hz and the difference between each
+#   measured interval and the requested one is recorded
+#
+# Without a display (or with --no-display) the window draws on the headless
+# canvas, but still runs on tkinter's real event loop and the real clock, so
+# the loop is timed the same way. --module times another copy of
+# cs110graphics.py instead of this one, such as an older version:
+#     git show <commit>:cs110graphics.py > /tmp/old_cs110graphics.py
+#     python benchmarks/bench_latency.py --module /tmp/old_cs110graphics.py
+# If the presses or timer haven't finished after DEADLINE seconds, the window
+# is closed and whatever was measured is reported.
+#
+# Usage:
+#     python benchmarks/bench_latency.py [--module path] [--no-display]
+
+import argparse
+import collections
+import importlib.util
+import os
+import random
+import statistics
+import sys
+import threading
+import time
+import tkinter
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import cs110graphics
+
+KEY_PRESSES = 200
+TIMER_TICKS = 300
+# the interval closest to 60 Hz that a Timer can be given
+TIMER_INTERVAL = 16
+DEADLINE = 60
+
+
+# Stands in for Tk when there's no display: a Tcl interpreter without Tk,
+# whose event loop is run by hand since tkinter's mainloop returns at once
+# when there are no windows.
+class _NoDisplayRoot(tkinter.Tk):
+    # the root made most recently, which the canvas is drawn for
+    latest = None
+
+    def __init__(self):
+        tkinter.Tk.__init__(self, useTk=False)
+        self._closed = False
+        _NoDisplayRoot.latest = self
+
+    def title(self, name=None):
+        pass
+
+    def mainloop(self, n=0):
+        while not self._closed:
+            self.tk.dooneevent(0)
+
+    def update(self):
+        if self._closed:
+            raise tkinter.TclError("application has been destroyed")
+        tkinter.Tk.update(self)
+
+    def destroy(self):
+        self._closed = True
+
+
+class _NoDisplayFrame:
+    def __init__(self, master=None, **options):
+        pass
+
+    def pack(self, **options):
+        pass
+
+
+# The headless canvas, run by a _NoDisplayRoot. Older versions of
+# cs110graphics wait and update through the canvas.
+class _NoDisplayCanvas(cs110graphics._HeadlessCanvas):
+    def __init__(self, master=None, **options):
+        cs110graphics._HeadlessCanvas.__init__(self)
+        self._root = _NoDisplayRoot.latest
+
+    def update(self):
+        self._root.update()
+
+    def after(self, *args):
+        return self._root.after(*args)
+
+
+# Returns whether a window can be opened.
+def _has_display():
+    try:
+        tkinter.Tk().destroy()
+    except tkinter.TclError:
+        return False
+    return True
+
+
+def _load(path):
+    if path is None:
+        return cs110graphics
+    spec = importlib.util.spec_from_file_location("cs110graphics_timed", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# Prints the mean, 95th percentile and maximum of a list of milliseconds.
+def _report(name, values):
+    if not values:
+        print("%-28s nothing measured" % name)
+        return
+    values = sorted(values)
+    print("%-28s mean %7.2f ms   p95 %7.2f ms   max %7.2f ms" %
+          (name, statistics.mean(values),
+           values[max(0, int(len(values) * 0.95) - 1)], values[-1]))
+
+
+def _benchmark(library, display):
+    # when each press was sent, oldest first
+    sent = collections.deque()
+    latencies = []
+    ticks = []
+    reading, writing = os.pipe()
+
+    class KeyTimer(library.EventHandler):
+        def __init__(self):
+            library.EventHandler.__init__(self)
+
+        def handle_key_press(self, event):
+            latencies.append((time.perf_counter() - sent.popleft()) * 1000)
+
+    def main(window):
+        handler = KeyTimer()
+        square = library.Square(window)
+        square.add_handler(handler)
+        window.add(square)
+        root = window._root
+        closed = []
+
+        def tick():
+            ticks.append(time.perf_counter())
+            if len(ticks) == TIMER_TICKS:
+                timer.stop()
+
+        timer = library.Timer(window, TIMER_INTERVAL, tick)
+
+        # runs when the loop notices a press waiting in the pipe
+        def press(fd, mask):
+            os.read(fd, 1)
+            if display:
+                window._canvas.event_generate("<Key>", keysym="a")
+            else:
+                handler.handle_key_press(None)
+
+        root.createfilehandler(reading, tkinter.READABLE, press)
+
+        def send_presses():
+            for i in range(KEY_PRESSES):
+                time.sleep(random.uniform(0.005, 0.05))
+                if closed:
+                    return
+                sent.append(time.perf_counter())
+                os.write(writing, b"k")
+
+        deadline = time.perf_counter() + DEADLINE
+
+        # waits for the presses and the timer to finish, or for the deadline,
+        # before closing the window
+        def finish():
+            done = len(latencies) == KEY_PRESSES and len(ticks) >= TIMER_TICKS
+            if not done and time.perf_counter() < deadline:
+                root.after(100, finish)
+                return
+            closed.append(True)
+            root.deletefilehandler(reading)
+            _report("keypress-to-handler", latencies)
+            if len(latencies) < KEY_PRESSES:
+                print("%d of the %d presses never reached the handler" %
+                      (KEY_PRESSES - len(latencies), KEY_PRESSES))
+            intervals = [(b - a) * 1000 for a, b in zip(ticks, ticks[1:])]
+            _report("timer jitter at 60 Hz",
+                    [abs(i - TIMER_INTERVAL) for i in intervals])
+            root.destroy()
+
+        timer.start()
+        threading.Thread(target=send_presses, daemon=True).start()
+        root.after(100, finish)
+
+    library.StartGraphicsSystem(main)
+    os.close(reading)
+    os.close(writing)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Times how quickly the main loop responds.")
+    parser.add_argument("--module",
+                        help="a copy of cs110graphics.py to time instead")
+    parser.add_argument("--no-display", action="store_true",
+                        help="use the headless canvas even with a display")
+    arguments = parser.parse_args()
+    library = _load(arguments.module)
+    display = not arguments.no_display and _has_display()
+    if not display:
+        print("no display, so the headless canvas is used")
+        library.Tk = _NoDisplayRoot
+        library.Frame = _NoDisplayFrame
+        library.Canvas = _NoDisplayCanvas
+    _benchmark(library, display)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# Measures how many bytes each kind of object takes up, with tracemalloc.
+#
+# 5,000 objects of each kind are made and the memory allocated while making
+# them is divided by the count. They're measured twice: once just made, and
+# once added to a window, which is when they get a canvas item, a place in the
+# window's scene and the options and points they've sent to the canvas. The
+# canvas's own record of each item is left out, since with a real window that
+# memory belongs to Tk rather than to Python. This runs on the headless
+# backend. Images all show the same picture, which is shared, so the picture
+# itself isn't counted.
+#
+# Usage:
+#     python benchmarks/bench_memory.py
+
+import gc
+import inspect
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PIL import Image as image
+
+import cs110graphics
+from cs110graphics import *
+
+COUNT = 5000
+# Image looks for pictures relative to the current directory
+PICTURE = os.path.relpath(os.path.join(os.path.dirname(__file__),
+                                       "_bench_memory.png"))
+
+
+def _makers():
+    return [
+        ("Circle", lambda window, i: Circle(window, 5, (i % 400, i // 400))),
+        ("Oval", lambda window, i: Oval(window, 5, 8, (i % 400, i // 400))),
+        ("Square", lambda window, i: Square(window, 5, (i % 400, i // 400))),
+        ("Rectangle",
+         lambda window, i: Rectangle(window, 5, 8, (i % 400, i // 400))),
+        ("Polygon", lambda window, i: Polygon(window, [(i % 400, 0),
+                                                       (10, 10), (0, 10)])),
+        ("Text", lambda window, i: Text(window, "hi", 12,
+                                        (i % 400, i // 400))),
+        ("Image", lambda window, i: Image(window, PICTURE, 10, 10,
+                                          (i % 400, i // 400))),
+    ]
+
+
+# Returns the bytes allocated per object by calling build. Allocations are
+# put down to the line which made them, so the ones made by the headless
+# canvas can be left out.
+def _measure(build):
+    lines, first = inspect.getsourcelines(cs110graphics._HeadlessCanvas)
+    canvas = range(first, first + len(lines))
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    del kept
+    size = 0
+    for stat in after.compare_to(before, "lineno"):
+        frame = stat.traceback[0]
+        if frame.filename != cs110graphics.__file__ or \
+           frame.lineno not in canvas:
+            size += stat.size_diff
+    return size / COUNT
+
+
+# Returns the bytes per object once made and once added to a window.
+def _bench(make):
+    window = Window(400, 400, "white", "bench", lambda window: None,
+                    backend=HeadlessBackend())
+    shapes = []
+    made = _measure(lambda: shapes.extend(make(window, i)
+                                          for i in range(COUNT)))
+    added = _measure(lambda: window.add_many(shapes))
+    return made, made + added
+
+
+def main():
+    image.new("RGB", (10, 10), "red").save(PICTURE)
+    try:
+        print("bytes per object, %d objects" % COUNT)
+        print("%-12s %10s %10s" % ("", "made", "added"))
+        for name, make in _makers():
+            print("%-12s %10.0f %10.0f" % ((name,) + _bench(make)))
+    finally:
+        os.remove(PICTURE)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# Measures frames per second for a ParticleSystem, moving and drawing every
+# particle each frame.
+#
+# Each frame calls update, which moves the particles and draws them into the
+# system's one picture, and then draws the window, as a Timer would. The same
+# scene is timed with the particles kept in numpy arrays and in plain lists
+# (what's used when numpy isn't installed), and against the old way of making
+# particles, one Circle per particle. This runs on the headless backend, which
+# draws the window with PIL, so the "window" column includes the cost of
+# drawing the frame.
+#
+# Usage:
+#     python benchmarks/bench_particles.py
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import cs110graphics
+from cs110graphics import *
+
+SIZES = [100, 1000, 10000]
+FRAMES = 20
+WIDTH = 640
+HEIGHT = 480
+
+
+def _window():
+    return Window(WIDTH, HEIGHT, "white", "bench", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+def _system(count, lists):
+    numpy = cs110graphics.numpy
+    if lists:
+        cs110graphics.numpy = None
+    window = _window()
+    system = ParticleSystem(window, gravity=(0, 50))
+    cs110graphics.numpy = numpy
+    window.add(system)
+    random.seed(1)
+    # particles live longer than the benchmark, so none are removed
+    system.burst(count, (WIDTH // 2, HEIGHT // 2), 100, "orange", 100000)
+
+    def frame():
+        system.update(16)
+
+    return window, frame
+
+
+def _circles(count):
+    window = _window()
+    rng = random.Random(1)
+    circles = []
+    for i in range(count):
+        circle = Circle(window, 1, (WIDTH // 2, HEIGHT // 2))
+        circle.set_fill_color("orange")
+        circle.set_border_width(0)
+        window.add(circle)
+        circles.append((circle, rng.choice([-2, -1, 1, 2]),
+                        rng.choice([-2, -1, 1, 2])))
+
+    def frame():
+        for circle, dx, dy in circles:
+            circle.move(dx, dy)
+
+    return window, frame
+
+
+# Returns frames per second of just the frame, and of the frame followed by
+# drawing the window.
+def _fps(window, frame):
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        frame()
+    alone = FRAMES / (time.perf_counter() - start)
+    start = time.perf_counter()
+    for i in range(FRAMES):
+        frame()
+        window.get_image()
+    drawn = FRAMES / (time.perf_counter() - start)
+    return alone, drawn
+
+
+def main():
+    print("frames per second, %dx%d window" % (WIDTH, HEIGHT))
+    print("%-10s %-26s %12s %12s" % ("particles", "", "update", "window"))
+    for count in SIZES:
+        rows = [("ParticleSystem, numpy", lambda: _system(count, False)),
+                ("ParticleSystem, lists", lambda: _system(count, True))]
+        if count <= 1000:
+            rows.append(("a Circle each", lambda: _circles(count)))
+        for name, make in rows:
+            if name.endswith("numpy") and cs110graphics.numpy is None:
+                continue
+            print("%-10d %-26s %12.1f %12.1f" % ((count, name) +
+                                                 _fps(*make())))
+
+
+if __name__ == "__main__":
+    main()
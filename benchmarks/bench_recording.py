@@ -0,0 +1,63 @@
+# Measures how many frames per second a recording can draw and save.
+#
+# A scene of moving shapes is run on the headless backend and recorded as an
+# animated GIF and as a PNG sequence. Since the backend's clock is simulated,
+# the recorder never drops frames, so the figures show how fast frames can be
+# saved rather than how fast the program runs.
+#
+# Usage:
+#     python benchmarks/bench_recording.py
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+SHAPES = 100
+SECONDS = 5
+FRAME_RATE = 30
+
+
+def _scene(filename):
+    def main(window):
+        shapes = []
+        for i in range(SHAPES):
+            if i % 2:
+                shape = Square(window, 20, (i * 4 % 400, i * 7 % 400))
+            else:
+                shape = Circle(window, 10, (i * 4 % 400, i * 7 % 400))
+            shape.set_fill_color(["red", "green", "blue", "yellow"][i % 4])
+            window.add(shape)
+            shapes.append(shape)
+
+        def step():
+            for shape in shapes:
+                shape.move(1, 1)
+
+        Timer(window, 16, step).start()
+        window.start_recording(filename, FRAME_RATE)
+    return main
+
+
+def _run(name, filename):
+    start = time.perf_counter()
+    window = StartGraphicsSystem(_scene(filename),
+                                 backend=HeadlessBackend(SECONDS * 1000))
+    elapsed = time.perf_counter() - start
+    stats = window.get_recording_stats()
+    print("%-14s %5d frames   %7.1f fps saving   %7.1f fps overall" %
+          (name, stats["frames"], stats["fps"], stats["frames"] / elapsed))
+
+
+def main():
+    folder = tempfile.mkdtemp()
+    _run("animated GIF", os.path.join(folder, "scene.gif"))
+    _run("PNG sequence", os.path.join(folder, "scene%04d.png"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+# Measures the per-operation cost of the scene registry used by Window.
+#
+# Each operation is timed on scenes from 100 to 50,000 objects. Since every
+# operation is O(1) or O(log d), the cost per operation should stay flat as the
+# scene grows.
+#
+# Usage:
+#     python benchmarks/bench_registry.py
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import _SceneRegistry
+
+SIZES = [100, 1000, 10000, 50000]
+# number of operations timed at every size
+OPERATIONS = 2000
+
+
+# A stand-in for a GraphicalObject with only the attributes the registry reads.
+class _Graphic:
+    def __init__(self, tag, depth):
+        self._tag = tag
+        self._depth = depth
+
+
+# Builds a registry of the given size spread over 100 distinct depths.
+def _scene(size):
+    registry = _SceneRegistry()
+    graphics = [_Graphic(i, i % 100) for i in range(size)]
+    for graphic in graphics:
+        registry.add(graphic)
+    return registry, graphics
+
+
+# Returns the average time in microseconds of running func on each of the
+# first OPERATIONS graphics.
+def _time(func, graphics):
+    sample = graphics[:OPERATIONS]
+    start = time.perf_counter()
+    for graphic in sample:
+        func(graphic)
+    return (time.perf_counter() - start) / len(sample) * 1e6
+
+
+def _bench_add_remove(size):
+    registry, graphics = _scene(size)
+    extra = [_Graphic(size + i, i % 100) for i in range(OPERATIONS)]
+    add = _time(registry.add, extra)
+    remove = _time(registry.remove, extra)
+    return add, remove
+
+
+def _bench_retag(size):
+    registry, graphics = _scene(size)
+
+    def retag(graphic):
+        graphic._tag = -graphic._tag - 1
+        registry.retag(graphic)
+    return _time(retag, graphics)
+
+
+def _bench_set_depth(size):
+    registry, graphics = _scene(size)
+
+    def set_depth(graphic):
+        registry.set_depth(graphic, (registry.depth(graphic) + 37) % 100)
+    return _time(set_depth, graphics)
+
+
+def _bench_lookup(size):
+    registry, graphics = _scene(size)
+
+    def lookup(graphic):
+        registry.depth(registry.find(graphic._tag))
+    return _time(lookup, graphics)
+
+
+def main():
+    print("microseconds per operation")
+    print("%8s %10s %10s %10s %10s %10s" %
+          ("objects", "add", "remove", "retag", "set_depth", "lookup"))
+    for size in SIZES:
+        add, remove = _bench_add_remove(size)
+        print("%8d %10.3f %10.3f %10.3f %10.3f %10.3f" %
+              (size, add, remove, _bench_retag(size), _bench_set_depth(size),
+               _bench_lookup(size)))
+
+
+if __name__ == "__main__":
+    main()
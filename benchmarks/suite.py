@@ -0,0 +1,425 @@
+# Times the library's core operations on scenes of different sizes, and saves
+# the results as JSON so two runs can be compared.
+#
+# Each case makes a scene of n objects and times doing one operation to every
+# object in it: making them, adding them, moving, turning, scaling, changing
+# their depth, removing them, resizing and turning images, and passing a mouse
+# press to each object's handler. Results are microseconds per object, and
+# the median of several runs is kept. Scenes mix squares, rectangles,
+# circles, ovals and triangles, and each run uses a new scene, so operations
+# which change objects (like scale) always start from the same place.
+#
+# Images are timed both ways the image cache can go. The "_cached" cases
+# first make every picture they'll show, so they time finding it in the
+# cache. The "_uncached" cases turn the cache off while they're timed, so
+# every operation opens the file and resamples the picture again, which is
+# what the first image of each size costs. Each image case starts with an
+# empty cache.
+#
+# By default this runs on the headless backend, so it measures the library
+# rather than tkinter. The headless canvas keeps its stacking order in a list,
+# so cases which restack items (set_depth, and rotate when an oval swaps its
+# item) grow with the size of the scene there, as they do with Tk.
+# "--backend tk" opens real windows instead, which needs a display; on a
+# machine without one, run it under a virtual display such as xvfb-run.
+#
+# The results file looks like:
+#     {"format": 1, "python": "3.11.7", "platform": "...", "backend":
+#      "headless", "repeat": 5, "created": "2026-01-01T12:00:00",
+#      "results": {"move": {"10": {"median": 1.9, "min": 1.8}, ...}, ...}}
+# where the numbers are microseconds per object. Comparing two files prints
+# how each case changed and exits with status 1 if any case got slower by more
+# than the threshold, so it can be used to catch slowdowns automatically.
+#
+# Usage:
+#     python benchmarks/suite.py run [--output results.json] [--sizes 10,100]
+#                                    [--cases move,rotate] [--repeat 5]
+#                                    [--backend headless|tk]
+#     python benchmarks/suite.py compare old.json new.json [--threshold 10]
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from PIL import Image as image
+
+from cs110graphics import *
+
+FORMAT = 1
+SIZES = [10, 100, 1000, 10000]
+REPEAT = 5
+# small scenes are timed several times over, so each run does at least this
+# many operations
+OPERATIONS = 2000
+WIDTH = 800
+HEIGHT = 800
+# the image cache's size in megabytes, which is its default
+IMAGE_CACHE = 64
+
+
+# What tkinter gives a binding, with only the fields Event reads.
+class _TkEvent:
+    x = 10
+    y = 10
+    x_root = 10
+    y_root = 10
+    num = 1
+    keysym = "??"
+    type = "4"
+
+
+class _Handler(EventHandler):
+    def __init__(self):
+        self.count = 0
+
+    def handle_mouse_press(self, event):
+        self.count += 1
+
+
+def _window(backend):
+    if backend == "tk":
+        return Window(WIDTH, HEIGHT, "white", "bench", lambda window: None)
+    return Window(WIDTH, HEIGHT, "white", "bench", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+# Makes the i-th shape of a scene.
+def _shape(window, i, rng):
+    center = (rng.randrange(WIDTH), rng.randrange(HEIGHT))
+    kind = i % 5
+    if kind == 0:
+        return Square(window, rng.randrange(4, 30), center)
+    if kind == 1:
+        return Rectangle(window, rng.randrange(4, 30), rng.randrange(4, 30),
+                         center)
+    if kind == 2:
+        return Circle(window, rng.randrange(2, 15), center)
+    if kind == 3:
+        return Oval(window, rng.randrange(2, 15), rng.randrange(2, 15),
+                    center)
+    x, y = center
+    return Polygon(window, [(x, y), (x + 10, y), (x + 5, y + 10)])
+
+
+def _shapes(window, n):
+    rng = random.Random(n)
+    return [_shape(window, i, rng) for i in range(n)]
+
+
+def _scene(window, n):
+    shapes = _shapes(window, n)
+    for shape in shapes:
+        window.add(shape)
+    return shapes
+
+
+def _images(window, n, picture):
+    rng = random.Random(n)
+    images = []
+    for i in range(n):
+        center = (rng.randrange(WIDTH), rng.randrange(HEIGHT))
+        images.append(Image(window, picture, 40, 40, center))
+        window.add(images[-1])
+    return images
+
+
+# Each case is given a window, the scene size and a picture file, and does its
+# setup before returning a function which does the part which is timed.
+
+def _construct(window, n, picture):
+    return lambda: _shapes(window, n)
+
+
+def _add(window, n, picture):
+    shapes = _shapes(window, n)
+
+    def run():
+        for shape in shapes:
+            window.add(shape)
+
+    return run
+
+
+def _add_many(window, n, picture):
+    shapes = _shapes(window, n)
+    return lambda: window.add_many(shapes)
+
+
+def _move(window, n, picture):
+    shapes = _scene(window, n)
+
+    def run():
+        for shape in shapes:
+            shape.move(1, 1)
+
+    return run
+
+
+def _rotate(window, n, picture):
+    shapes = _scene(window, n)
+
+    def run():
+        for shape in shapes:
+            shape.rotate(15)
+
+    return run
+
+
+def _scale(window, n, picture):
+    shapes = _scene(window, n)
+
+    def run():
+        for shape in shapes:
+            shape.scale(1.5)
+
+    return run
+
+
+def _set_depth(window, n, picture):
+    shapes = _scene(window, n)
+    rng = random.Random(n)
+    depths = [rng.randrange(100) for shape in shapes]
+
+    def run():
+        for i in range(len(shapes)):
+            shapes[i].set_depth(depths[i])
+
+    return run
+
+
+def _remove(window, n, picture):
+    shapes = _scene(window, n)
+
+    def run():
+        for shape in shapes:
+            window.remove(shape)
+
+    return run
+
+
+def _image_resize(window, n, picture):
+    images = _images(window, n, picture)
+
+    def run():
+        for i in range(len(images)):
+            images[i].resize(30 + i % 8, 30)
+
+    return run
+
+
+def _image_rotate(window, n, picture):
+    images = _images(window, n, picture)
+
+    def run():
+        for shown in images:
+            shown.rotate(15)
+
+    return run
+
+
+# Returns a case which does an image case once before it's timed, and undoes
+# it, so everything it shows is already in the cache.
+def _cached(case, undo):
+    def setup(window, n, picture):
+        set_image_cache_size(IMAGE_CACHE)
+        run = case(window, n, picture)
+        run()
+        undo(window)
+        return run
+
+    return setup
+
+
+# Returns a case which runs an image case with the cache turned off.
+def _uncached(case):
+    def setup(window, n, picture):
+        set_image_cache_size(IMAGE_CACHE)
+        run = case(window, n, picture)
+
+        def uncached():
+            set_image_cache_size(0)
+            try:
+                run()
+            finally:
+                set_image_cache_size(IMAGE_CACHE)
+
+        return uncached
+
+    return setup
+
+
+def _unresize(window):
+    for shown in window._graphics:
+        shown.resize(40, 40)
+
+
+def _unrotate(window):
+    for shown in window._graphics:
+        shown.rotate(-15)
+
+
+def _dispatch(window, n, picture):
+    shapes = _scene(window, n)
+    for shape in shapes:
+        shape.add_handler(_Handler())
+    # the canvas is told which item is under the mouse, since the benchmark
+    # has no mouse
+    current = [None]
+    window._canvas.find_withtag = lambda tag: current
+    event = _TkEvent()
+
+    def run():
+        for shape in shapes:
+            current[0] = shape._tag
+            window._dispatch_mouse("handle_mouse_press", event)
+
+    return run
+
+
+CASES = [("construct", _construct), ("add", _add), ("add_many", _add_many),
+         ("move", _move), ("rotate", _rotate), ("scale", _scale),
+         ("set_depth", _set_depth), ("remove", _remove),
+         ("image_resize_cached", _cached(_image_resize, _unresize)),
+         ("image_resize_uncached", _uncached(_image_resize)),
+         ("image_rotate_cached", _cached(_image_rotate, _unrotate)),
+         ("image_rotate_uncached", _uncached(_image_rotate)),
+         ("dispatch", _dispatch)]
+
+
+# Returns the microseconds per object of one run of a case, which may time
+# the case several times over for small scenes.
+def _time(case, n, picture, backend):
+    loops = max(1, OPERATIONS // n)
+    seconds = 0
+    for i in range(loops):
+        window = _window(backend)
+        run = case(window, n, picture)
+        start = time.perf_counter()
+        run()
+        seconds += time.perf_counter() - start
+        window._root.destroy()
+    return seconds / (loops * n) * 1e6
+
+
+def run(arguments):
+    sizes = [int(size) for size in arguments.sizes.split(",")]
+    names = [name for name, case in CASES]
+    if arguments.cases:
+        names = arguments.cases.split(",")
+    cases = dict(CASES)
+    for name in names:
+        if name not in cases:
+            sys.exit("unknown case %r, the cases are: %s" %
+                     (name, ", ".join(cases)))
+    # the picture used by the image cases, which Image looks for relative to
+    # the current directory
+    folder = tempfile.mkdtemp()
+    picture = os.path.relpath(os.path.join(folder, "picture.png"))
+    image.new("RGB", (64, 64), "red").save(picture)
+    results = {}
+    try:
+        print("microseconds per object, median of %d runs" % arguments.repeat)
+        print("%-22s" % "" + "".join("%12d" % size for size in sizes))
+        for name in names:
+            results[name] = {}
+            row = "%-22s" % name
+            for size in sizes:
+                times = [_time(cases[name], size, picture, arguments.backend)
+                         for i in range(arguments.repeat)]
+                results[name][str(size)] = {"median": statistics.median(times),
+                                            "min": min(times)}
+                row += "%12.2f" % statistics.median(times)
+            print(row)
+    finally:
+        os.remove(picture)
+        os.rmdir(folder)
+    if arguments.output:
+        with open(arguments.output, "w") as file:
+            json.dump({"format": FORMAT,
+                       "python": platform.python_version(),
+                       "platform": platform.platform(),
+                       "backend": arguments.backend,
+                       "repeat": arguments.repeat,
+                       "created": datetime.datetime.now().isoformat(
+                           timespec="seconds"),
+                       "results": results}, file, indent=2)
+        print("saved to %s" % arguments.output)
+
+
+def _load(filename):
+    with open(filename) as file:
+        results = json.load(file)
+    if results.get("format") != FORMAT:
+        sys.exit("%s isn't a results file this suite can read" % filename)
+    return results
+
+
+def compare(arguments):
+    old = _load(arguments.old)
+    new = _load(arguments.new)
+    if old["backend"] != new["backend"]:
+        print("warning: comparing %s results with %s results" %
+              (old["backend"], new["backend"]))
+    print("%-22s %8s %12s %12s %9s" % ("", "objects", "old", "new", "change"))
+    slower = []
+    for name in old["results"]:
+        for size in old["results"][name]:
+            if size not in new["results"].get(name, {}):
+                continue
+            before = old["results"][name][size]["median"]
+            after = new["results"][name][size]["median"]
+            # a case which took no measurable time before has no percentage
+            # change, so it's shown as n/a and never counts as slower
+            if before == 0:
+                print("%-22s %8s %12.2f %12.2f %9s" %
+                      (name, size, before, after, "n/a"))
+                continue
+            change = (after - before) / before * 100
+            flag = ""
+            if change > arguments.threshold:
+                slower.append((name, size))
+                flag = "  slower"
+            print("%-22s %8s %12.2f %12.2f %+8.1f%%%s" %
+                  (name, size, before, after, change, flag))
+    if slower:
+        print("%d of the cases got more than %g%% slower" %
+              (len(slower), arguments.threshold))
+        sys.exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Times cs110graphics's core operations.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    runner = commands.add_parser("run", help="run the benchmarks")
+    runner.add_argument("--output", help="file to save the results in")
+    runner.add_argument("--sizes", default=",".join(map(str, SIZES)),
+                        help="scene sizes, separated by commas")
+    runner.add_argument("--cases", help="cases to run, separated by commas")
+    runner.add_argument("--repeat", type=int, default=REPEAT,
+                        help="how many runs each result is the median of")
+    runner.add_argument("--backend", choices=["headless", "tk"],
+                        default="headless")
+    comparer = commands.add_parser("compare", help="compare two results files")
+    comparer.add_argument("old")
+    comparer.add_argument("new")
+    comparer.add_argument("--threshold", type=float, default=10,
+                          help="percent slower which counts as a slowdown")
+    arguments = parser.parse_args()
+    if arguments.command == "run":
+        run(arguments)
+    else:
+        compare(arguments)
+
+
+if __name__ == "__main__":
+    main()
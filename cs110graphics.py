@@ -22,6 +22,12 @@
 # if __name__ == "__main__":
 #     StartGraphicsSystem(main)
 # @endcode
+#
+# <h2>Requirements</h2>
+# <hr>
+# CS 110 Graphics needs tkinter and Pillow (<tt>pip install Pillow</tt>).
+# numpy is optional; if it's installed, shapes with lots of points, collisions
+# and particle systems are faster.
 # @authors Paul Magnus '18
 # @authors Ines Ayara '20
 # @authors Matthew R. Jenkins '20
@@ -29,15 +35,62 @@
 # @date Summer 2017
 
 from tkinter import *  # for pretty much everything graphics related
+import bisect  # for the scene registry
+from collections import OrderedDict  # for the image cache
+from collections import deque  # for profiling
+from contextlib import contextmanager  # for Window.batch
+from functools import lru_cache  # for Oval
 import math  # for rotate
 import inspect
+import heapq  # for the headless backend
+import os  # for recording
+import queue  # for recording
+import random  # for ParticleSystem
+import threading  # for recording
+import time  # for frame timing
 from PIL import Image as image  # for Image class
 from PIL import ImageTk as itk  # for Image class
+from PIL import ImageColor as icolor  # for drawing without tkinter
+from PIL import ImageDraw as idraw  # for drawing without tkinter
+from PIL import ImageFont as ifont  # for drawing without tkinter
+from PIL import GifImagePlugin as igif  # for recording
+try:
+    import numpy  # for moving, turning and scaling points quickly
+except ImportError:
+    # everything still works without numpy, just more slowly for shapes with
+    # lots of points
+    numpy = None
 
 ## @file cs110graphics.py
 # The main cs110graphics file
 
 
+#-------------------------------------------------------------------------------
+#
+#  Validation
+#
+#-------------------------------------------------------------------------------
+
+# Whether functions and methods check what they're given, see set_validation.
+_validation = True
+
+
+## Turns the checks which functions and methods make on what they're given on
+# or off. The checks are on unless they're turned off, and they stop a program
+# with a message saying what was wrong as soon as something is given the wrong
+# kind of value. Programs which are known to work can turn them off so that
+# making, moving, turning and scaling objects is faster. Running Python with
+# -O also skips the checks. The switch is global: it affects every window and
+# every object, including ones made before it was changed.
+# @param enabled - bool - whether the checks are made
+def set_validation(enabled):
+    # type checking
+    assert isinstance(enabled, bool), \
+        "Make sure enabled is a bool."
+    global _validation
+    _validation = enabled
+
+
 #-------------------------------------------------------------------------------
 #
 #  Window
@@ -58,13 +111,18 @@ class Window:
     # window is created, it runs this function.
     # @param master - unkown type - <b>(default: None)</b> The parent widget.
     # @warning Unless you understand how Tkinter works do not change master
+    # @param retained - bool - <b>(default: False)</b> Whether the window
+    # starts in retained mode, see set_retained.
+    # @param backend - HeadlessBackend - <b>(default: None)</b> What the
+    # window is drawn with. By default a real window is opened using tkinter.
     def __init__(self, width, height, background, name, first_function=None,
-                 master=None):
+                 master=None, retained=False, backend=None):
         # type checking
-        assert isinstance(width, int) and isinstance(height, int) and \
-            isinstance(background, str) and isinstance(name, str), \
-            "Make sure width is an int, height is an int, background is a " + \
-            "string, and name is a string."
+        if _validation:
+            assert isinstance(width, int) and isinstance(height, int) and \
+                isinstance(background, str) and isinstance(name, str), \
+                "Make sure width is an int, height is an int, background " + \
+                "is a string, and name is a string."
         # saving the given variables
         self._width = width
         self._height = height
@@ -72,21 +130,54 @@ class Window:
         self._name = name
         self._first_function = first_function
         # self._graphics contains a running tally of what objects are on the
-        # canvas
-        # [0] = depth, [1] = tag, [2] = object ID
-        self._graphics = []
-        # initalizing a frame and canvas using tkinter
-        self._root = Tk()
-        self._frame = Frame(master)
-        self._frame.pack()
-        self._canvas = Canvas(self._frame)
-        self._canvas.pack()
-        self._canvas.focus_set()
+        # canvas, indexed by object, by tag and by depth
+        self._graphics = _SceneRegistry()
+        # self._index finds objects by where they are. objects which changed
+        # wait in self._stale and are only put back in the index when it's
+        # next asked something.
+        self._index = _SpatialIndex()
+        # id(object) -> object
+        self._stale = {}
+        # (function, objects) which is told about collisions every frame, see
+        # set_collision_handler
+        self._collision_handler = None
+        # objects changed inside a batch wait here until it ends
+        # id(object) -> (object, whether the object moved)
+        self._batching = 0
+        self._dirty = {}
+        self._retained = False
+        self._recorder = None
+        self._recording_stats = None
+        # measures frames while the window is being profiled, see
+        # start_profiling
+        self._profiler = None
+        self._profile = None
+        # initalizing a root and canvas using the backend, which is tkinter
+        # unless a different one was given
+        if backend is None:
+            backend = _TkBackend()
+        self._backend = backend
+        self._root, self._canvas = backend.open(master)
+        # input is passed on to objects' handlers by a single set of bindings
+        # on the canvas
+        # tag -> dispatch table of the object's handler, see _dispatch_table
+        self._handlers = {}
+        # id(handler) -> [dispatch table, how many objects in the window it
+        # handles]. handlers are kept by identity, so ones which define __eq__
+        # still each get key events.
+        self._key_handlers = {}
+        # with the "coalesce" input policy, the latest mouse movement waits
+        # here as (dispatch table, tkinter event) until it's passed on
+        self._input_policy = "raw"
+        self._pending_motion = None
+        self._input_stats = {"received": 0, "delivered": 0, "dropped": 0}
+        self._bind_events()
         # using our built in functions to set height, width, and background
         self.set_height(height)
         self.set_width(width)
         self.set_title(name)
         self.set_background(background)
+        self.set_retained(retained)
         # running first function
         self._first_function(self)
 
@@ -94,28 +185,353 @@ class Window:
     # @param graphic - GraphicalObject
     def add(self, graphic):
         # type checking
-        assert isinstance(graphic, GraphicalObject), \
-            "Make sure graphic is a GraphicalObject."
+        if _validation:
+            assert isinstance(graphic, GraphicalObject), \
+                "Make sure graphic is a GraphicalObject."
         # deferring to each object since each object requires a different
         # method of construction
         graphic._add_to()
 
+    ## Adds a list of objects to the Window at once. This does the same as
+    # adding each one with add, in order, inside a batch, so the objects are
+    # all drawn together once they've been added.
+    # @param graphics - list of GraphicalObject
+    # @code
+    # squares = []
+    # for x in range(0, 400, 4):
+    #     for y in range(0, 400, 4):
+    #         squares.append(Square(window, 4, (x + 2, y + 2)))
+    # window.add_many(squares)
+    # @endcode
+    def add_many(self, graphics):
+        # type checking
+        if _validation:
+            assert isinstance(graphics, list) and \
+                all(isinstance(graphic, GraphicalObject)
+                    for graphic in graphics), \
+                "Make sure graphics is a list of GraphicalObjects."
+        with self.batch():
+            for graphic in graphics:
+                self.add(graphic)
+
     ## Removes an object from the Window object, assuming
     # the object being deleted exists.
     # @param graphic - GraphicalObject
     def remove(self, graphic):
         # type checking and making sure the object is in the list
-        assert isinstance(graphic, GraphicalObject) and \
-            [graphic._depth, graphic._tag, graphic] in self._graphics, \
-            "Make sure graphic is a GraphicalObject and the graphic has " + \
-            "been added to the board."
-        # removes from the window, then the list, then sets the tag to None and
-        # disables the object (for readding later)
+        if _validation:
+            assert isinstance(graphic, GraphicalObject) and \
+                graphic in self._graphics, \
+                "Make sure graphic is a GraphicalObject and the graphic " + \
+                "has been added to the board."
+        # stops its events, removes from the window, then the list, then sets
+        # the tag to None and disables the object (for readding later)
+        self._unlisten(graphic)
         graphic._remove_from(self)
-        self._graphics.remove([graphic._depth, graphic._tag, graphic])
+        self._graphics.remove(graphic)
+        self._index.remove(graphic)
+        self._stale.pop(id(graphic), None)
         graphic._tag = None
         graphic._enabled = False
 
+    ## Groups together changes to the objects in the window. Inside the
+    # <tt>with</tt> block, changes to objects are only recorded, and when the
+    # block ends every changed object is updated at once. An object which
+    # moved several times is only redrawn once, in its final position.
+    # @code
+    # with window.batch():
+    #     for square in squares:
+    #         square.move(5, 0)
+    #         square.set_fill_color("red")
+    # @endcode
+    @contextmanager
+    def batch(self):
+        self._batching += 1
+        try:
+            yield
+        finally:
+            self._batching -= 1
+            if self._batching == 0:
+                self._flush()
+
+    ## Turns retained mode on or off. In retained mode, changes to objects
+    # aren't drawn right away. Instead every changed object is drawn once per
+    # frame, so an object which changes many times in one frame is only
+    # redrawn once. Retained mode only draws while the window is running,
+    # which it is after StartGraphicsSystem has called its first function.
+    # @param retained - bool
+    def set_retained(self, retained):
+        # type checking
+        if _validation:
+            assert isinstance(retained, bool), \
+                "Make sure retained is a bool."
+        # retained mode works like a batch which lasts until it's turned off,
+        # and which is also flushed at every frame
+        if retained and not self._retained:
+            self._batching += 1
+        elif self._retained and not retained:
+            self._batching -= 1
+            if self._batching == 0:
+                self._flush()
+        self._retained = retained
+
+    ## Sets how mouse movements are passed on to handlers.
+    # @param policy - str - either:
+    # - "raw" - <b>(default)</b> every movement is passed on as soon as it
+    # happens
+    # - "coalesce" - movements are passed on at most once per frame, and only
+    # the latest one is, so handlers which redraw shapes as the mouse moves
+    # keep up with it. Any other input passes on the waiting movement first,
+    # so handlers still see events in the order they happened.
+    def set_input_policy(self, policy):
+        # type checking
+        if _validation:
+            assert policy in ("raw", "coalesce"), \
+                "Make sure the input policy is either \"raw\" or \"coalesce\"."
+        self._input_policy = policy
+        self._flush_motion()
+
+    ## Returns how many mouse movements have been passed on to handlers,
+    # which helps with choosing an input policy.
+    # @return stats - dict - with these keys:
+    # - "received" - how many movements happened over objects with handlers
+    # - "delivered" - how many were passed on to handlers
+    # - "dropped" - how many were skipped because a later one replaced them
+    def get_input_stats(self):
+        return dict(self._input_stats)
+
+    ## Returns the objects in the window which cover a point, frontmost
+    # first. Objects at the same depth come in no particular order.
+    # @param point - tuple of (int * int)
+    # @return objects - list of GraphicalObject
+    def objects_at(self, point):
+        # type checking
+        if _validation:
+            assert isinstance(point, tuple) and len(point) == 2 and \
+                isinstance(point[0], int) and isinstance(point[1], int), \
+                "Make sure point is a tuple of (int * int)."
+        self._update_index()
+        found = [graphic for graphic in self._index.near(point)
+                 if graphic._enabled and graphic._contains(point)]
+        found.sort(key=self._graphics.depth)
+        return found
+
+    ## Returns the objects in the window whose bounding boxes overlap a
+    # rectangle, frontmost first. Objects at the same depth come in no
+    # particular order.
+    # @param bbox - tuple of (int * int * int * int) - the left, top, right and
+    # bottom edges of the rectangle
+    # @return objects - list of GraphicalObject
+    def objects_in(self, bbox):
+        # type checking
+        if _validation:
+            assert isinstance(bbox, tuple) and len(bbox) == 4 and \
+                all(isinstance(edge, int) for edge in bbox), \
+                "Make sure bbox is a tuple of (int * int * int * int)."
+        self._update_index()
+        found = [graphic for graphic in self._index.overlapping(bbox)
+                 if graphic._enabled]
+        found.sort(key=self._graphics.depth)
+        return found
+
+    ## Returns every pair of shown objects which overlap. Circles and ovals
+    # are checked using their real shapes, except that an oval is checked
+    # against circles and other ovals as a 16-sided polygon drawn inside it.
+    # Polygons are checked by their outlines, and Text and Image objects by
+    # their bounding boxes.
+    # @param objects - list of GraphicalObject - <b>(default: None)</b> only
+    # pairs where both objects are in this list are returned. By default every
+    # object in the window is checked.
+    # @return pairs - list of tuples of (GraphicalObject * GraphicalObject)
+    #
+    # For example, a game could check its player against everything else:
+    # @code
+    # for first, second in window.get_collisions():
+    #     if player in (first, second):
+    #         player.set_fill_color("red")
+    # @endcode
+    #
+    # How long this takes grows with the number of objects and how many of
+    # them are close together. With every object moving each frame, it takes
+    # about 10 ms for 500 objects, 25 ms for 1000, 60 ms for 2000 and 150 ms
+    # for 4000 on a typical computer, so a program which checks every frame at
+    # 60 frames per second (16 ms a frame, which also has to draw) should keep
+    # to about 500 moving objects. benchmarks/bench_collisions.py measures
+    # this.
+    def get_collisions(self, objects=None):
+        # type checking
+        if _validation:
+            assert objects is None or isinstance(objects, list), \
+                "Make sure objects is a list of GraphicalObjects."
+        self._update_index()
+        if objects is not None:
+            objects = {id(graphic) for graphic in objects}
+        pairs = []
+        # the index gives the pairs whose bounding boxes overlap, and only
+        # those are checked more closely
+        for first, second in self._index.pairs():
+            if not (first._enabled and second._enabled):
+                continue
+            if objects is not None and \
+               (id(first) not in objects or id(second) not in objects):
+                continue
+            if _overlap(first._shape(), second._shape()):
+                pairs.append((first, second))
+        return pairs
+
+    ## Sets a function which is called once per frame for every pair of
+    # objects which overlap, as found by get_collisions.
+    # @param handler - func(GraphicalObject, GraphicalObject) - the function,
+    # or None to stop checking for collisions
+    # @param objects - list of GraphicalObject - <b>(default: None)</b> only
+    # these objects are checked. By default every object in the window is.
+    def set_collision_handler(self, handler, objects=None):
+        # type checking
+        if _validation:
+            assert handler is None or callable(handler), \
+                "Make sure the collision handler is a function or None."
+            assert objects is None or isinstance(objects, list), \
+                "Make sure objects is a list of GraphicalObjects."
+        if handler is None:
+            self._collision_handler = None
+        else:
+            self._collision_handler = (handler, objects)
+
+    # Puts every object which changed since the last query back in the index.
+    def _update_index(self):
+        stale = self._stale
+        self._stale = {}
+        for graphic in stale.values():
+            self._index.update(graphic, graphic._bounds())
+
+    ## Closes the window, which ends the program once the window is running.
+    def close(self):
+        self._root.destroy()
+
+    ## Returns a picture of everything in the window.
+    # @return picture - PIL.Image.Image
+    #
+    # This works the same way whether or not the window is headless, so it can
+    # be used to check what a program draws, for example
+    # @code
+    # window = StartGraphicsSystem(main, backend=HeadlessBackend(5000))
+    # window.get_image().save("after_5_seconds.png")
+    # @endcode
+    def get_image(self):
+        return _render(self._width, self._height, self._background,
+                       self._snapshot())
+
+    ## Starts recording the window. Frames are saved as the program runs
+    # rather than kept in memory, and are drawn and saved on a separate
+    # thread so that recording doesn't slow down timers.
+    # @param filename - str - where the recording is saved. A name ending in
+    # ".gif" saves an animated GIF. Otherwise each frame is saved as its own
+    # PNG file, numbered using the "%d" in the name (e.g. "frames/bot%04d.png"),
+    # or numbered just before the extension if the name has no "%d".
+    # @param frame_rate - int - <b>(default: 30)</b> how many frames are
+    # recorded per second
+    #
+    # The recording stops when stop_recording is called or the window closes.
+    def start_recording(self, filename, frame_rate=30):
+        # type checking
+        if _validation:
+            assert isinstance(filename, str) and filename != "" and \
+                isinstance(frame_rate, int) and frame_rate > 0 and \
+                self._recorder is None, \
+                "Make sure the filename is a string that is not blank, " + \
+                "the frame rate is an int above 0, and the window isn't " + \
+                "already being recorded."
+        self._recorder = _Recorder(self, filename, frame_rate)
+
+    ## Stops recording the window and finishes saving the recording.
+    def stop_recording(self):
+        # type checking
+        if _validation:
+            assert self._recorder is not None, \
+                "Make sure the window is being recorded."
+        self._recorder.stop()
+        self._recording_stats = self._recorder.stats()
+        self._recorder = None
+
+    ## Returns how the current (or most recent) recording is going.
+    # @return stats - dict - with these keys:
+    # - "frames" - how many frames have been saved
+    # - "dropped" - how many frames were skipped because saving fell behind
+    # - "fps" - how many frames are drawn and saved per second of work
+    def get_recording_stats(self):
+        if self._recorder is not None:
+            return self._recorder.stats()
+        return self._recording_stats
+
+    ## Starts measuring where the time in each frame goes: running handlers,
+    # timers and RunWithYieldDelay functions, and drawing. The number of
+    # canvas items made, deleted, configured and moved each frame is counted
+    # too. Nothing is measured until this is called, so a window which isn't
+    # being profiled runs as fast as it would without it.
+    # @param overlay - bool - <b>(default: False)</b> whether the frame rate,
+    # the average time taken by each kind of work and the slowest functions
+    # are shown in the top left corner of the window
+    def start_profiling(self, overlay=False):
+        # type checking
+        if _validation:
+            assert isinstance(overlay, bool) and self._profiler is None, \
+                "Make sure overlay is a bool and the window isn't already " + \
+                "being profiled."
+        self._profiler = _Profiler(self._canvas, overlay)
+        self._canvas = _CountingCanvas(self._canvas, self._profiler.counts)
+
+    ## Stops measuring frames. get_profile still returns what was measured.
+    def stop_profiling(self):
+        # type checking
+        if _validation:
+            assert self._profiler is not None, \
+                "Make sure the window is being profiled."
+        self._canvas = self._canvas._canvas
+        self._profiler.stop()
+        self._profile = self._profiler.profile()
+        self._profiler = None
+
+    ## Returns where the time went in the most recent frames of the current
+    # (or most recent) profile, or None if the window hasn't been profiled.
+    # @return profile - dict - with these keys:
+    # - "fps" - how many frames were drawn per second
+    # - "frames" - list of dict - the last 120 frames, oldest first. Each
+    # has "frame", the milliseconds from its start to the next frame's, and
+    # "handlers", "timers", "generators" and "render", the milliseconds spent
+    # on each, along with how many "creates", "deletes", "configures" and
+    # "coords" calls were made to the canvas.
+    # - "slowest" - list of dict - the five functions which took longest in
+    # a single call, slowest first, each with its "name", how many "calls"
+    # there were, and the "total" and "longest" milliseconds they took
+    #
+    # For example, to find out why a program stutters:
+    # @code
+    # window.start_profiling()
+    # ...
+    # for entry in window.get_profile()["slowest"]:
+    #     print(entry["name"], entry["longest"])
+    # @endcode
+    def get_profile(self):
+        if self._profiler is not None:
+            return self._profiler.profile()
+        return self._profile
+
+    # Returns what needs to be drawn, from the back of the window to the
+    # front, as a list of (kind, points, options).
+    def _snapshot(self):
+        items = []
+        for graphic in self._graphics:
+            if graphic._enabled and graphic._tag is not None:
+                options = graphic._all_options()
+                # images are drawn from the PIL picture rather than the
+                # photo image tkinter uses
+                if "image" in options:
+                    options["image"] = graphic._picture()
+                # the points are copied since objects change them in place
+                items.append((graphic._kind(), list(graphic._coords()),
+                              options))
+        return items
+
     ## Returns the height of the window as an integer.
     # @return height - int
     def get_height(self):
@@ -131,8 +547,9 @@ class Window:
     # name of a color ("yellow"), or a hex code ("#FFFF00")
     def set_background(self, background):
         # type checking
-        assert isinstance(background, str), \
-            "Make sure the background color is a string."
+        if _validation:
+            assert isinstance(background, str), \
+                "Make sure the background color is a string."
         self._background = background
         self._canvas.configure(bg=background)
 
@@ -140,8 +557,9 @@ class Window:
     # @param height - int
     def set_height(self, height):
         # type checking
-        assert isinstance(height, int), \
-            "Make sure the height is an int."
+        if _validation:
+            assert isinstance(height, int), \
+                "Make sure the height is an int."
         self._height = height
         self._canvas.configure(height=height)
 
@@ -149,8 +567,9 @@ class Window:
     # @param name - string
     def set_title(self, name):
         # type checking
-        assert isinstance(name, str), \
-            "Make sure the window title is a string."
+        if _validation:
+            assert isinstance(name, str), \
+                "Make sure the window title is a string."
         self._name = name
         self._root.title(name)
 
@@ -158,21 +577,499 @@ class Window:
     # @param width - height
     def set_width(self, width):
         # type checking
-        assert isinstance(width, int), \
-            "Make sure the width is an int."
+        if _validation:
+            assert isinstance(width, int), \
+                "Make sure the width is an int."
         self._width = width
         self._canvas.configure(width=width)
 
-    # Whenever an object is updated through external functions, its tag is
-    # overwritten. This function goes into self._graphics and replaces the old
-    # tag with a newer one, as well as replacing its depth with a newer one.
-    def _update_tag(self, graphic):
-        # goes through every item in self._graphics, then saves the object's
-        # tag and depth if it's found
-        for item in self._graphics:
-            if item[2] == graphic:
-                item[1] = graphic._tag
-                item[0] = graphic._depth
+    # Adds a newly created object to self._graphics. Tkinter always puts new
+    # canvas items on top, so the item is moved under any objects in front of
+    # it.
+    def _register(self, graphic):
+        self._graphics.add(graphic)
+        self._stale[id(graphic)] = graphic
+        if not self._graphics.in_front(graphic):
+            self._restack(graphic)
+
+    # Moves an object's canvas item directly above the object which is drawn
+    # beneath it, or to the very back if nothing is. Only this one item is
+    # moved, so it costs a single call to tkinter no matter how many objects
+    # are in the window.
+    def _restack(self, graphic):
+        below = self._graphics.below(graphic)
+        if below is None:
+            self._canvas.tag_lower(graphic._tag)
+        else:
+            self._canvas.tag_raise(graphic._tag, below._tag)
+
+    # Binds each kind of input once for the whole canvas. Mouse events go to
+    # the handler of the object under the mouse, which is found from the
+    # object's tag, and key events go to every handler in the window. Only
+    # objects with handlers get the shared tag, so the mouse bindings ignore
+    # everything else.
+    def _bind_events(self):
+        def key_press(event):
+            self._dispatch_key("handle_key_press", event)
+
+        def key_release(event):
+            self._dispatch_key("handle_key_release", event)
+
+        def mouse_enter(event):
+            self._dispatch_mouse("handle_mouse_enter", event)
+
+        def mouse_leave(event):
+            self._dispatch_mouse("handle_mouse_leave", event)
+
+        def mouse_move(event):
+            if self._input_policy == "coalesce":
+                self._queue_motion(event)
+            else:
+                self._input_stats["received"] += 1
+                self._dispatch_mouse("handle_mouse_move", event)
+
+        def mouse_press(event):
+            # only the left, middle and right buttons are handled
+            if event.num in (1, 2, 3):
+                self._dispatch_mouse("handle_mouse_press", event)
+
+        def mouse_release(event):
+            if event.num in (1, 2, 3):
+                self._dispatch_mouse("handle_mouse_release", event)
+
+        self._canvas.bind("<Key>", key_press)
+        self._canvas.bind("<KeyRelease>", key_release)
+        types = ["<Enter>", "<Leave>", "<Motion>", "<ButtonPress>",
+                 "<ButtonRelease>"]
+        funcs = [mouse_enter, mouse_leave, mouse_move, mouse_press,
+                 mouse_release]
+        for i in range(len(types)):
+            self._canvas.tag_bind(_HANDLED_TAG, types[i], funcs[i])
+
+    # Starts passing events on to an object's handler.
+    def _listen(self, graphic):
+        handler = graphic._parent_object
+        self._handlers[graphic._tag] = graphic._dispatch
+        entry = self._key_handlers.get(id(handler))
+        if entry is None:
+            self._key_handlers[id(handler)] = [graphic._dispatch, 1]
+        else:
+            entry[1] += 1
+        self._canvas.addtag_withtag(_HANDLED_TAG, graphic._tag)
+
+    # Stops passing events on to an object's handler. The object keeps its
+    # canvas item, but the item no longer has the shared tag.
+    def _unlisten(self, graphic):
+        table = self._handlers.pop(graphic._tag, None)
+        if table is None:
+            return
+        # a movement waiting for an object that's gone is dropped
+        if self._pending_motion is not None and \
+           self._pending_motion[0] is table:
+            self._pending_motion = None
+            self._input_stats["dropped"] += 1
+        handler = graphic._parent_object
+        self._key_handlers[id(handler)][1] -= 1
+        if self._key_handlers[id(handler)][1] == 0:
+            del self._key_handlers[id(handler)]
+        self._canvas.dtag(graphic._tag, _HANDLED_TAG)
+
+    # Returns the dispatch table of the object under the mouse, or None if
+    # the object has no handler.
+    def _target(self):
+        items = self._canvas.find_withtag(CURRENT)
+        if not items:
+            return None
+        return self._handlers.get(items[0])
+
+    # Passes a mouse event on to the handler of the object under the mouse.
+    def _dispatch_mouse(self, method, event):
+        self._flush_motion()
+        table = self._target()
+        if table is not None:
+            self._deliver(table, method, event)
+
+    # Calls one of the methods in a dispatch table.
+    def _deliver(self, table, method, event):
+        entry = table.get(method)
+        if entry is None:
+            return
+        if method == "handle_mouse_move":
+            self._input_stats["delivered"] += 1
+        func, takes_event = entry
+        profiler = self._profiler
+        if profiler is not None:
+            started = profiler.clock()
+        if takes_event:
+            func(Event(event))
+        else:
+            func()
+        if profiler is not None:
+            profiler.record("handlers", func, started)
+
+    # Keeps a mouse movement until the next frame, replacing any earlier one
+    # over the same object. A waiting movement over a different object is
+    # passed on first.
+    def _queue_motion(self, event):
+        table = self._target()
+        if table is None:
+            return
+        self._input_stats["received"] += 1
+        if self._pending_motion is not None:
+            if self._pending_motion[0] is table:
+                self._input_stats["dropped"] += 1
+            else:
+                self._flush_motion()
+        self._pending_motion = (table, event)
+
+    # Passes on the waiting mouse movement, if there is one.
+    def _flush_motion(self):
+        if self._pending_motion is not None:
+            table, event = self._pending_motion
+            self._pending_motion = None
+            self._deliver(table, "handle_mouse_move", event)
+
+    # Passes a key event on to every handler in the window. Handlers which
+    # handle more than one object only get the event once.
+    def _dispatch_key(self, method, event):
+        self._flush_motion()
+        tkEvent = None
+        profiler = self._profiler
+        # the handlers are copied in case one adds or removes objects
+        for table, count in list(self._key_handlers.values()):
+            entry = table.get(method)
+            if entry is None:
+                continue
+            func, takes_event = entry
+            if profiler is not None:
+                started = profiler.clock()
+            if not takes_event:
+                func()
+            else:
+                # the Event is only made if a handler wants it, and is shared
+                # by all of them
+                if tkEvent is None:
+                    tkEvent = Event(event)
+                func(tkEvent)
+            if profiler is not None:
+                profiler.record("handlers", func, started)
+
+    # Updates the canvas items of every object changed during a batch.
+    def _flush(self):
+        dirty = self._dirty
+        self._dirty = {}
+        for graphic, moved in dirty.values():
+            graphic._draw(moved)
+
+    # Returns the current time in milliseconds.
+    def _now(self):
+        return self._backend.now()
+
+    # Runs the window until it's closed. Input and timers are handled as soon
+    # as tkinter receives them, and the window is redrawn frame_rate times a
+    # second. If idle_sleep is True the program sleeps until the next event
+    # arrives, otherwise it keeps polling for events, which uses a whole CPU
+    # core.
+    def _mainloop(self, frame_rate, idle_sleep):
+        self._frame_interval = 1000 / frame_rate
+        self._frame_deadline = self._now()
+        self._draw_frame()
+        # closing the window raises a TclError, which is ignored so the
+        # program quietly ends
+        try:
+            if idle_sleep:
+                self._root.mainloop()
+            else:
+                while True:
+                    self._root.update()
+        except TclError:
+            pass
+        finally:
+            # a recording which is still going is finished off so the file
+            # isn't left incomplete
+            if self._recorder is not None:
+                self.stop_recording()
+
+    # Redraws the window once per frame. Tkinter normally only redraws when
+    # there is nothing else to do, which never happens if timers take up all
+    # of the program's time.
+    def _draw_frame(self):
+        self._flush_motion()
+        profiler = self._profiler
+        if self._collision_handler is not None:
+            handler, objects = self._collision_handler
+            if profiler is not None:
+                started = profiler.clock()
+            for first, second in self.get_collisions(objects):
+                handler(first, second)
+            if profiler is not None:
+                profiler.record("handlers", handler, started)
+        if profiler is not None:
+            started = profiler.clock()
+        if self._retained:
+            self._flush()
+        self._canvas.update_idletasks()
+        if profiler is not None:
+            profiler.record("render", None, started)
+            profiler.end_frame()
+        # the next frame is scheduled from when this one should have happened
+        # rather than from now, so the frame rate doesn't drift. if the program
+        # fell more than a frame behind, it skips ahead instead of catching up.
+        now = self._now()
+        self._frame_deadline += self._frame_interval
+        if self._frame_deadline < now:
+            self._frame_deadline = now + self._frame_interval
+        self._root.after(int(self._frame_deadline - now), self._draw_frame)
+
+
+# Finds objects by where they are, using a grid of square cells. Each object
+# is listed in every cell its bounding box touches, so a query only has to look
+# at the objects in the cells it touches rather than at every object. Moving an
+# object only changes the cells it's listed in if it moved into different ones.
+# Objects which would touch more than LARGE cells, like a background or a
+# particle system whose particles have spread far apart, aren't listed in cells
+# at all; they're kept to one side and checked against every query, so an
+# object's size never decides how much work moving it is.
+class _SpatialIndex:
+    # how wide and tall each cell is, in pixels
+    CELL = 64
+    # the most cells an object is listed in
+    LARGE = 64
+
+    def __init__(self):
+        # (column, row) -> {id(object): object}
+        self._cells = {}
+        # id(object) -> (bounding box, (first column, first row, last column,
+        # last row), object)
+        self._boxes = {}
+        # id(object) -> object, for objects too large to list in cells
+        self._large = {}
+
+    # Lists an object under its new bounding box.
+    def update(self, graphic, bounds):
+        span = self._span(bounds)
+        old = self._boxes.get(id(graphic))
+        self._boxes[id(graphic)] = (bounds, span, graphic)
+        if old is not None:
+            if old[1] == span:
+                return
+            self._unlist(graphic, old[1])
+        if _span_size(span) > self.LARGE:
+            self._large[id(graphic)] = graphic
+            return
+        cells = self._cells
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                cell = cells.get((column, row))
+                if cell is None:
+                    cell = cells[(column, row)] = {}
+                cell[id(graphic)] = graphic
+
+    # Stops listing an object.
+    def remove(self, graphic):
+        old = self._boxes.pop(id(graphic), None)
+        if old is not None:
+            self._unlist(graphic, old[1])
+
+    # Returns the objects whose bounding boxes cover a point.
+    def near(self, point):
+        cell = self._cells.get((int(point[0] // self.CELL),
+                                int(point[1] // self.CELL)), {})
+        boxes = self._boxes
+        found = []
+        for objects in (cell, self._large):
+            for key, graphic in objects.items():
+                x0, y0, x1, y1 = boxes[key][0]
+                if x0 <= point[0] <= x1 and y0 <= point[1] <= y1:
+                    found.append(graphic)
+        return found
+
+    # Returns the objects whose bounding boxes overlap a rectangle.
+    def overlapping(self, bbox):
+        left, top, right, bottom = bbox
+        span = self._span(bbox)
+        boxes = self._boxes
+        # a rectangle which covers more cells than have anything in them
+        # only looks at the cells which do
+        if _span_size(span) > len(self._cells):
+            cells = [cell for (column, row), cell in self._cells.items()
+                     if span[0] <= column <= span[2] and
+                     span[1] <= row <= span[3]]
+        else:
+            cells = [self._cells.get((column, row), {})
+                     for column in range(span[0], span[2] + 1)
+                     for row in range(span[1], span[3] + 1)]
+        found = {}
+        for cell in cells + [self._large]:
+            for key, graphic in cell.items():
+                if key in found:
+                    continue
+                x0, y0, x1, y1 = boxes[key][0]
+                if x0 <= right and left <= x1 and y0 <= bottom and \
+                   top <= y1:
+                    found[key] = graphic
+        return list(found.values())
+
+    # Returns every pair of objects whose bounding boxes overlap. A pair can
+    # share several cells, so it's only given by the cell which holds the top
+    # left corner of where their boxes overlap. Large objects are checked
+    # against every other object.
+    def pairs(self):
+        cell_size = self.CELL
+        boxes = self._boxes
+        for (column, row), cell in self._cells.items():
+            if len(cell) < 2:
+                continue
+            entries = [(graphic, boxes[key][0])
+                       for key, graphic in cell.items()]
+            for i in range(len(entries)):
+                first, (ax0, ay0, ax1, ay1) = entries[i]
+                for j in range(i + 1, len(entries)):
+                    second, (bx0, by0, bx1, by1) = entries[j]
+                    if ax0 > bx1 or bx0 > ax1 or ay0 > by1 or by0 > ay1:
+                        continue
+                    if int(max(ax0, bx0) // cell_size) == column and \
+                       int(max(ay0, by0) // cell_size) == row:
+                        yield first, second
+        checked = set()
+        for key, first in self._large.items():
+            checked.add(key)
+            ax0, ay0, ax1, ay1 = boxes[key][0]
+            for other, ((bx0, by0, bx1, by1), span, second) in boxes.items():
+                if other in checked or \
+                   ax0 > bx1 or bx0 > ax1 or ay0 > by1 or by0 > ay1:
+                    continue
+                yield first, second
+
+    # Returns the range of cells a bounding box touches.
+    def _span(self, bounds):
+        cell = self.CELL
+        return (int(bounds[0] // cell), int(bounds[1] // cell),
+                int(bounds[2] // cell), int(bounds[3] // cell))
+
+    # Takes an object out of a range of cells, dropping cells left empty.
+    def _unlist(self, graphic, span):
+        if self._large.pop(id(graphic), None) is not None:
+            return
+        cells = self._cells
+        for column in range(span[0], span[2] + 1):
+            for row in range(span[1], span[3] + 1):
+                cell = cells[(column, row)]
+                del cell[id(graphic)]
+                if not cell:
+                    del cells[(column, row)]
+
+
+# Returns how many cells a range of cells has.
+def _span_size(span):
+    return (span[2] - span[0] + 1) * (span[3] - span[1] + 1)
+
+
+# The tag given to the canvas items of every object with a handler.
+_HANDLED_TAG = "handled"
+
+
+# Keeps track of every object in a Window so that finding an object, its tag or
+# its depth never needs a scan over the whole scene.
+#
+# Objects are looked up by identity (their id, so objects which define __eq__
+# or can't be hashed still work) and by canvas tag with dictionaries. Depths
+# are kept in a sorted list with one entry per distinct depth, and each depth
+# has its own dictionary of objects in the order they were stacked. Adding,
+# removing, retagging and looking up an object are O(1), and changing depth is
+# O(log d) where d is the number of distinct depths in use.
+class _SceneRegistry:
+    def __init__(self):
+        # id(object) -> [depth, tag]
+        self._entries = {}
+        # tag -> object
+        self._tags = {}
+        # depth -> {id(object): object}, bottom of the stack first
+        self._layers = {}
+        # every depth which has at least one object, smallest first
+        self._order = []
+
+    def __contains__(self, graphic):
+        return id(graphic) in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Goes through the objects from the back of the window to the front, which
+    # is largest depth first.
+    def __iter__(self):
+        for depth in reversed(self._order):
+            yield from self._layers[depth].values()
+
+    # Adds an object on top of everything else at its depth.
+    def add(self, graphic):
+        self._entries[id(graphic)] = [graphic._depth, graphic._tag]
+        self._tags[graphic._tag] = graphic
+        self._push(graphic, graphic._depth)
+
+    # Removes an object.
+    def remove(self, graphic):
+        depth, tag = self._entries.pop(id(graphic))
+        del self._tags[tag]
+        self._pull(graphic, depth)
+
+    # Saves the object's new tag after it was given a new canvas item.
+    def retag(self, graphic):
+        entry = self._entries[id(graphic)]
+        del self._tags[entry[1]]
+        entry[1] = graphic._tag
+        self._tags[graphic._tag] = graphic
+
+    # Moves an object to a new depth, on top of everything else at that depth.
+    def set_depth(self, graphic, depth):
+        entry = self._entries[id(graphic)]
+        self._pull(graphic, entry[0])
+        entry[0] = depth
+        self._push(graphic, depth)
+
+    # Returns the depth of an object.
+    def depth(self, graphic):
+        return self._entries[id(graphic)][0]
+
+    # Returns the object with the given tag, or None if there isn't one.
+    def find(self, tag):
+        return self._tags.get(tag)
+
+    # Returns the object drawn directly beneath the given object, or None if
+    # the object is at the back. The object has to be on top of its depth's
+    # layer, which it always is right after being added or given a new depth.
+    def below(self, graphic):
+        depth = self._entries[id(graphic)][0]
+        layer = reversed(self._layers[depth].values())
+        next(layer)
+        for other in layer:
+            return other
+        # nothing else at this depth, so the next deeper layer's top object
+        index = bisect.bisect_right(self._order, depth)
+        if index < len(self._order):
+            return next(reversed(self._layers[self._order[index]].values()))
+        return None
+
+    # Returns whether the object is drawn in front of every other object.
+    def in_front(self, graphic):
+        return next(reversed(self._layers[self._order[0]].values())) is \
+            graphic
+
+    # Puts an object on top of a depth's layer, making the layer if needed.
+    def _push(self, graphic, depth):
+        layer = self._layers.get(depth)
+        if layer is None:
+            layer = self._layers[depth] = {}
+            bisect.insort(self._order, depth)
+        layer[id(graphic)] = graphic
+
+    # Takes an object out of a depth's layer, dropping the layer if it's empty.
+    def _pull(self, graphic, depth):
+        layer = self._layers[depth]
+        del layer[id(graphic)]
+        if not layer:
+            del self._layers[depth]
+            del self._order[bisect.bisect_left(self._order, depth)]
 
 
 #-------------------------------------------------------------------------------
@@ -190,20 +1087,701 @@ class Window:
 # name of a color ("yellow"), or a hex code ("#FFFF00")
 # @param name - string - <b>(default: "Graphics Window")</b>
 # The title of the window
+# @param frame_rate - int - <b>(default: 60)</b> how many times per second the
+# window is redrawn
+# @param idle_sleep - bool - <b>(default: True)</b> whether the program sleeps
+# while waiting for input and timers. Setting this to False keeps checking for
+# events instead, which is slightly faster to respond but keeps the computer
+# busy.
+# @param retained - bool - <b>(default: False)</b> whether the window starts
+# in retained mode, see Window.set_retained
+# @param backend - HeadlessBackend - <b>(default: None)</b> what the window is
+# drawn with, see HeadlessBackend. By default a real window is opened.
+# @return window - Window - the window, once it has been closed
 def StartGraphicsSystem(first_function, width=400, height=400,
-                        background="white", name="Graphics Window"):
+                        background="white", name="Graphics Window",
+                        frame_rate=60, idle_sleep=True, retained=False,
+                        backend=None):
+    # type checking
+    if _validation:
+        assert isinstance(frame_rate, int) and frame_rate > 0 and \
+            isinstance(idle_sleep, bool), \
+            "Make sure frame_rate is an int above 0 and idle_sleep is a bool."
     # creates a window with each parameter
-    win = Window(width, height, background, name, first_function)
-    # this emulates a mainloop tkinter instance, and allows for quieter
-    # exception handling. it still won't handle tk.afters too well. TODO
+    win = Window(width, height, background, name, first_function,
+                 retained=retained, backend=backend)
+    # runs the window until it's closed
+    win._mainloop(frame_rate, idle_sleep)
+    return win
+
+
+#-------------------------------------------------------------------------------
+#
+#  Backends
+#
+#-------------------------------------------------------------------------------
+
+# Draws a Window in a real window on the screen using tkinter.
+class _TkBackend:
+    # the program runs in real time, so work which falls behind is skipped
+    # rather than waited for
+    realtime = True
+
+    # Creates the root and the canvas the window draws on.
+    def open(self, master):
+        root = Tk()
+        frame = Frame(master)
+        frame.pack()
+        canvas = Canvas(frame)
+        canvas.pack()
+        canvas.focus_set()
+        return root, canvas
+
+    # Returns the current time in milliseconds.
+    def now(self):
+        return time.perf_counter() * 1000
+
+    # Turns a PIL image into something the canvas can show.
+    def photo(self, picture):
+        return itk.PhotoImage(picture)
+
+    # Shows a new picture in a photo made by photo, and returns the photo.
+    # The photo is changed in place if it's the right size, so the canvas
+    # doesn't have to be told about it.
+    def update_photo(self, photo, picture):
+        if photo is None or (photo.width(), photo.height()) != picture.size:
+            return itk.PhotoImage(picture)
+        photo.paste(picture)
+        return photo
+
+
+## Draws a Window without a screen, so programs can run on computers which
+# have no display. Timers and RunWithYieldDelay run on a simulated clock, so a
+# program runs as fast as the computer allows rather than in real time. Once the
+# program finishes, Window.get_image gives a picture of the window.
+# @code
+# from cs110graphics import *
+#
+# def main(window):
+#     circle = Circle(window)
+#     window.add(circle)
+#     timer = Timer(window, 100, lambda: circle.move(1, 0))
+#     timer.start()
+#
+# if __name__ == "__main__":
+#     # runs 10 seconds of the program, which takes much less than 10 seconds
+#     window = StartGraphicsSystem(main, backend=HeadlessBackend(10000))
+#     window.get_image().save("circle.png")
+# @endcode
+#
+# Each HeadlessBackend can only be used by one window.
+class HeadlessBackend:
+    # the clock is simulated, so work which falls behind can be waited for
+    realtime = False
+
+    ## @param duration - int - <b>(default: 10000)</b> how many milliseconds of
+    # simulated time the program runs for before the window closes. The window
+    # also closes if Window.close is called.
+    def __init__(self, duration=10000):
+        # type checking
+        if _validation:
+            assert isinstance(duration, int) and duration >= 0, \
+                "Make sure duration is an int that is at least 0."
+        self._duration = duration
+
+    # Creates the root and the canvas the window draws on.
+    def open(self, master):
+        self._root = _HeadlessRoot(self._duration)
+        return self._root, _HeadlessCanvas()
+
+    # Returns the current simulated time in milliseconds.
+    def now(self):
+        return self._root._clock
+
+    # PIL images are kept as they are, since nothing needs to show them.
+    def photo(self, picture):
+        return picture
+
+    # Returns the new picture, since pictures are shown as they are.
+    def update_photo(self, photo, picture):
+        return picture
+
+
+# Stands in for tkinter's Tk when there is no display. Callbacks given to after
+# are run in order on a simulated clock which jumps straight to the next
+# callback instead of waiting for it. Callbacks are run at least 1 ms after
+# they're scheduled, so something which keeps scheduling itself with no delay,
+# like a Timer with an interval of 0, still lets the clock reach the end.
+class _HeadlessRoot:
+    def __init__(self, duration):
+        self._clock = 0
+        self._end = duration
+        self._destroyed = False
+        self._count = 0
+        # (time, order, id) of every scheduled callback
+        self._queue = []
+        # id -> (callback, args) for callbacks which haven't been cancelled
+        self._callbacks = {}
+
+    def title(self, name=None):
+        self._title = name
+
+    def after(self, delay, callback=None, *args):
+        self._count += 1
+        ident = "after#%d" % self._count
+        self._callbacks[ident] = (callback, args)
+        heapq.heappush(self._queue,
+                       (self._clock + max(1, delay), self._count, ident))
+        return ident
+
+    def after_cancel(self, ident):
+        self._callbacks.pop(ident, None)
+
+    def destroy(self):
+        self._destroyed = True
+
+    # Runs callbacks until the window closes or the duration is up.
+    def mainloop(self):
+        while self._step():
+            pass
+
+    # Runs the next callback. Like tkinter, this raises a TclError once the
+    # window has closed.
+    def update(self):
+        if not self._step():
+            raise TclError("application has been destroyed")
+
+    def update_idletasks(self):
+        pass
+
+    # Moves the clock to the next callback and runs it. Returns False once the
+    # window has closed or the duration is up.
+    def _step(self):
+        while self._queue and not self._destroyed:
+            when, order, ident = self._queue[0]
+            if when > self._end:
+                break
+            heapq.heappop(self._queue)
+            entry = self._callbacks.pop(ident, None)
+            if entry is not None:
+                self._clock = max(self._clock, when)
+                entry[0](*entry[1])
+                return True
+        if not self._destroyed:
+            self._clock = max(self._clock, self._end)
+            self._destroyed = True
+        return False
+
+
+# Stands in for tkinter's Canvas when there is no display. It keeps track of
+# each item's kind, coordinates, options and tags along with the order they are
+# stacked in, but doesn't draw anything until a picture is asked for.
+class _HeadlessCanvas:
+    def __init__(self):
+        self._count = 0
+        # id -> [kind, coordinates, options, tags]
+        self._items = {}
+        # item ids, bottom first
+        self._order = []
+        self._bindings = {}
+        self._options = {}
+
+    def configure(self, **options):
+        self._options.update(options)
+
+    def pack(self):
+        pass
+
+    def focus_set(self):
+        pass
+
+    def update(self):
+        pass
+
+    def update_idletasks(self):
+        pass
+
+    def bind(self, sequence, func, add=None):
+        self._bindings[sequence] = func
+
+    def tag_bind(self, tag, sequence, func, add=None):
+        self._bindings[(tag, sequence)] = func
+
+    def create_polygon(self, *coords, **options):
+        return self._create("polygon", coords, options)
+
+    def create_oval(self, *coords, **options):
+        return self._create("oval", coords, options)
+
+    def create_text(self, *coords, **options):
+        return self._create("text", coords, options)
+
+    def create_image(self, *coords, **options):
+        return self._create("image", coords, options)
+
+    def coords(self, tag, *coords):
+        ids = self._find(tag)
+        if not coords:
+            return list(self._items[ids[0]][1]) if ids else []
+        coords = _flatten(coords)
+        for ident in ids:
+            self._items[ident][1] = coords
+
+    def itemconfigure(self, tag, **options):
+        tags = options.pop("tags", None)
+        for ident in self._find(tag):
+            self._items[ident][2].update(options)
+            if tags is not None:
+                self._items[ident][3] = _tag_set(tags)
+
+    itemconfig = itemconfigure
+
+    def itemcget(self, tag, option):
+        return self._items[self._find(tag)[0]][2].get(option, "")
+
+    def type(self, tag):
+        ids = self._find(tag)
+        return self._items[ids[0]][0] if ids else None
+
+    def find_all(self):
+        return tuple(self._order)
+
+    def find_withtag(self, tag):
+        return tuple(self._find(tag))
+
+    def addtag_withtag(self, new_tag, tag):
+        for ident in self._find(tag):
+            self._items[ident][3].add(new_tag)
+
+    def dtag(self, tag, delete=None):
+        for ident in self._find(tag):
+            self._items[ident][3].discard(tag if delete is None else delete)
+
+    def delete(self, *tags):
+        for tag in tags:
+            for ident in self._find(tag):
+                del self._items[ident]
+                self._order.remove(ident)
+
+    def tag_raise(self, tag, above=None):
+        ids = self._find(tag)
+        for ident in ids:
+            self._order.remove(ident)
+        if above is None:
+            self._order.extend(ids)
+        else:
+            index = self._order.index(self._find(above)[-1]) + 1
+            self._order[index:index] = ids
+
+    def tag_lower(self, tag, below=None):
+        ids = self._find(tag)
+        for ident in ids:
+            self._order.remove(ident)
+        index = 0 if below is None else self._order.index(self._find(below)[0])
+        self._order[index:index] = ids
+
+    # Returns a picture of every item on the canvas.
+    def render(self):
+        items = []
+        for ident in self._order:
+            kind, coords, options = self._items[ident][:3]
+            items.append((kind, coords, options))
+        return _render(int(self._options.get("width", 400)),
+                       int(self._options.get("height", 400)),
+                       self._options.get("bg", "white"), items)
+
+    def _create(self, kind, coords, options):
+        self._count += 1
+        tags = _tag_set(options.pop("tags", ()))
+        self._items[self._count] = [kind, _flatten(coords), options, tags]
+        self._order.append(self._count)
+        return self._count
+
+    # Returns the ids of the items with the given tag, bottom first.
+    def _find(self, tag):
+        if isinstance(tag, int):
+            return [tag] if tag in self._items else []
+        if tag == "all":
+            return list(self._order)
+        return [ident for ident in self._order if tag in self._items[ident][3]]
+
+
+# Turns tkinter's tags option, which is a string or a sequence of strings, into
+# a set.
+def _tag_set(tags):
+    if isinstance(tags, str):
+        return {tags}
+    return set(tags)
+
+
+# Turns a sequence of numbers and points into a flat list of numbers.
+def _flatten(coords):
+    flat = []
+    for coord in coords:
+        if isinstance(coord, (tuple, list)):
+            flat.extend(coord)
+        else:
+            flat.append(coord)
+    return flat
+
+
+# Turns a sequence of numbers or of points into a list of points.
+def _pairs(coords):
+    if coords and isinstance(coords[0], (tuple, list)):
+        return list(coords)
+    return list(zip(coords[0::2], coords[1::2]))
+
+
+# Draws items given as (kind, points, options), back to front, on a PIL image
+# the size of the window and returns it.
+def _render(width, height, background, items):
+    picture = image.new("RGB", (width, height),
+                        _pil_color(background) or "white")
+    draw = idraw.Draw(picture)
+    for kind, coords, options in items:
+        if options.get("state") == HIDDEN:
+            continue
+        points = _pairs(coords)
+        if kind == "polygon" or kind == "oval":
+            fill = _pil_color(options.get("fill", ""))
+            outline = _pil_color(options.get("outline", "black"))
+            border = int(options.get("width", 1))
+            if kind == "oval":
+                draw.ellipse(points[:2], fill=fill,
+                             outline=outline if border > 0 else None,
+                             width=border)
+            else:
+                draw.polygon(points, fill=fill)
+                if outline is not None and border > 0:
+                    draw.line(points + points[:1], fill=outline, width=border,
+                              joint="curve")
+        elif kind == "text":
+            font = _pil_font(options.get("font", ("Helvetica", 12))[1])
+            draw.text(points[0], str(options.get("text", "")),
+                      fill=_pil_color(options.get("fill", "black")),
+                      font=font, anchor="mm")
+        elif kind == "image":
+            picture_of_item = options["image"].convert("RGBA")
+            corner = (int(points[0][0]), int(points[0][1]))
+            if options.get("anchor", CENTER) == CENTER:
+                corner = (int(points[0][0] - picture_of_item.width / 2),
+                          int(points[0][1] - picture_of_item.height / 2))
+            picture.paste(picture_of_item, corner, picture_of_item)
+    return picture
+
+
+# Turns a tkinter color into one PIL understands, or None for no color.
+def _pil_color(color):
+    if not color:
+        return None
     try:
+        return icolor.getrgb(color)
+    except ValueError:
+        pass
+    # tkinter allows names like "light blue" which PIL spells "lightblue"
+    try:
+        return icolor.getrgb(color.replace(" ", "").lower())
+    except ValueError:
+        return (0, 0, 0)
+
+
+# Returns a font of the given size for drawing text, reusing fonts which have
+# already been loaded.
+def _pil_font(size):
+    font = _pil_fonts.get(size)
+    if font is None:
+        try:
+            font = ifont.load_default(size)
+        except TypeError:
+            # versions of PIL before 10.1 only have one size of default font
+            font = ifont.load_default()
+        _pil_fonts[size] = font
+    return font
+
+
+_pil_fonts = {}
+
+
+#-------------------------------------------------------------------------------
+#
+#  Recording
+#
+#-------------------------------------------------------------------------------
+
+# Records a window by taking a snapshot of its contents frame_rate times a
+# second. Taking a snapshot is quick, and a background thread draws each
+# snapshot and gives it to a writer which saves it straight away.
+#
+# NOTE: USE Window.start_recording INSTEAD OF MAKING THIS CLASS DIRECTLY.
+class _Recorder:
+    # the most snapshots which can wait to be saved at once
+    BACKLOG = 32
+
+    def __init__(self, window, filename, frame_rate):
+        self._window = window
+        self._interval = 1000 / frame_rate
+        if filename.lower().endswith(".gif"):
+            self._writer = _GifWriter(filename, self._interval)
+        else:
+            self._writer = _PngWriter(filename)
+        self._snapshots = queue.Queue(self.BACKLOG)
+        self._frames = 0
+        self._dropped = 0
+        self._work_time = 0.0
+        self._thread = threading.Thread(target=self._save_frames, daemon=True)
+        self._thread.start()
+        self._deadline = window._now()
+        self._capture()
+
+    # Stops taking snapshots and waits for the ones left to be saved.
+    def stop(self):
+        self._window._root.after_cancel(self._tag)
+        self._snapshots.put(None)
+        self._thread.join()
+        self._writer.close()
+
+    # Returns how the recording is going.
+    def stats(self):
+        fps = self._frames / self._work_time if self._work_time else 0.0
+        return {"frames": self._frames, "dropped": self._dropped, "fps": fps}
+
+    # Takes a snapshot of the window and schedules the next one.
+    def _capture(self):
+        window = self._window
+        snapshot = (window._width, window._height, window._background,
+                    window._snapshot())
+        # a real window can't wait for the saving thread, so the frame is
+        # dropped if it's too far behind. a headless one just waits.
+        try:
+            self._snapshots.put(snapshot, not window._backend.realtime)
+        except queue.Full:
+            self._dropped += 1
+        # scheduled the same way as Window._draw_frame so it doesn't drift
+        now = window._now()
+        self._deadline += self._interval
+        if self._deadline < now:
+            self._deadline = now + self._interval
+        self._tag = window._root.after(int(self._deadline - now),
+                                       self._capture)
+
+    # Runs on the background thread, drawing and saving each snapshot until
+    # the recording is stopped.
+    def _save_frames(self):
         while True:
-            win._canvas.update()
-            win._canvas.after(200)
-    except TclError:
+            snapshot = self._snapshots.get()
+            if snapshot is None:
+                return
+            start = time.perf_counter()
+            self._writer.write(_render(*snapshot))
+            self._work_time += time.perf_counter() - start
+            self._frames += 1
+
+
+# Saves every frame as its own numbered PNG file.
+class _PngWriter:
+    def __init__(self, filename):
+        # puts a frame number in front of the extension if the name doesn't
+        # say where it goes
+        if "%" not in filename:
+            root, extension = os.path.splitext(filename)
+            filename = root + "%05d" + (extension or ".png")
+        self._filename = filename
+        self._count = 0
+
+    def write(self, picture):
+        picture.save(self._filename % self._count)
+        self._count += 1
+
+    def close(self):
         pass
 
 
+# Saves frames one at a time into an animated GIF, so the frames never need to
+# be held in memory together.
+class _GifWriter:
+    def __init__(self, filename, interval):
+        self._file = open(filename, "wb")
+        self._duration = int(round(interval))
+        self._started = False
+
+    def write(self, picture):
+        # each frame gets its own palette, since colors can change between
+        # frames
+        picture = picture.convert("P", palette=image.ADAPTIVE)
+        if not self._started:
+            # the header is written with the first frame, looping forever
+            for data in igif.getheader(picture, info={"loop": 0})[0]:
+                self._file.write(data)
+            self._started = True
+        for data in igif.getdata(picture, duration=self._duration,
+                                 include_color_table=True):
+            self._file.write(data)
+
+    def close(self):
+        # ";" marks the end of a GIF file
+        if self._started:
+            self._file.write(b";")
+        self._file.close()
+
+
+#-------------------------------------------------------------------------------
+#
+#  Profiling
+#
+#-------------------------------------------------------------------------------
+
+# Measures where the time in each frame goes while a window is being profiled.
+# Handlers, timers and generators time themselves with clock and record, and
+# the window ends each frame with end_frame.
+class _Profiler:
+    # how many frames are kept
+    FRAMES = 120
+    # how often the overlay is updated, in seconds
+    OVERLAY_INTERVAL = 0.5
+    # the kinds of work which are timed
+    KINDS = ("handlers", "timers", "generators", "render")
+
+    def __init__(self, canvas, overlay):
+        # canvas calls of each kind in the current frame, see _CountingCanvas
+        self.counts = {"creates": 0, "deletes": 0, "configures": 0,
+                       "coords": 0}
+        # seconds spent on each kind of work in the current frame
+        self._times = dict.fromkeys(self.KINDS, 0)
+        self._frames = deque(maxlen=self.FRAMES)
+        # function name -> [calls, total seconds, longest seconds]
+        self._callbacks = {}
+        # for each piece of work being timed, the seconds taken by work it
+        # started itself (like a timer which calls a handler), which isn't
+        # counted twice
+        self._nested = []
+        self._frame_start = time.perf_counter()
+        # the overlay is drawn straight onto the canvas rather than being a
+        # Text object, so it isn't in the window's objects and its own canvas
+        # calls aren't counted
+        self._canvas = canvas
+        self._overlay = None
+        self._overlay_time = 0
+        if overlay:
+            self._overlay = canvas.create_text(6, 6, anchor=NW, text="",
+                                               font=("Courier", 10))
+
+    # Returns the time, to give to record once the work is done.
+    def clock(self):
+        self._nested.append(0)
+        return time.perf_counter()
+
+    # Adds the time since started to a kind of work and to the function which
+    # did it, if it was one of the program's own.
+    def record(self, kind, func, started):
+        seconds = time.perf_counter() - started
+        self._times[kind] += seconds - self._nested.pop()
+        if self._nested:
+            self._nested[-1] += seconds
+        if func is None:
+            return
+        name = getattr(func, "__qualname__", None) or repr(func)
+        entry = self._callbacks.get(name)
+        if entry is None:
+            self._callbacks[name] = [1, seconds, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+            entry[2] = max(entry[2], seconds)
+
+    # Finishes the current frame and starts the next one.
+    def end_frame(self):
+        now = time.perf_counter()
+        frame = {"frame": (now - self._frame_start) * 1000}
+        for kind in self.KINDS:
+            frame[kind] = self._times[kind] * 1000
+            self._times[kind] = 0
+        # the counts are reset in place, since the canvas adds to them
+        for key in self.counts:
+            frame[key] = self.counts[key]
+            self.counts[key] = 0
+        self._frames.append(frame)
+        self._frame_start = now
+        # work which raised an error was never recorded, so it's forgotten
+        self._nested = []
+        if self._overlay is not None and \
+           now - self._overlay_time >= self.OVERLAY_INTERVAL:
+            self._overlay_time = now
+            self._show()
+
+    # Returns what's been measured, see Window.get_profile.
+    def profile(self):
+        frames = list(self._frames)
+        total = sum(frame["frame"] for frame in frames)
+        slowest = sorted(self._callbacks.items(),
+                         key=lambda item: item[1][2], reverse=True)[:5]
+        return {"fps": len(frames) / total * 1000 if total else 0.0,
+                "frames": frames,
+                "slowest": [{"name": name, "calls": calls,
+                             "total": seconds * 1000,
+                             "longest": longest * 1000}
+                            for name, (calls, seconds, longest) in slowest]}
+
+    # Updates the overlay with the frame rate, the average time taken by
+    # each kind of work and the slowest functions.
+    def _show(self):
+        profile = self.profile()
+        frames = profile["frames"]
+        lines = ["%.1f fps" % profile["fps"]]
+        for kind in self.KINDS:
+            average = sum(frame[kind] for frame in frames) / len(frames)
+            lines.append("%-11s%6.2f ms" % (kind, average))
+        for entry in profile["slowest"][:3]:
+            lines.append("%6.2f ms %s" % (entry["longest"], entry["name"]))
+        self._canvas.itemconfigure(self._overlay, text="\n".join(lines))
+        self._canvas.tag_raise(self._overlay)
+
+    # Removes the overlay.
+    def stop(self):
+        if self._overlay is not None:
+            self._canvas.delete(self._overlay)
+            self._overlay = None
+
+
+# Stands in for a window's canvas while it's being profiled, counting the
+# calls which create, delete, configure and move items before passing them on.
+class _CountingCanvas:
+    def __init__(self, canvas, counts):
+        self._canvas = canvas
+        self._counts = counts
+
+    # everything else is passed straight on to the canvas
+    def __getattr__(self, name):
+        return getattr(self._canvas, name)
+
+    def create_polygon(self, *coords, **options):
+        self._counts["creates"] += 1
+        return self._canvas.create_polygon(*coords, **options)
+
+    def create_oval(self, *coords, **options):
+        self._counts["creates"] += 1
+        return self._canvas.create_oval(*coords, **options)
+
+    def create_text(self, *coords, **options):
+        self._counts["creates"] += 1
+        return self._canvas.create_text(*coords, **options)
+
+    def create_image(self, *coords, **options):
+        self._counts["creates"] += 1
+        return self._canvas.create_image(*coords, **options)
+
+    def delete(self, *tags):
+        self._counts["deletes"] += 1
+        return self._canvas.delete(*tags)
+
+    def itemconfigure(self, tag, **options):
+        self._counts["configures"] += 1
+        return self._canvas.itemconfigure(tag, **options)
+
+    def coords(self, tag, *coords):
+        self._counts["coords"] += 1
+        return self._canvas.coords(tag, *coords)
+
+
 #-------------------------------------------------------------------------------
 #
 #  Event
@@ -220,15 +1798,33 @@ def StartGraphicsSystem(first_function, width=400, height=400,
 # Each of these actions will call their corresponding methods in EventHandler
 # automatically and give an instance of Event to the method called.
 class Event:
-    
+    # an Event is made for every bit of input, so it only holds on to
+    # tkinter's event and reads from it when asked
+    __slots__ = ("_event",)
+
     def __init__(self, event):
-        # converting each necessary tkinter event parameter to something easier
-        # to get access to and easier to understand
-        self._type = event.type
-        self._location = (event.x, event.y)
-        self._rootLocation = (event.x_root, event.y_root)
-        self._keysym = event.keysym
-        self._num = event.num
+        self._event = event
+
+    # the tkinter event parameters, under the names they've always had
+    @property
+    def _type(self):
+        return self._event.type
+
+    @property
+    def _location(self):
+        return (self._event.x, self._event.y)
+
+    @property
+    def _rootLocation(self):
+        return (self._event.x_root, self._event.y_root)
+
+    @property
+    def _keysym(self):
+        return self._event.keysym
+
+    @property
+    def _num(self):
+        return self._event.num
 
     ## Returns the mouse button that is attached to the event. Returns
     # <tt>None</tt> if
@@ -243,15 +1839,10 @@ class Event:
     def get_button(self):
         # this is mostly to handle user stupidity - why would you put
         # get_button in a handle_key function if get_key exists?
-        if self._num == "??":
+        num = self._event.num
+        if num == "??":
             return None
-        # dictionary to translate each number to a string
-        numTranslation = {
-            1: "Left Mouse Button",
-            2: "Middle Mouse Button",
-            3: "Right Mouse Button"
-        }
-        return numTranslation[self._num]
+        return _BUTTON_NAMES[num]
 
     ## Returns the description of the event.
     # @return description - str
@@ -265,17 +1856,7 @@ class Event:
     # - "Mouse Enter"
     # - "Mouse Leave"
     def get_description(self):
-        # dictionary to translate each number to a string
-        descriptionTranslation = {
-            '2': "Key Press",
-            '3': "Key Release",
-            '4': "Mouse Press",
-            '5': "Mouse Release",
-            '6': "Mouse Move",
-            '7': "Mouse Enter",
-            '8': "Mouse Leave",
-        }
-        return descriptionTranslation[self._type]
+        return _DESCRIPTIONS[self._event.type]
 
     ## Returns the keyboard key that is attached to the event. Returns None if
     # the key fails to exist (like if the Event handles a mouse press).
@@ -286,21 +1867,41 @@ class Event:
     def get_key(self):
         # this is mostly to handle user stupidity - why would you put
         # get_key in a handle_mouse function if get_button exists?
-        if self._keysym == "??":
+        keysym = self._event.keysym
+        if keysym == "??":
             return None
-        return self._keysym
+        return keysym
 
     ## Returns a tuple of the x and y coordinates of the mouse
     # location in the canvas.
     # @return location - tuple of (int * int) - (e.g. (200, 200))
     def get_mouse_location(self):
-        return self._location
+        return (self._event.x, self._event.y)
 
     ## Returns a tuple of the x and y coordinates of the mouse location in the
     # window. Typically using get_mouse_location is more applicable.
     # @return location - tuple of (int * int) - (e.g. (200, 200))
     def get_root_mouse_location(self):
-        return self._rootLocation
+        return (self._event.x_root, self._event.y_root)
+
+
+# dictionary to translate each mouse button number to a string
+_BUTTON_NAMES = {
+    1: "Left Mouse Button",
+    2: "Middle Mouse Button",
+    3: "Right Mouse Button"
+}
+
+# dictionary to translate each tkinter event type to a string
+_DESCRIPTIONS = {
+    '2': "Key Press",
+    '3': "Key Release",
+    '4': "Mouse Press",
+    '5': "Mouse Release",
+    '6': "Mouse Move",
+    '7': "Mouse Enter",
+    '8': "Mouse Leave",
+}
 
 
 #-------------------------------------------------------------------------------
@@ -486,15 +2087,31 @@ class EventHandler:
         pass
 
 
-# "Overwrites" the event handler and calls an external EventHandler.
-def _call_handler(handler, event):
-    # checks if argument count is > 1 and then appends the event to the handler
-    # if it is
-    arg_count = len(inspect.getargs(handler.__code__)[0])
-    if arg_count == 1:
-        handler()
-    else:
-        handler(event)
+# The names of the methods an EventHandler can have.
+_HANDLER_METHODS = ("handle_key_press", "handle_key_release",
+                    "handle_mouse_enter", "handle_mouse_leave",
+                    "handle_mouse_move", "handle_mouse_press",
+                    "handle_mouse_release")
+
+
+# Looks up each of a handler's methods once and works out whether it takes the
+# event, so that nothing has to be looked up while events are coming in.
+# Returns a dict of method name -> (method, whether it takes the event).
+# Handlers which don't extend EventHandler may not have every method, and
+# those events are ignored.
+def _dispatch_table(handler_object):
+    table = {}
+    for name in _HANDLER_METHODS:
+        func = getattr(handler_object, name, None)
+        if func is None:
+            continue
+        # a method which only takes self is called without the event.
+        # anything without code to look at, like a functools.partial, is
+        # given the event.
+        code = getattr(func, "__code__", None)
+        takes_event = code is None or len(inspect.getargs(code)[0]) != 1
+        table[name] = (func, takes_event)
+    return table
 
 
 #-------------------------------------------------------------------------------
@@ -510,69 +2127,49 @@ def _call_handler(handler, event):
 # Default values:
 # - depth = 50
 # - center = (200, 200)
+#
+# Graphical objects keep their own attributes in __slots__ rather than in a
+# dictionary each, which saves a lot of memory in windows with thousands of
+# objects. Any other attribute, such as <tt>square.velocity = 3</tt>, can
+# still be given to an object as usual, and only then does it get a
+# dictionary.
 class GraphicalObject:
+    __slots__ = ("_window", "_center", "_depth", "_enabled", "_tag", "_drawn",
+                 "_has_handlers", "_parent_object", "_dispatch", "__dict__",
+                 "__weakref__")
+
     def __init__(self):
         self._depth = 50
         self._center = (200, 200)
         self._has_handlers = False
+        # objects only get a canvas item, and a place in window._graphics,
+        # once they're added to the window
+        self._enabled = False
+        self._tag = None
 
     ## Adds a handler to the graphical object.
     # @param handler_object - EventHandler - the object that handles
     # the events for this GraphicalObject
     def add_handler(self, handler_object):
-        def key_press(event):
-            tkEvent = Event(event)
-            _call_handler(handler_object.handle_key_press, tkEvent)
-
-        def key_release(event):
-            tkEvent = Event(event)
-            _call_handler(handler_object.handle_key_release, tkEvent)
-
-        def mouse_enter(event):
-            tkEvent = Event(event)
-            _call_handler(handler_object.handle_mouse_enter, tkEvent)
-
-        def mouse_leave(event):
-            tkEvent = Event(event)
-            _call_handler(handler_object.handle_mouse_leave, tkEvent)
-
-        def mouse_move(event):
-            tkEvent = Event(event)
-            _call_handler(handler_object.handle_mouse_move, tkEvent)
-
-        def mouse_press(event):
-            tkEvent = Event(event)
-            _call_handler(handler_object.handle_mouse_press, tkEvent)
-
-        def mouse_release(event):
-            tkEvent = Event(event)
-            _call_handler(handler_object.handle_mouse_release, tkEvent)
-
-        # this is to enable readding handlers after each object's tag is
-        # changed
+        # the window passes events on to the handler, so adding it only needs
+        # to be done once rather than every time the object changes. an object
+        # which already had a handler has it replaced.
+        if self._tag is not None:
+            self._window._unlisten(self)
+        # this is to enable readding handlers after the object is removed from
+        # the window and added back
         self._parent_object = handler_object
+        self._dispatch = _dispatch_table(handler_object)
         self._has_handlers = True
-        # the duplicates are necessary to allow support for multiple mouse
-        # buttons
-        types = ["<Key>", "<KeyRelease>", "<Enter>", "<Leave>",
-                 "<Motion>", "<Button-1>", "<Button-2>", "<Button-3>",
-                 "<ButtonRelease-1>", "<ButtonRelease-2>", "<ButtonRelease-3>"]
-        funcs = [key_press, key_release, mouse_enter, mouse_leave, mouse_move,
-                 mouse_press, mouse_press, mouse_press,
-                 mouse_release, mouse_release, mouse_release]
-        # goes through each bind and binds it to canvas if it's a key based
-        # object and binds it to the graphical object if it's not a key based
-        # object
-        for i in range(len(types)):
-            if "Key" in types[i]:
-                self._window._canvas.bind(types[i], funcs[i])
-            else:
-                self._window._canvas.tag_bind(self._tag, types[i], funcs[i])
+        if self._tag is not None:
+            self._window._listen(self)
 
     ## Returns the center of the object.
     # @return center - tuple
     def get_center(self):
-        return self._center
+        # the center is kept exactly, so turning an object around a pivot
+        # many times doesn't make it drift, and is only rounded here
+        return (round(self._center[0]), round(self._center[1]))
 
     ## Returns the depth of the object.
     # @return depth - int
@@ -584,70 +2181,145 @@ class GraphicalObject:
     # @param dy - int
     def move(self, dx, dy):
         # type checking
-        assert isinstance(dx, int) and isinstance(dy, int), \
-            "Make sure dx and dy are both ints."
+        if _validation:
+            assert isinstance(dx, int) and isinstance(dy, int), \
+                "Make sure dx and dy are both ints."
         self._center = (self._center[0] + dx, self._center[1] + dy)
-        # goes through each point and increments it by dx or dy depending if
-        # its index is even or odd
-        for i in range(len(self._points)):
-                self._points[i] = (self._points[i][0] + dx,
-                                   self._points[i][1] + dy)
+        self._translate(dx, dy)
         self._refresh()
 
     ## Moves a graphical object to a point.
     # @param point - tuple of (int * int)
     def move_to(self, point):
         # type checking
-        assert isinstance(point, tuple) and len(point) == 2 and \
-            isinstance(point[0], int) and isinstance(point[1], int), \
-            "Make sure point is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(point, tuple) and len(point) == 2 and \
+                isinstance(point[0], int) and isinstance(point[1], int), \
+                "Make sure point is a tuple of (int * int)."
         difference = (self._center[0] - point[0], self._center[1] - point[1])
         self._center = point
-        # goes through each point and increments it by dx or dy depending if
-        # its index is even or odd
-        for i in range(len(self._points)):
-                self._points[i] = (self._points[i][0] - difference[0],
-                                   self._points[i][1] - difference[1])
+        self._translate(-difference[0], -difference[1])
         self._refresh()
 
-    # Removes and adds an object after it's been changed.
+    # Returns the object's bounding box as (left, top, right, bottom).
+    def _bounds(self):
+        coords = self._coords()
+        xs = coords[0::2]
+        ys = coords[1::2]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    # Returns the shape used to check for collisions, which is either
+    # ("circle", (x, y, radius)), ("oval", (x, y, radiusX, radiusY, angle)),
+    # ("convex", flat list of points) for convex polygons or
+    # ("polygon", flat list of points) for any other polygon. By default this
+    # is the bounding box.
+    def _shape(self):
+        x0, y0, x1, y1 = self._bounds()
+        return ("convex", [x0, y0, x1, y0, x1, y1, x0, y1])
+
+    # Returns whether the object covers a point. By default this is whether the
+    # point is in its bounding box.
+    def _contains(self, point):
+        x0, y0, x1, y1 = self._bounds()
+        return x0 <= point[0] <= x1 and y0 <= point[1] <= y1
+
+    # Shifts any points the object keeps track of by dx and dy. Objects which
+    # are drawn from their center alone have nothing to shift.
+    def _translate(self, dx, dy):
+        pass
+
+    # Pushes the current state of an object onto its existing canvas item after
+    # it's been changed.
     def _refresh(self):
-        # since this is run for every object we need a special case if the
-        # object is a graphical object and not a fillable
-            # in that case, we remove it and readd it without using any canvas
-            # operators, add handlers if they exist, and return
-        if isinstance(self, Text) or isinstance(self, Image):
-            self._remove_from(self._window)
-            self._add_to()
-            self._window._update_tag(self)
+        # objects which have been removed from the window have no canvas item,
+        # so there's nothing to update until they're added again
+        if self._tag is None:
+            return
+        # the object may have moved, so its place in the window's index is
+        # worked out again before the index is next used
+        self._window._stale[id(self)] = self
+        # inside Window.batch the update waits for the end of the batch
+        if self._window._batching:
+            self._window._dirty[id(self)] = (self, True)
+            return
+        self._draw(True)
+
+    # Sends the given style options to the canvas item, skipping any which
+    # already have that value on the canvas.
+    def _configure(self, **options):
+        if self._tag is None:
+            return
+        # inside Window.batch the options are read from the object when the
+        # batch ends, so they only need to be marked as changed
+        if self._window._batching:
+            self._window._dirty.setdefault(id(self), (self, False))
+            return
+        self._send(options)
+
+    # Updates the canvas item. The canvas item, its tag, its handlers and its
+    # place in the stacking order are all kept, so only the coordinates (if
+    # the object moved) and any options which actually changed need to be sent
+    # to tkinter.
+    def _draw(self, moved):
+        if self._tag is None:
+            return
+        if moved:
+            self._window._canvas.coords(self._tag, *self._coords())
+        self._send(self._all_options())
+
+    # Configures whichever of the options differ from what's on the canvas.
+    # Images are compared by identity, since comparing two PIL images
+    # compares every pixel.
+    def _send(self, options):
+        changed = {}
+        for key in options:
+            if key == "image":
+                if self._drawn.get(key) is not options[key]:
+                    changed[key] = options[key]
+            elif self._drawn.get(key) != options[key]:
+                changed[key] = options[key]
+        if changed:
+            self._drawn.update(changed)
+            self._window._canvas.itemconfigure(self._tag, **changed)
+
+    # Returns every option which is given to the canvas, including whether
+    # the object is shown.
+    def _all_options(self):
+        options = self._options()
+        options["state"] = NORMAL if self._enabled else HIDDEN
+        return options
+
+    # Adds a graphical object to the canvas.
+    def _add_to(self):
+        self._enabled = True
+        # an object that isn't in the window, either because it's new or
+        # because it was removed, has no canvas item, so one is made (already
+        # shown), put into window._graphics and given its handlers. otherwise
+        # the object is already in the window and only needs to be shown.
+        if self._tag is None:
+            self._tag = self._create_item()
+            self._window._register(self)
             if self._has_handlers:
-                self.add_handler(self._parent_object)
+                self._window._listen(self)
         else:
-            # from here on out we're assuming fillables only.
-            # we remove the object from the window, and then if the object is
-            # disabled we readd it with the HIDDEN state, otherwise just readd
-            # it
-            self._remove_from(self._window)
-            if self._enabled is False:
-                self._tag = self._window._canvas.create_polygon(
-                    *self._points,
-                    width=self.get_border_width(),
-                    fill=self.get_fill_color(),
-                    outline=self.get_border_color(),
-                    state=HIDDEN
-                )
-            else:
-                self._tag = self._window._canvas.create_polygon(
-                    *self._points,
-                    width=self.get_border_width(),
-                    fill=self.get_fill_color(),
-                    outline=self.get_border_color()
-                )
-            # we then update the tag, and then readd handlers if they exist
-            # if we don't then the event will only run once and then not again
-            self._window._update_tag(self)
-            if self._has_handlers:
-                self.add_handler(self._parent_object)
+            self._configure(state=NORMAL)
+
+    # Replaces the canvas item with a new one, for when the object needs a
+    # different kind of item. The new item takes the old one's place in the
+    # stacking order and in window._graphics, and gets the object's handlers.
+    def _replace_item(self):
+        if self._tag is None:
+            return
+        if self._has_handlers:
+            self._window._unlisten(self)
+        old_tag = self._tag
+        self._tag = self._create_item()
+        self._window._canvas.tag_raise(self._tag, old_tag)
+        self._window._canvas.delete(old_tag)
+        self._window._graphics.retag(self)
+        self._window._stale[id(self)] = self
+        if self._has_handlers:
+            self._window._listen(self)
 
     ## Removes a graphical object from the canvas.
     def _remove_from(self, window):
@@ -657,14 +2329,14 @@ class GraphicalObject:
     # @param depth - int
     def set_depth(self, depth):
         # type checking
-        assert isinstance(depth, int), \
-            "Make sure depth is an int."
+        if _validation:
+            assert isinstance(depth, int), \
+                "Make sure depth is an int."
         self._depth = depth
-        self._window._update_tag(self)
-        self._window._graphics.sort()
-        # get rid of all objects and readd them in depth order
-        for graphic in reversed(self._window._graphics):
-            graphic[2]._refresh()
+        # objects which aren't in the window get their depth when readded
+        if self in self._window._graphics:
+            self._window._graphics.set_depth(self, depth)
+            self._window._restack(self)
 
 
 #-------------------------------------------------------------------------------
@@ -683,6 +2355,9 @@ class GraphicalObject:
 # - fill color = "white"
 # - pivot = center
 class Fillable(GraphicalObject):
+    __slots__ = ("_border_color", "_border_width", "_fill_color", "_pivot",
+                 "_vertices", "_origin", "_matrix", "_screen", "_is_convex")
+
     def __init__(self):
         GraphicalObject.__init__(self)
         # default values - otherwise when an object is changed later it reverts
@@ -691,6 +2366,97 @@ class Fillable(GraphicalObject):
         self._border_width = 2
         self._fill_color = "white"
         self._pivot = self._center
+        # the object's points are kept as they were first given, along with
+        # one transform which says how they've been moved, turned and scaled
+        # since then. shapes which have points set them with _set_vertices,
+        # and shapes drawn from their center and radii (circles and ovals)
+        # don't have any.
+
+    # Creates the polygon (or oval) on the canvas and returns its tag.
+    def _create_item(self):
+        self._drawn = self._all_options()
+        if self._kind() == "oval":
+            return self._window._canvas.create_oval(*self._coords(),
+                                                    **self._drawn)
+        return self._window._canvas.create_polygon(*self._coords(),
+                                                   **self._drawn)
+
+    # Returns the kind of canvas item the object is drawn with.
+    def _kind(self):
+        return "polygon"
+
+    # Returns the points which are given to the canvas, as one flat list of
+    # x and y values. They're only worked out again after the object has
+    # changed.
+    def _coords(self):
+        if self._screen is None:
+            self._screen = _vertex_transform(self._vertices, self._matrix)
+        return self._screen
+
+    # The object's points as a list of tuples of (int * int).
+    @property
+    def _points(self):
+        coords = self._coords()
+        return [(round(coords[i]), round(coords[i + 1]))
+                for i in range(0, len(coords), 2)]
+
+    # Returns whether the object covers a point, going by its outline rather
+    # than its bounding box.
+    def _contains(self, point):
+        coords = self._coords()
+        if self._kind() == "oval":
+            return _oval_contains(coords, point)
+        return _polygon_contains(coords, point)
+
+    # Returns the shape used to check for collisions, which is its outline.
+    def _shape(self):
+        if self._is_convex:
+            return ("convex", self._coords())
+        return ("polygon", self._coords())
+
+    # Replaces the object's points, forgetting how it's been transformed.
+    def _set_vertices(self, points):
+        self._vertices = _vertex_buffer(points)
+        # moving, turning and scaling a shape doesn't change whether it's
+        # convex, so this is only worked out when it gets new points
+        self._is_convex = _convex([value for point in points
+                                for value in point])
+        # the center is kept where it would be before any transform, so it
+        # can be moved with the points instead of being turned separately
+        self._origin = self._center
+        self._matrix = _IDENTITY
+        self._screen = None
+
+    # Gives a Square or Rectangle the corners of a box its width and height
+    # around its center, forgetting how it's been transformed. The corners
+    # are kept around (0, 0), with the center in the transform, so boxes of
+    # the same size share them.
+    def _set_box(self):
+        self._vertices = _box_vertices(self._width, self._height)
+        self._is_convex = True
+        self._origin = (0.0, 0.0)
+        self._matrix = _IDENTITY[:4] + (float(self._center[0]),
+                                        float(self._center[1]))
+        self._screen = None
+
+    # Applies another transform on top of the object's current one.
+    def _transform(self, matrix):
+        self._matrix = _matrix_multiply(matrix, self._matrix)
+        self._center = _transform_point(self._matrix, self._origin)
+        self._screen = None
+
+    # Shifts every point by dx and dy.
+    def _translate(self, dx, dy):
+        a, b, c, d, e, f = self._matrix
+        self._matrix = (a, b, c, d, e + dx, f + dy)
+        self._center = _transform_point(self._matrix, self._origin)
+        self._screen = None
+
+    # Returns the style options which are given to the canvas.
+    def _options(self):
+        return {"width": self._border_width,
+                "fill": self._fill_color,
+                "outline": self._border_color}
 
     ## Returns the border color.
     # @return border_color - str - Can be either the
@@ -712,44 +2478,34 @@ class Fillable(GraphicalObject):
     ## Returns the pivot point.
     # @return pivot - tuple (int * int)
     def get_pivot(self):
-        return self._pivot
+        return (round(self._pivot[0]), round(self._pivot[1]))
 
     ## Rotates the object.
     # @param degrees - int
     def rotate(self, degrees):
         # type checking
         # print("DEBUG: before rotate: " + str(self._center))
-        assert isinstance(degrees, int), \
-            "Make sure degrees is an int."
-        # calculates radians, runs _rotate_helper, moves back to its center and
-        # refreshes
+        if _validation:
+            assert isinstance(degrees, int), \
+                "Make sure degrees is an int."
+        # calculates radians, turns the object (and with it its center)
+        # around the pivot and refreshes
         radians = (math.pi / 180) * degrees
-        for i in range(len(self._points)):
-            self._points[i] = _rotate_helper(self._points[i],
-                                             radians,
-                                             self._pivot)
+        self._transform(_rotation_matrix(radians, self._pivot))
         # print("DEBUG: after rotate: " + str(self._center))
-        self.move_to(self._center)
         self._refresh()
 
     ## Scales the object up or down depending on the factor.
     # @param factor - float
     def scale(self, factor):
         # type checking
-        assert isinstance(factor, float), \
-            "Make sure the scale factor is a float."
-        # saves the center, moves the object to the origin, modifies every
-        # point so it's scaled, moves it back to the center and refreshes
-        temp_center = self._center
-        self.move_to((0, 0))
-        for i in range(len(self._points)):
-            temp_tuple = (int(self._points[i][0] * factor),
-                          int(self._points[i][1] * factor))
-            self._points[i] = temp_tuple
-        self._pivot = (round(self._pivot[0] * factor),
-                       round(self._pivot[1] * factor))
-        self.move_to(temp_center)
-        self._center = temp_center
+        if _validation:
+            assert isinstance(factor, float), \
+                "Make sure the scale factor is a float."
+        # moves every point (and the pivot) so it's factor times as far from
+        # the center as it was and refreshes
+        self._transform(_scaling_matrix(factor, self._center))
+        self._pivot = _scale_helper(self._pivot, factor, self._center)
         self._refresh()
 
     def move(self, dx, dy):
@@ -772,57 +2528,391 @@ class Fillable(GraphicalObject):
     # name of a color ("yellow"), or a hex code ("#FFFF00")
     def set_border_color(self, color):
         # type checking
-        assert isinstance(color, str), \
-            "Make sure the border color is a string."
+        if _validation:
+            assert isinstance(color, str), \
+                "Make sure the border color is a string."
         self._border_color = color
-        self._window._canvas.itemconfigure(self._tag, outline=color)
+        self._configure(outline=color)
 
     ## Sets the border width.
     # @param width - int
     def set_border_width(self, width):
         # type checking
-        assert isinstance(width, int), \
-            "Make sure the border width is an int."
+        if _validation:
+            assert isinstance(width, int), \
+                "Make sure the border width is an int."
         self._border_width = width
-        self._window._canvas.itemconfigure(self._tag, width=width)
+        self._configure(width=width)
 
     ## Sets the fill color.
     # @param color - string - Can be either the
     # name of a color ("yellow"), or a hex code ("#FFFF00")
     def set_fill_color(self, color):
         # type checking
-        assert isinstance(color, str), \
-            "Make sure the fill color is a string."
+        if _validation:
+            assert isinstance(color, str), \
+                "Make sure the fill color is a string."
         self._fill_color = color
-        self._window._canvas.itemconfigure(self._tag, fill=color)
+        self._configure(fill=color)
 
     ## Sets the pivot point.
     # @param pivot - tuple of (int * int)
     def set_pivot(self, pivot):
         # type checking
-        assert isinstance(pivot, tuple) and len(pivot) == 2 and \
-            isinstance(pivot[0], int) and isinstance(pivot[1], int), \
-            "Make sure the pivot is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(pivot, tuple) and len(pivot) == 2 and \
+                isinstance(pivot[0], int) and isinstance(pivot[1], int), \
+                "Make sure the pivot is a tuple of (int * int)."
         self._pivot = pivot
 
 
-# Aids in rotation.
+# Returns whether a point is inside the oval drawn in a box, given as a flat
+# list of its corners.
+def _oval_contains(box, point):
+    radiusX = (box[2] - box[0]) / 2
+    radiusY = (box[3] - box[1]) / 2
+    if radiusX <= 0 or radiusY <= 0:
+        return False
+    dx = (point[0] - box[0] - radiusX) / radiusX
+    dy = (point[1] - box[1] - radiusY) / radiusY
+    return dx * dx + dy * dy <= 1
+
+
+# Returns whether a point is inside a polygon, given as a flat list of its
+# points. A line is drawn from the point to the right, and the point is inside
+# if the line crosses the polygon's edges an odd number of times.
+def _polygon_contains(coords, point):
+    x, y = point
+    inside = False
+    x1 = coords[-2]
+    y1 = coords[-1]
+    for i in range(0, len(coords), 2):
+        x2 = coords[i]
+        y2 = coords[i + 1]
+        if (y1 > y) != (y2 > y) and \
+           x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+            inside = not inside
+        x1 = x2
+        y1 = y2
+    return inside
+
+
+# Returns whether two collision shapes, as given by _shape, overlap.
+def _overlap(first, second):
+    if first[0] == "oval":
+        return _oval_overlap(first[1], second)
+    if second[0] == "oval":
+        return _oval_overlap(second[1], first)
+    if first[0] == "circle":
+        if second[0] == "circle":
+            x1, y1, r1 = first[1]
+            x2, y2, r2 = second[1]
+            return (x1 - x2) ** 2 + (y1 - y2) ** 2 <= (r1 + r2) ** 2
+        return _circle_polygon_overlap(first[1], second[1])
+    if second[0] == "circle":
+        return _circle_polygon_overlap(second[1], first[1])
+    if first[0] == "convex" and second[0] == "convex":
+        return _convex_overlap(first[1], second[1])
+    return _polygon_overlap(first[1], second[1])
+
+
+# Returns the points of the polygon an oval, given as
+# (x, y, radiusX, radiusY, angle), is checked as, as a flat list of x and y
+# values.
+def _oval_hull_points(oval):
+    x, y, radiusX, radiusY, angle = oval
+    radians = (math.pi / 180) * angle
+    cos = math.cos(radians)
+    sin = math.sin(radians)
+    hull = _oval_hull(radiusX, radiusY)
+    points = []
+    for i in range(0, len(hull), 2):
+        # turns the point the same way _rotate_helper does
+        x1 = hull[i]
+        y1 = hull[i + 1]
+        points.append(x + x1 * cos + y1 * sin)
+        points.append(y + y1 * cos - x1 * sin)
+    return points
+
+
+# Returns whether an oval, given as (x, y, radiusX, radiusY, angle), overlaps
+# another collision shape. Moving, turning and stretching both of them so the
+# oval becomes a circle of radius 1 around (0, 0) doesn't change whether they
+# overlap, and a polygon is still a polygon afterwards, so the two can then be
+# checked like a circle and a polygon. Circles and other ovals don't stay
+# circles and ovals, so they're checked as polygons using _oval_hull_points.
+def _oval_overlap(oval, other):
+    if other[0] != "polygon" and other[0] != "convex":
+        # ovals and circles which are far enough apart or close enough
+        # together can be told apart by their centers alone
+        x1, y1, radius1 = oval[0], oval[1], oval[2:4]
+        x2, y2, radius2 = other[1][0], other[1][1], other[1][2:4]
+        distance = (x1 - x2) ** 2 + (y1 - y2) ** 2
+        if distance > (max(radius1) + max(radius2)) ** 2:
+            return False
+        if distance <= (min(radius1) + min(radius2)) ** 2:
+            return True
+    if other[0] == "circle":
+        return _circle_polygon_overlap(other[1], _oval_hull_points(oval))
+    if other[0] == "oval":
+        coords = _oval_hull_points(other[1])
+    else:
+        coords = other[1]
+    x, y, radiusX, radiusY, angle = oval
+    radians = (math.pi / 180) * angle
+    cos = math.cos(radians)
+    sin = math.sin(radians)
+    local = []
+    for i in range(0, len(coords), 2):
+        # undoes the turn, then the stretch
+        dx = coords[i] - x
+        dy = coords[i + 1] - y
+        local.append((dx * cos - dy * sin) / radiusX)
+        local.append((dx * sin + dy * cos) / radiusY)
+    return _circle_polygon_overlap((0, 0, 1), local)
+
+
+# Returns whether a circle, given as (x, y, radius), overlaps a polygon. They
+# overlap if the circle's center is inside the polygon or close enough to one
+# of its edges.
+def _circle_polygon_overlap(circle, coords):
+    x, y, radius = circle
+    if _polygon_contains(coords, (x, y)):
+        return True
+    x1 = coords[-2]
+    y1 = coords[-1]
+    for i in range(0, len(coords), 2):
+        x2 = coords[i]
+        y2 = coords[i + 1]
+        # finds the point on the edge closest to the center
+        dx = x2 - x1
+        dy = y2 - y1
+        length = dx * dx + dy * dy
+        t = 0 if length == 0 else ((x - x1) * dx + (y - y1) * dy) / length
+        t = max(0, min(1, t))
+        closestX = x1 + t * dx - x
+        closestY = y1 + t * dy - y
+        if closestX * closestX + closestY * closestY <= radius * radius:
+            return True
+        x1 = x2
+        y1 = y2
+    return False
+
+
+# Returns whether a polygon, given as a flat list of points, is convex, which
+# it is if every corner turns the same way.
+def _convex(coords):
+    count = len(coords) // 2
+    if count < 4:
+        return True
+    sign = 0
+    for i in range(count):
+        x1, y1 = coords[2 * i - 4], coords[2 * i - 3]
+        x2, y2 = coords[2 * i - 2], coords[2 * i - 1]
+        x3, y3 = coords[2 * i], coords[2 * i + 1]
+        cross = (x2 - x1) * (y3 - y2) - (y2 - y1) * (x3 - x2)
+        if cross > 0:
+            if sign < 0:
+                return False
+            sign = 1
+        elif cross < 0:
+            if sign > 0:
+                return False
+            sign = -1
+    return True
+
+
+# Returns whether two convex polygons overlap, using the separating axis
+# theorem: they don't overlap if and only if there is an edge of one of them
+# which, as a line, has each polygon entirely on either side of it.
+def _convex_overlap(first, second):
+    # with numpy every axis is checked at once, which is quicker unless the
+    # polygons only have a few points
+    if numpy is not None and len(first) + len(second) > 32:
+        first = numpy.array(first).reshape(-1, 2)
+        second = numpy.array(second).reshape(-1, 2)
+        edges = numpy.concatenate((numpy.roll(first, -1, 0) - first,
+                                   numpy.roll(second, -1, 0) - second))
+        axes = numpy.stack((-edges[:, 1], edges[:, 0]))
+        values1 = first @ axes
+        values2 = second @ axes
+        separated = (values1.max(0) < values2.min(0)) | \
+            (values2.max(0) < values1.min(0))
+        return not separated.any()
+    points1 = list(zip(first[0::2], first[1::2]))
+    points2 = list(zip(second[0::2], second[1::2]))
+    for points in (points1, points2):
+        x1, y1 = points[-1]
+        for x2, y2 in points:
+            # the axis is at a right angle to the edge
+            axisX = y1 - y2
+            axisY = x2 - x1
+            x1 = x2
+            y1 = y2
+            if axisX == 0 and axisY == 0:
+                continue
+            # measures each polygon's points along the axis
+            values1 = [x * axisX + y * axisY for x, y in points1]
+            values2 = [x * axisX + y * axisY for x, y in points2]
+            if max(values1) < min(values2) or max(values2) < min(values1):
+                return False
+    return True
+
+
+# Returns whether two polygons, which don't have to be convex, overlap. They
+# overlap if any of their edges cross, or if one is entirely inside the other.
+def _polygon_overlap(first, second):
+    if _polygon_contains(first, (second[0], second[1])) or \
+       _polygon_contains(second, (first[0], first[1])):
+        return True
+    ax1 = first[-2]
+    ay1 = first[-1]
+    for i in range(0, len(first), 2):
+        ax2 = first[i]
+        ay2 = first[i + 1]
+        bx1 = second[-2]
+        by1 = second[-1]
+        for j in range(0, len(second), 2):
+            bx2 = second[j]
+            by2 = second[j + 1]
+            if _segments_cross(ax1, ay1, ax2, ay2, bx1, by1, bx2, by2):
+                return True
+            bx1 = bx2
+            by1 = by2
+        ax1 = ax2
+        ay1 = ay2
+    return False
+
+
+# Returns whether the line segments (x1, y1)-(x2, y2) and (x3, y3)-(x4, y4)
+# cross or touch.
+def _segments_cross(x1, y1, x2, y2, x3, y3, x4, y4):
+    d1 = (x4 - x3) * (y1 - y3) - (y4 - y3) * (x1 - x3)
+    d2 = (x4 - x3) * (y2 - y3) - (y4 - y3) * (x2 - x3)
+    d3 = (x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)
+    d4 = (x2 - x1) * (y4 - y1) - (y2 - y1) * (x4 - x1)
+    if ((d1 > 0 and d2 < 0) or (d1 < 0 and d2 > 0)) and \
+       ((d3 > 0 and d4 < 0) or (d3 < 0 and d4 > 0)):
+        return True
+    # segments which only touch, or lie along the same line
+    return (d1 == 0 and _on_segment(x3, y3, x4, y4, x1, y1)) or \
+        (d2 == 0 and _on_segment(x3, y3, x4, y4, x2, y2)) or \
+        (d3 == 0 and _on_segment(x1, y1, x2, y2, x3, y3)) or \
+        (d4 == 0 and _on_segment(x1, y1, x2, y2, x4, y4))
+
+
+# Returns whether (x, y), which is on the line through (x1, y1) and (x2, y2),
+# is between them.
+def _on_segment(x1, y1, x2, y2, x, y):
+    return min(x1, x2) <= x <= max(x1, x2) and min(y1, y2) <= y <= max(y1, y2)
+
+
+# Moves a point so that it's factor times as far from center as it was.
+def _scale_helper(point, factor, center):
+    return (center[0] + (point[0] - center[0]) * factor,
+            center[1] + (point[1] - center[1]) * factor)
+
+
+# Aids in rotation. The point isn't rounded, so turning something many times
+# doesn't make it drift.
 def _rotate_helper(point, angle, pivot):
     # type checking
     # print("DEBUG: point = " + str(point) + ", angle = " + str(angle) + ", pivot = " + str(pivot))
-    assert isinstance(point, tuple) and len(point) == 2 and \
-        isinstance(angle, float) and isinstance(pivot, tuple) and \
-        len(pivot) == 2 and isinstance(point[0], int) and \
-        isinstance(point[1], int) and isinstance(pivot[0], int) and \
-        isinstance(pivot[1], int), \
-        "Make sure point is a tuple of (int * int), angle is a float, " + \
-        "and pivot is a tuple of (int * int)."
+    if _validation:
+        assert isinstance(point, tuple) and len(point) == 2 and \
+            isinstance(angle, float) and isinstance(pivot, tuple) and \
+            len(pivot) == 2 and \
+            isinstance(point[0], (int, float)) and \
+            isinstance(point[1], (int, float)) and \
+            isinstance(pivot[0], (int, float)) and \
+            isinstance(pivot[1], (int, float)), \
+            "Make sure point is a tuple of (int * int), angle is a float, " + \
+            "and pivot is a tuple of (int * int)."
     point = (point[0] - pivot[0], point[1] - pivot[1])
-    newX = round(point[0] * math.cos(angle) + point[1] * math.sin(angle))
-    newY = round(point[1] * math.cos(angle) - point[0] * math.sin(angle))
+    newX = point[0] * math.cos(angle) + point[1] * math.sin(angle)
+    newY = point[1] * math.cos(angle) - point[0] * math.sin(angle)
     return (newX + pivot[0], newY + pivot[1])
 
 
+# The points of a Fillable are kept in one flat buffer of floats,
+# [x0, y0, x1, y1, ...]. Shapes with lots of points keep them in a numpy array
+# if numpy is installed, and other shapes keep them in a list, since numpy
+# takes longer than plain Python to get going on just a few points. The points
+# never change after they're given; instead each object has a transform
+# (a, b, c, d, e, f), which puts a point (x, y) at
+# (a * x + c * y + e, b * x + d * y + f) on the screen. Moving, turning and
+# scaling only change the transform, so points are never rounded and turning a
+# shape many times doesn't slowly bend it out of shape.
+
+# The transform which leaves every point where it is.
+_IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+
+# Returns a new buffer holding a list of points.
+def _vertex_buffer(points):
+    flat = [float(value) for point in points for value in point]
+    if numpy is not None and len(flat) > _NUMPY_MINIMUM:
+        return numpy.array(flat, dtype=float)
+    return flat
+
+
+# how many values a buffer has to have before it's kept in a numpy array
+_NUMPY_MINIMUM = 32
+
+
+# Returns the points in a buffer moved by a transform, as a flat list. Boxes
+# share their buffers, which are tuples.
+def _vertex_transform(vertices, matrix):
+    a, b, c, d, e, f = matrix
+    if not isinstance(vertices, (list, tuple)):
+        x = vertices[0::2]
+        y = vertices[1::2]
+        screen = numpy.empty_like(vertices)
+        screen[0::2] = a * x + c * y + e
+        screen[1::2] = b * x + d * y + f
+        return screen.tolist()
+    screen = []
+    for i in range(0, len(vertices), 2):
+        x = vertices[i]
+        y = vertices[i + 1]
+        screen.append(a * x + c * y + e)
+        screen.append(b * x + d * y + f)
+    return screen
+
+
+# Returns where a transform puts a point.
+def _transform_point(matrix, point):
+    a, b, c, d, e, f = matrix
+    return (a * point[0] + c * point[1] + e, b * point[0] + d * point[1] + f)
+
+
+# Returns the transform which does inner and then outer.
+def _matrix_multiply(outer, inner):
+    a1, b1, c1, d1, e1, f1 = outer
+    a2, b2, c2, d2, e2, f2 = inner
+    return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+            a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+            a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+
+# Returns the transform which turns points by angle radians around pivot, the
+# same way _rotate_helper does.
+def _rotation_matrix(angle, pivot):
+    cos = math.cos(angle)
+    sin = math.sin(angle)
+    return (cos, -sin, sin, cos,
+            pivot[0] - cos * pivot[0] - sin * pivot[1],
+            pivot[1] + sin * pivot[0] - cos * pivot[1])
+
+
+# Returns the transform which moves points so they're factor times as far from
+# center as they were.
+def _scaling_matrix(factor, center):
+    return (factor, 0.0, 0.0, factor,
+            center[0] - factor * center[0],
+            center[1] - factor * center[1])
+
+
 #-------------------------------------------------------------------------------
 #
 #  Image
@@ -831,6 +2921,8 @@ def _rotate_helper(point, angle, pivot):
 
 ## An image, which can be added to a Window object.
 class Image(GraphicalObject):
+    __slots__ = ("_image_loc", "_width", "_height", "_angle", "_img")
+
     ## @param window - Window - the window which the object will be added to
     # @param image_loc - str- The file location for an image, see below for
     # instructions regarding file locations
@@ -850,13 +2942,14 @@ class Image(GraphicalObject):
     def __init__(self, window, image_loc, width=100, height=100,
                  center=(200, 200)):
         # type checking
-        assert isinstance(window, Window) and image_loc is not "" \
-            and isinstance(width, int) and isinstance(height, int) \
-            and isinstance(center, tuple) and len(center) == 2 and \
-            isinstance(center[0], int) and isinstance(center[1], int), \
-            "Make sure window is a Window, image location is not blank, " + \
-            "width is an int, height is an int, and center is a tuple of " + \
-            "(int * int)."
+        if _validation:
+            assert isinstance(window, Window) and image_loc is not "" \
+                and isinstance(width, int) and isinstance(height, int) \
+                and isinstance(center, tuple) and len(center) == 2 and \
+                isinstance(center[0], int) and isinstance(center[1], int), \
+                "Make sure window is a Window, image location is not " + \
+                "blank, width is an int, height is an int, and center is " + \
+                "a tuple of (int * int)."
         # setting up inheritance
         GraphicalObject.__init__(self)
         # saving variables
@@ -869,41 +2962,57 @@ class Image(GraphicalObject):
         # rotate function
         self._angle = 0
         # generating image based on image location
-        self._img = _image_gen(self._image_loc, self._width, self._height)
-        # creating object as hidden and adding it to window._graphics
-        self._enabled = False
-        self._tag = self._window._canvas.create_image(self._center[0],
-                                                      self._center[1],
-                                                      image=self._img,
-                                                      state=HIDDEN)
-        self._window._graphics.append([self._depth, self._tag, self])
-
-    # Adds a graphical object to the canvas.
-    def _add_to(self):
-        self._tag = self._window._canvas.create_image(self._center[0],
-                                                      self._center[1],
-                                                      image=self._img)
-        self._enabled = True
-
-        self._window._update_tag(self)
+        self._img = _image_gen(self._window, self._image_loc, self._width,
+                               self._height)
+
+    # Creates the image on the canvas and returns its tag.
+    def _create_item(self):
+        self._drawn = self._all_options()
+        return self._window._canvas.create_image(*self._coords(),
+                                                 **self._drawn)
+
+    # Returns the points which are given to the canvas.
+    def _coords(self):
+        return [self._center]
+
+    # Returns the kind of canvas item the object is drawn with.
+    def _kind(self):
+        return "image"
+
+    # Returns the image's bounding box. Turning an image turns the picture
+    # inside its box without making the box any bigger.
+    def _bounds(self):
+        return (self._center[0] - self._width / 2,
+                self._center[1] - self._height / 2,
+                self._center[0] + self._width / 2,
+                self._center[1] + self._height / 2)
+
+    # Returns the style options which are given to the canvas.
+    def _options(self):
+        return {"image": self._img}
+
+    # Returns the picture the image shows as a PIL image.
+    def _picture(self):
+        return _image_picture(self._image_loc, self._width, self._height,
+                              self._angle)
 
     def move(self, dx, dy):
         # type checking
-        assert isinstance(dx, int) and isinstance(dy, int), \
-            "Make sure dx and dy are both ints."
+        if _validation:
+            assert isinstance(dx, int) and isinstance(dy, int), \
+                "Make sure dx and dy are both ints."
         self._center = (self._center[0] + dx, self._center[1] + dy)
-        self._remove_from(self._window)
-        self._img = _image_gen(self._image_loc, self._width, self._height)
+        # the picture itself doesn't change, so only the position is updated
         self._refresh()
 
     def move_to(self, point):
         # type checking
-        assert isinstance(point, tuple) and len(point) == 2 and \
-            isinstance(point[0], int) and isinstance(point[1], int), \
-            "Make sure point is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(point, tuple) and len(point) == 2 and \
+                isinstance(point[0], int) and isinstance(point[1], int), \
+                "Make sure point is a tuple of (int * int)."
         self._center = point
-        self._remove_from(self._window)
-        self._img = _image_gen(self._image_loc, self._width, self._height)
+        # the picture itself doesn't change, so only the position is updated
         self._refresh()
 
     ## Resizes the Image.
@@ -911,51 +3020,45 @@ class Image(GraphicalObject):
     # @param height - int
     def resize(self, width, height):
         # type checking
-        assert isinstance(width, int) and isinstance(height, int), \
-            "Make sure width and height are both ints."
+        if _validation:
+            assert isinstance(width, int) and isinstance(height, int), \
+                "Make sure width and height are both ints."
         self._width = width
         self._height = height
         # depending on if the object is rotated or not, it will either be
-        # re-rotated at whatever self._angle is, or it will be removed and
-        # readded
+        # re-rotated at whatever self._angle is, or it will be regenerated at
+        # the new size
         if self._angle != 0:
             self.rotate(0)
         else:
-            self._remove_from(self._window)
-            self._img = _image_gen(self._image_loc, width, height)
+            self._img = _image_gen(self._window, self._image_loc, width,
+                                   height)
             self._refresh()
 
     ## Rotates an object.
     # @param degrees - int
     def rotate(self, degrees):
         # type checking
-        assert isinstance(degrees, int), \
-            "Make sure degrees is an int."
+        if _validation:
+            assert isinstance(degrees, int), \
+                "Make sure degrees is an int."
         # adds degrees to angle, checks whether angle >= 360 and modulos it if
         # it is
         self._angle += degrees
         if self._angle >= 360:
             self._angle = self._angle % 360
-        # removes object from window, converts it to a format which can be
-        # rotated, resizes it, then rotates it, makes a photo image,
-        # and refreshes it
-        # this needs a special version of _image_gen since we're handling
-        # rotation. _image_gen doesn't handle rotation.
-        self._remove_from(self._window)
-        img_temp = image.open(self._image_loc)
-        img_temp = img_temp.convert('RGBA')
-        img_temp = img_temp.resize((self._width, self._height),
-                                   image.ANTIALIAS)
-        img_temp = img_temp.rotate(self._angle)
-        self._img = itk.PhotoImage(img_temp)
+        # gets the resized and rotated photo image and refreshes it
+        self._img = _image_gen(self._window, self._image_loc, self._width,
+                               self._height, self._angle)
         self._refresh()
 
     ## Scales the image according to the factor.
     # @param factor - float
     def scale(self, factor):
         # type checking
-        assert isinstance(factor, float), \
-            "Make sure the scale factor is a float."
+        if _validation:
+            assert isinstance(factor, float), \
+                "Make sure the scale factor is a float."
         self._width = int(self._width * factor)
         self._height = int(self._height * factor)
         # depending on whether the object is rotated, resize or rotate is run
@@ -971,12 +3074,102 @@ class Image(GraphicalObject):
         return (self._width, self._height)
 
 
-# Creates a resized image and returns an image of type itk.PhotoImage.
-def _image_gen(image_loc, width, height):
-    # opens and resizes an object based on the width and height
-    img_temp = image.open(image_loc)
-    img_temp = img_temp.resize((width, height), image.ANTIALIAS)
-    return itk.PhotoImage(img_temp)
+## Sets how much memory the image cache may use. Images share decoded and
+# resized pictures through this cache, so many Image objects made from the same
+# file only open it once.
+# @param megabytes - int - <b>(default: 64)</b>
+def set_image_cache_size(megabytes):
+    # type checking
+    if _validation:
+        assert isinstance(megabytes, int) and megabytes >= 0, \
+            "Make sure the cache size is an int that is at least 0."
+    _image_cache.set_budget(megabytes * 1024 * 1024)
+
+
+# Creates a resized (and possibly rotated) image and returns an image which
+# can be shown on the window's canvas, which is an itk.PhotoImage unless the
+# window is headless.
+def _image_gen(window, image_loc, width, height, angle=0):
+    picture = _image_picture(image_loc, width, height, angle)
+    key = (image_loc, width, height, angle, window._backend)
+    photo = _image_cache.get(key)
+    if photo is None:
+        photo = window._backend.photo(picture)
+        # tkinter keeps 4 bytes for every pixel of a photo image
+        if photo is not picture:
+            _image_cache.put(key, photo, width * height * 4)
+    return photo
+
+
+# Creates a resized (and possibly rotated) image and returns it as a PIL image.
+def _image_picture(image_loc, width, height, angle=0):
+    key = (image_loc, width, height, angle)
+    picture = _image_cache.get(key)
+    if picture is None:
+        # opens and resizes an object based on the width and height, and
+        # rotates it if it needs to be. rotated images are converted so that
+        # the corners uncovered by rotating are transparent.
+        picture = _image_source(image_loc)
+        if angle != 0:
+            picture = picture.convert('RGBA')
+        picture = picture.resize((width, height), image.LANCZOS)
+        if angle != 0:
+            picture = picture.rotate(angle)
+        _image_cache.put(key, picture,
+                         width * height * len(picture.getbands()))
+    return picture
+
+
+# Returns the decoded image stored in a file.
+def _image_source(image_loc):
+    key = (image_loc,)
+    img = _image_cache.get(key)
+    if img is None:
+        img = image.open(image_loc)
+        img.load()
+        _image_cache.put(key, img,
+                         img.width * img.height * len(img.getbands()))
+    return img
+
+
+# A least recently used cache shared by every Image, holding both decoded
+# source images and resized photo images until they go over a memory budget.
+class _ImageCache:
+    def __init__(self, budget):
+        self._budget = budget
+        self._used = 0
+        # key -> (value, size in bytes), least recently used first
+        self._entries = OrderedDict()
+
+    # Returns the value saved under key, or None if it isn't in the cache.
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    # Saves a value, evicting the least recently used values until the cache
+    # fits in its budget. Values bigger than the whole budget aren't saved.
+    def put(self, key, value, size):
+        if size > self._budget:
+            return
+        self._entries[key] = (value, size)
+        self._used += size
+        self._shrink()
+
+    # Changes the budget, evicting values if the cache no longer fits.
+    def set_budget(self, budget):
+        self._budget = budget
+        self._shrink()
+
+    def _shrink(self):
+        while self._used > self._budget:
+            value, size = self._entries.popitem(last=False)[1]
+            self._used -= size
+
+
+_image_cache = _ImageCache(64 * 1024 * 1024)
 
 
 #-------------------------------------------------------------------------------
@@ -987,6 +3180,8 @@ def _image_gen(image_loc, width, height):
 
 ## Text which can be added to a Window object.
 class Text(GraphicalObject):
+    __slots__ = ("_text", "_size")
+
     ## @param window - Window - the window which the object will be added to
     # @param text - str - The text which is displayed
     # @param size - int - <b>(default: 12)</b> sets the size of the text
@@ -994,79 +3189,89 @@ class Text(GraphicalObject):
     # sets the center of the Image
     def __init__(self, window, text, size=12, center=(200, 200)):
         # type checking
-        assert isinstance(window, Window) and isinstance(size, int) \
-            and isinstance(center, tuple) and len(center) == 2 and \
-            isinstance(center[0], int) and isinstance(center[1], int), \
-            "Make sure the window is a Window, the size is an int, and " + \
-            "the center is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(window, Window) and isinstance(size, int) \
+                and isinstance(center, tuple) and len(center) == 2 and \
+                isinstance(center[0], int) and isinstance(center[1], int), \
+                "Make sure the window is a Window, the size is an int, " + \
+                "and the center is a tuple of (int * int)."
         # for inheritance
         GraphicalObject.__init__(self)
-        # setting variables, creating object and adding it to window._graphics
+        # setting variables
         self._window = window
         self._text = text
         self._center = center
         self._size = size
-        self._enabled = False
-        self._tag = self._window._canvas.create_text(self._center[0],
-                                                     self._center[1],
-                                                     text=str(self._text),
-                                                     font=("Helvetica",
-                                                           self._size),
-                                                     state=HIDDEN)
-        self._window._graphics.append([self._depth, self._tag, self])
-
-    # Adds a graphical object to the canvas.
-    def _add_to(self):
-        self._tag = self._window._canvas.create_text(self._center[0],
-                                                     self._center[1],
-                                                     text=str(self._text),
-                                                     font=("Helvetica",
-                                                           self._size))
-        self._enabled = True
 
-        self._window._update_tag(self)
+    # Creates the text on the canvas and returns its tag.
+    def _create_item(self):
+        self._drawn = self._all_options()
+        return self._window._canvas.create_text(*self._coords(),
+                                                **self._drawn)
+
+    # Returns the points which are given to the canvas.
+    def _coords(self):
+        return [self._center]
+
+    # Returns the kind of canvas item the object is drawn with.
+    def _kind(self):
+        return "text"
+
+    # Returns the text's bounding box. The canvas can't be asked without
+    # drawing the text first, so the size is worked out from the point size,
+    # allowing a little more than an average letter's width for each
+    # character.
+    def _bounds(self):
+        lines = str(self._text).split("\n")
+        # a point is 4/3 of a pixel on most screens
+        height = self._size * 4 / 3
+        width = max(len(line) for line in lines) * height * 0.6
+        height = height * 1.2 * len(lines)
+        return (self._center[0] - width / 2, self._center[1] - height / 2,
+                self._center[0] + width / 2, self._center[1] + height / 2)
+
+    # Returns the style options which are given to the canvas.
+    def _options(self):
+        return {"text": str(self._text),
+                "font": ("Helvetica", self._size)}
 
     def move(self, dx, dy):
         # type checking
-        assert isinstance(dx, int) and isinstance(dy, int), \
-            "Make sure dx and dy are both ints."
+        if _validation:
+            assert isinstance(dx, int) and isinstance(dy, int), \
+                "Make sure dx and dy are both ints."
         self._center = (self._center[0] + dx, self._center[1] + dy)
-        # text is special because it does not need to be recreated after each
-        # modification
-        self._window._canvas.coords(self._tag,
-                                    (self._center[0], self._center[1]))
+        self._refresh()
 
     def move_to(self, point):
-        assert isinstance(point, tuple) and len(point) == 2 and \
-            isinstance(point[0], int) and isinstance(point[1], int), \
-            "Make sure point is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(point, tuple) and len(point) == 2 and \
+                isinstance(point[0], int) and isinstance(point[1], int), \
+                "Make sure point is a tuple of (int * int)."
         self._center = point
-        # text is special because it does not need to be recreated after each
-        # modification
-        self._window._canvas.coords(self._tag,
-                                    self._center[0],
-                                    self._center[1])
+        self._refresh()
 
     ## Sets the point size of the text.
     # @param size - int
     def set_size(self, size):
-        assert isinstance(size, int), \
-            "Make sure size is an int."
+        if _validation:
+            assert isinstance(size, int), \
+                "Make sure size is an int."
         self._size = size
-        # text is special because it does not need to be recreated after each
-        # modification
-        self._window._canvas.itemconfigure(self._tag, font=("Helvetica",
-                                                            self._size))
+        if self._tag is not None:
+            self._window._stale[id(self)] = self
+        self._configure(font=("Helvetica", self._size))
 
     ## Sets the text.
     # @param text - str
     def set_text(self, text):
-        assert isinstance(text, str), \
-            "Make sure text is a string."
+        if _validation:
+            assert isinstance(text, str), \
+                "Make sure text is a string."
         self._text = text
-        # text is special because it does not need to be recreated after each
-        # modification
-        self._window._canvas.itemconfigure(self._tag, text=self._text)
+        if self._tag is not None:
+            self._window._stale[id(self)] = self
+        self._configure(text=self._text)
 
         
 #-------------------------------------------------------------------------------
@@ -1077,45 +3282,33 @@ class Text(GraphicalObject):
 
 ## A Polygon, which can be added to a Window object.
 class Polygon(Fillable):
+    __slots__ = ()
+
     ## @param window - Window - the window which the object will be added to
     # @param points - list of tuples of (int * int) - each tuple corresponds
     # to an x-y point
     def __init__(self, window, points):
         # type checking
-        assert isinstance(window, Window) and isinstance(points, list), \
-            "Make sure window is a Window and points is a list of tuples " + \
-            "of (int * int)."
-        # checking whether each point in the list of points is a tuple of
-        # length 2
-        for point in points:
-            if len(point) is not 2 or type(point[0]) != int or \
-               type(point[1]) != int:
-                raise AssertionError("One of the points in your polygon " +
-                                     "does not have a length of two." +
-                                     "Make sure every tuple in your list " +
-                                     "has a length of two.")
+        if _validation:
+            assert isinstance(window, Window) and isinstance(points, list), \
+                "Make sure window is a Window and points is a list of " + \
+                "tuples of (int * int)."
+            # checking whether each point in the list of points is a tuple of
+            # length 2
+            for point in points:
+                if len(point) is not 2 or type(point[0]) != int or \
+                   type(point[1]) != int:
+                    raise AssertionError("One of the points in your " +
+                                         "polygon does not have a length " +
+                                         "of two.Make sure every tuple in " +
+                                         "your list has a length of two.")
         # establishing inheritance
         Fillable.__init__(self)
-        # setting all variables, creating object, and adding it to
-        # window._graphics
+        # setting all variables
         self._window = window
-        self._points = points
-        self._center = _list_average(self._points)
+        self._center = _list_average(points)
         self._pivot = self._center
-        self._enabled = False
-        self._tag = self._window._canvas.create_polygon(
-            *self._points,
-            width=self.get_border_width(),
-            fill=self.get_fill_color(),
-            outline=self.get_border_color(),
-            state=HIDDEN
-        )
-        self._window._graphics.append([self._depth, self._tag, self])
-
-    # Adds a graphical object to the canvas.
-    def _add_to(self):
-        self._window._canvas.itemconfigure(self._tag, state=NORMAL)
-        self._enabled = True
+        self._set_vertices(points)
 
 
 # Averages each x value and each y value in the list and returns it.
@@ -1140,17 +3333,20 @@ def _list_average(points):
 
 ## A circle, which can be added to a Window object.
 class Circle(Fillable):
+    __slots__ = ("_width", "_height")
+
     ## @param window - Window - the window which the object will be added to
     # @param radius - int - <b>(default: 40)</b> the radius of the circle
     # @param center - tuple of (int * int) - <b>(default: (200, 200))</b>
     # sets the center of the circle
     def __init__(self, window, radius=40, center=(200, 200)):
         # type checking
-        assert isinstance(window, Window) and isinstance(radius, int) \
-            and isinstance(center, tuple) and len(center) == 2 and \
-            isinstance(center[0], int) and isinstance(center[1], int), \
-            "Make sure window is a window, radius is an int, and center " + \
-            "is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(window, Window) and isinstance(radius, int) \
+                and isinstance(center, tuple) and len(center) == 2 and \
+                isinstance(center[0], int) and isinstance(center[1], int), \
+                "Make sure window is a window, radius is an int, and " + \
+                "center is a tuple of (int * int)."
         # setting inheritance
         Fillable.__init__(self)
         # setting variables
@@ -1158,68 +3354,137 @@ class Circle(Fillable):
         self._width = radius
         self._height = radius
         self._center = center
-        # these are necessary for _circle_gen
-        self._top_left = (self._center[0] - self._width,
-                          self._center[1] - self._height)
-        self._bottom_right = (self._center[0] + self._width,
-                              self._center[1] + self._height)
-
-        # creating the circle, adding it to the window and then adding it to
-        # window._graphics
-        self._points = []
-        self._circle_gen()
-        self._enabled = False
-        self._tag = self._window._canvas.create_polygon(
-            *self._points,
-            width=self.get_border_width(),
-            fill=self.get_fill_color(),
-            outline=self.get_border_color(),
-            state=HIDDEN
-        )
-        self._window._graphics.append([self._depth, self._tag, self])
+        self._pivot = self._center
 
-    # Adds a graphical object to the canvas.
-    def _add_to(self):
-        self._window._canvas.itemconfigure(self._tag, state=NORMAL)
-        self._enabled = True
+    # Returns the kind of canvas item the object is drawn with. Circles are
+    # always drawn as canvas ovals, since turning a circle doesn't change its
+    # shape.
+    def _kind(self):
+        return "oval"
+
+    # Returns the corners of the box the circle is drawn in.
+    def _coords(self):
+        return _oval_box(self._center, self._width, self._height)
+
+    # The points of the circle's outline as a list of tuples of (int * int),
+    # although it's drawn from the corners of its box.
+    @property
+    def _points(self):
+        coords = _oval_points(self._center,
+                              _oval_outline(self._width, self._width, 0))
+        return [(round(coords[i]), round(coords[i + 1]))
+                for i in range(0, len(coords), 2)]
+
+    # Returns the shape used to check for collisions.
+    def _shape(self):
+        return ("circle", (self._center[0], self._center[1], self._width))
+
+    # Circles are drawn from their center, so there are no points to shift.
+    def _translate(self, dx, dy):
+        pass
 
-    # Generates a circle.
-    def _circle_gen(self):
-        # generates the x axis and y axis of the object
-        xAxis = round(self._bottom_right[0] - self._top_left[0]) / 2
-        yAxis = round(self._bottom_right[1] - self._top_left[1]) / 2
-
-        # 200 can be anything but I thought it was a good mix between precise
-        # and efficient
-        for i in range(200):
-            # generates angle, calculates x and y using some trig i don't know.
-            # this is probably the only time i'm going to say this, but if you
-            # want to understand how this works, email pmagnus@hamilton.edu
-            theta = (math.pi * 2) * float(i) / 200
-            x1 = xAxis * math.cos(theta)
-            y1 = yAxis * math.sin(theta)
-            x = round((x1 * math.cos(0)) + (y1 * math.sin(0)))
-            y = round((y1 * math.cos(0)) - (x1 * math.sin(0)))
-            self._points.append((x + self._center[0], y + self._center[1]))
+    ## Rotates the circle around its pivot.
+    # @param degrees - int
+    def rotate(self, degrees):
+        # type checking
+        if _validation:
+            assert isinstance(degrees, int), \
+                "Make sure degrees is an int."
+        # only the center needs to move, since the circle looks the same
+        # however it's turned
+        radians = (math.pi / 180) * degrees
+        self._center = _rotate_helper(self._center, radians, self._pivot)
+        self._refresh()
+
+    ## Scales the circle up or down depending on the factor.
+    # @param factor - float
+    def scale(self, factor):
+        # type checking
+        if _validation:
+            assert isinstance(factor, float), \
+                "Make sure the scale factor is a float."
+        self._width = int(self._width * factor)
+        self._height = self._width
+        self._pivot = _scale_helper(self._pivot, factor, self._center)
+        self._refresh()
 
     ## Sets the radius of the Circle.
     # @param radius - int
     def set_radius(self, radius):
         # type checking
-        assert isinstance(radius, int), \
-            "Make sure radius is an int."
+        if _validation:
+            assert isinstance(radius, int), \
+                "Make sure radius is an int."
         self._width = radius
         self._height = radius
-        self._top_left = (self._center[0] - self._width,
-                          self._center[1] - self._height)
-        self._bottom_right = (self._center[0] + self._width,
-                              self._center[1] + self._height)
         # redraws circle
-        self._points = []
-        self._circle_gen()
         self._refresh()
 
-        
+
+# Returns the corners of the box an oval with the given center and radii is
+# drawn in.
+def _oval_box(center, radiusX, radiusY):
+    return [center[0] - radiusX, center[1] - radiusY,
+            center[0] + radiusX, center[1] + radiusY]
+
+
+# Returns the points of a turned oval around center, given the points of its
+# outline around (0, 0).
+def _oval_points(center, outline):
+    x, y = center
+    points = list(outline)
+    points[0::2] = [value + x for value in outline[0::2]]
+    points[1::2] = [value + y for value in outline[1::2]]
+    return points
+
+
+# Works out count points evenly spaced around an oval centered on (0, 0) and
+# turned by angle degrees, as a flat list of x and y values.
+def _oval_ring(radiusX, radiusY, angle, count):
+    radians = (math.pi / 180) * angle
+    cos = math.cos(radians)
+    sin = math.sin(radians)
+    ring = []
+    for i in range(count):
+        # finds the point on the unturned oval, then turns it the same way
+        # _rotate_helper does
+        theta = (math.pi * 2) * i / count
+        x1 = radiusX * math.cos(theta)
+        y1 = radiusY * math.sin(theta)
+        ring.append(x1 * cos + y1 * sin)
+        ring.append(y1 * cos - x1 * sin)
+    return ring
+
+
+# Works out the points of an oval around (0, 0) turned by angle degrees, as a
+# flat tuple of x and y values. Ovals
+# with the same size and angle share their points, so they're only worked out
+# once.
+@lru_cache(maxsize=256)
+def _oval_outline(radiusX, radiusY, angle):
+    # big ovals need more points than small ones to look smooth, so there is
+    # a point every few pixels around the edge, with at least 12 and at most
+    # 200 of them
+    count = int(2 * math.pi * max(radiusX, radiusY) / 4)
+    count = max(12, min(200, count))
+    return tuple(round(value)
+                 for value in _oval_ring(radiusX, radiusY, angle, count))
+
+
+# Works out the points of the polygon an unturned oval around (0, 0) is
+# checked as when it's checked for collisions against a circle or another
+# oval, as a flat tuple of x and y values. Checking takes longer the more
+# points there are, so this has _OVAL_HULL_POINTS points however big the
+# oval is, which keeps it within 2% of the oval's radii.
+@lru_cache(maxsize=256)
+def _oval_hull(radiusX, radiusY):
+    return tuple(_oval_ring(radiusX, radiusY, 0, _OVAL_HULL_POINTS))
+
+
+# how many points the polygon an oval is checked as has
+_OVAL_HULL_POINTS = 16
+
+
 #-------------------------------------------------------------------------------
 #
 #  Oval
@@ -1228,6 +3493,9 @@ class Circle(Fillable):
 
 ## An oval, which can be added to a Window object.
 class Oval(Fillable):
+    __slots__ = ("_width", "_height", "_angle", "_outline_key",
+                 "_outline_shape", "_outline_center", "_outline_points")
+
     ## @param window - Window - the window which the object will be added to
     # @param radiusX - int - <b>(default: 40)</b> the radius in the x-direction
     # @param radiusY - int - <b>(default: 60)</b> the radius in the y-direction
@@ -1235,12 +3503,13 @@ class Oval(Fillable):
     # the center of the oval
     def __init__(self, window, radiusX=40, radiusY=60, center=(200, 200)):
         # type checking
-        assert isinstance(window, Window) and isinstance(radiusX, int) \
-            and isinstance(radiusY, int) and isinstance(center, tuple) \
-            and len(center) == 2 and isinstance(center[0], int) and \
-            isinstance(center[1], int), \
-            "Make sure window is a window, radiusX and radiusY are both " + \
-            "ints, and center is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(window, Window) and isinstance(radiusX, int) \
+                and isinstance(radiusY, int) and isinstance(center, tuple) \
+                and len(center) == 2 and isinstance(center[0], int) and \
+                isinstance(center[1], int), \
+                "Make sure window is a window, radiusX and radiusY are " + \
+                "both ints, and center is a tuple of (int * int)."
         # setting inheritance
         Fillable.__init__(self)
         # setting variables
@@ -1248,64 +3517,111 @@ class Oval(Fillable):
         self._width = radiusX
         self._height = radiusY
         self._center = center
-        # this is necessary for _circle_gen
-        self._top_left = (self._center[0] - self._width,
-                          self._center[1] - self._height)
-        self._bottom_right = (self._center[0] + self._width,
-                              self._center[1] + self._height)
-        # creating points, then adding it to canvas and window._graphics
-        self._points = []
-        self._circle_gen()
-        self._enabled = False
-        self._tag = self._window._canvas.create_polygon(
-            *self._points,
-            width=self.get_border_width(),
-            fill=self.get_fill_color(),
-            outline=self.get_border_color(),
-            state=HIDDEN
-        )
-        self._window._graphics.append([self._depth, self._tag, self])
+        self._pivot = self._center
+        # how far the oval has been turned, in degrees
+        self._angle = 0
+        # see _outline
+        self._outline_key = None
+
+    # Returns the kind of canvas item the object is drawn with. Ovals which
+    # are straight up and down or side to side are drawn as canvas ovals, and
+    # turned ones are drawn as polygons.
+    def _kind(self):
+        if self._angle % 90 == 0:
+            return "oval"
+        return "polygon"
+
+    # Returns the points which are given to the canvas, which are the corners
+    # of its box if it's drawn as a canvas oval.
+    def _coords(self):
+        if self._angle % 180 == 0:
+            return _oval_box(self._center, self._width, self._height)
+        if self._angle % 90 == 0:
+            return _oval_box(self._center, self._height, self._width)
+        return self._outline()
+
+    # The points of the oval's outline as a list of tuples of (int * int),
+    # whether it's drawn from them or from the corners of its box.
+    @property
+    def _points(self):
+        coords = self._outline()
+        return [(round(coords[i]), round(coords[i + 1]))
+                for i in range(0, len(coords), 2)]
+
+    # Returns the shape used to check for collisions, which is the oval
+    # itself, or a circle if its radii are the same. An oval which has been
+    # scaled down to no height or width is checked as its outline, which is a
+    # line.
+    def _shape(self):
+        if self._width == self._height:
+            return ("circle", (self._center[0], self._center[1], self._width))
+        if self._width == 0 or self._height == 0:
+            return ("convex", self._outline())
+        return ("oval", (self._center[0], self._center[1], self._width,
+                         self._height, self._angle))
+
+    # Ovals are drawn from their center, so there are no points to shift.
+    def _translate(self, dx, dy):
+        pass
 
-    # Adds a graphical object to the canvas.
-    def _add_to(self):
-        self._window._canvas.itemconfigure(self._tag, state=NORMAL)
-        self._enabled = True
+    # Returns the points of the oval's outline. They're kept until the oval
+    # changes, so drawing it and checking it for collisions share them, and
+    # the shape of the outline is kept until the oval is turned or resized,
+    # so moving the oval only has to shift it.
+    def _outline(self):
+        key = (self._width, self._height, self._angle)
+        if self._outline_key != key:
+            self._outline_key = key
+            self._outline_shape = _oval_outline(self._width, self._height,
+                                                self._angle)
+            self._outline_center = None
+        if self._outline_center != self._center:
+            self._outline_center = self._center
+            self._outline_points = _oval_points(self._center,
+                                                self._outline_shape)
+        return self._outline_points
+
+    ## Rotates the oval around its pivot.
+    # @param degrees - int
+    def rotate(self, degrees):
+        # type checking
+        if _validation:
+            assert isinstance(degrees, int), \
+                "Make sure degrees is an int."
+        # turns the oval and moves its center around the pivot
+        kind = self._kind()
+        radians = (math.pi / 180) * degrees
+        self._center = _rotate_helper(self._center, radians, self._pivot)
+        self._angle = (self._angle + degrees) % 360
+        # the canvas item has to be swapped if the oval stopped or started
+        # being straight
+        if self._kind() != kind:
+            self._replace_item()
+        else:
+            self._refresh()
 
-    # Generates a circle.
-    def _circle_gen(self):
-        # generates the x axis and y axis of the object
-        xAxis = round(self._bottom_right[0] - self._top_left[0]) / 2
-        yAxis = round(self._bottom_right[1] - self._top_left[1]) / 2
-
-        # 200 can be anything but I thought it was a good mix between precise
-        # and efficient
-        for i in range(200):
-            # generates angle, calculates x and y using some trig i don't know.
-            # this is probably the only time i'm going to say this, but if you
-            # want to understand how this works, email pmagnus@hamilton.edu
-            theta = (math.pi * 2) * float(i) / 200
-            x1 = xAxis * math.cos(theta)
-            y1 = yAxis * math.sin(theta)
-            x = round((x1 * math.cos(0)) + (y1 * math.sin(0)))
-            y = round((y1 * math.cos(0)) - (x1 * math.sin(0)))
-            self._points.append((x + self._center[0], y + self._center[1]))
+    ## Scales the oval up or down depending on the factor.
+    # @param factor - float
+    def scale(self, factor):
+        # type checking
+        if _validation:
+            assert isinstance(factor, float), \
+                "Make sure the scale factor is a float."
+        self._width = int(self._width * factor)
+        self._height = int(self._height * factor)
+        self._pivot = _scale_helper(self._pivot, factor, self._center)
+        self._refresh()
 
     ## Sets the horizontal and vertical radii of the oval.
     # @param radiusX - int
     # @param radiusY - int
     def set_radii(self, radiusX, radiusY):
         # type checking
-        assert isinstance(radiusX, int) and isinstance(radiusY, int), \
-            "Make sure radiusX and radiusY are both ints."
+        if _validation:
+            assert isinstance(radiusX, int) and isinstance(radiusY, int), \
+                "Make sure radiusX and radiusY are both ints."
         self._width = radiusX
         self._height = radiusY
-        self._top_left = (self._center[0] - self._width,
-                          self._center[1] - self._height)
-        self._bottom_right = (self._center[0] + self._width,
-                              self._center[1] + self._height)
-
-        self._points = []
-        self._circle_gen()
         self._refresh()
 
 
@@ -1317,17 +3633,21 @@ class Oval(Fillable):
         
 ## A square, which can be added to a Window object.
 class Square(Fillable):
+    __slots__ = ("_width", "_height")
+
     ## @param window - Window - the window which the object will be added to
     # @param side_length - int - <b>(default: 40)</b> the side length
     # @param center - tuple of (int * int) - <b>(default: (200, 200))</b>
     # the center of the square
     def __init__(self, window, side_length=80, center=(200, 200)):
         # type checking
-        assert isinstance(window, Window) and isinstance(side_length, int) \
-            and isinstance(center, tuple) and len(center) == 2 and \
-            isinstance(center[0], int) and isinstance(center[1], int), \
-            "Make sure window is a window, the side length is an int, " + \
-            "and the center is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(window, Window) and \
+                isinstance(side_length, int) and \
+                isinstance(center, tuple) and len(center) == 2 and \
+                isinstance(center[0], int) and isinstance(center[1], int), \
+                "Make sure window is a window, the side length is an int, " + \
+                "and the center is a tuple of (int * int)."
         # setting inheritance
         Fillable.__init__(self)
         # setting variables
@@ -1335,49 +3655,33 @@ class Square(Fillable):
         self._width = side_length
         self._height = side_length
         self._center = center
-        # creating points and then adding object to the canvas and
-        # window._graphics
-        self._points = [(self._center[0] - self._width // 2,
-                         self._center[1] - self._height // 2),
-                        (self._center[0] + self._width // 2,
-                         self._center[1] - self._height // 2),
-                        (self._center[0] + self._width // 2,
-                         self._center[1] + self._height // 2),
-                        (self._center[0] - self._width // 2,
-                         self._center[1] + self._height // 2)]
-        self._enabled = False
-        self._tag = self._window._canvas.create_polygon(
-            *self._points,
-            width=self.get_border_width(),
-            fill=self.get_fill_color(),
-            outline=self.get_border_color(),
-            state=HIDDEN
-        )
-        self._window._graphics.append([self._depth, self._tag, self])
-
-    # Adds a graphical object to the canvas.
-    def _add_to(self):
-        self._window._canvas.itemconfigure(self._tag, state=NORMAL)
-        self._enabled = True
+        self._pivot = self._center
+        # creating points
+        self._set_box()
 
     ## Sets the side length of the Square.
     # @param side_length - int
     def set_side_length(self, side_length):
         # type checking
-        assert isinstance(side_length, int)
+        if _validation:
+            assert isinstance(side_length, int)
         self._width = side_length
         self._height = side_length
         # re-rendering each point
-        self._points = [(self._center[0] - self._width // 2,
-                         self._center[1] - self._height // 2),
-                        (self._center[0] + self._width // 2,
-                         self._center[1] - self._height // 2),
-                        (self._center[0] + self._width // 2,
-                         self._center[1] + self._height // 2),
-                        (self._center[0] - self._width // 2,
-                         self._center[1] + self._height // 2)]
+        self._set_box()
         self._refresh()
 
+
+# Returns the corners of a box around (0, 0) with the given width and height,
+# clockwise from the top left, as a flat tuple of x and y values.
+@lru_cache(maxsize=256)
+def _box_vertices(width, height):
+    return (float(-(width // 2)), float(-(height // 2)),
+            float(width // 2), float(-(height // 2)),
+            float(width // 2), float(height // 2),
+            float(-(width // 2)), float(height // 2))
+
+
 #-------------------------------------------------------------------------------
 #
 #  Rectangle
@@ -1386,6 +3690,8 @@ class Square(Fillable):
         
 ## A rectangle, which can be added to a Window object.
 class Rectangle(Fillable):
+    __slots__ = ("_width", "_height")
+
     ## @param window - Window - the window which the object will be added to
     # @param width - int - <b>(default: 80)</b> the width of the rectangle
     # @param height - int - <b>(default: 120)</b> the height of the rectangle
@@ -1393,12 +3699,13 @@ class Rectangle(Fillable):
     # the center of the rectangle
     def __init__(self, window, width=80, height=120, center=(200, 200)):
         # type checking
-        assert isinstance(window, Window) and isinstance(width, int) \
-            and isinstance(height, int) and isinstance(center, tuple) \
-            and len(center) == 2 and isinstance(center[0], int) and \
-            isinstance(center[1], int), \
-            "Make sure window is a Window, width and height are both ints, " + \
-            "and center is a tuple of (int * int)."
+        if _validation:
+            assert isinstance(window, Window) and isinstance(width, int) \
+                and isinstance(height, int) and isinstance(center, tuple) \
+                and len(center) == 2 and isinstance(center[0], int) and \
+                isinstance(center[1], int), \
+                "Make sure window is a Window, width and height are both " + \
+                "ints, and center is a tuple of (int * int)."
         # enabling inheritance
         Fillable.__init__(self)
         # setting variables
@@ -1406,51 +3713,411 @@ class Rectangle(Fillable):
         self._width = width
         self._height = height
         self._center = center
+        self._pivot = self._center
         # rendering each corner point
-        self._points = [(self._center[0] - self._width // 2,
-                         self._center[1] - self._height // 2),
-                        (self._center[0] + self._width // 2,
-                         self._center[1] - self._height // 2),
-                        (self._center[0] + self._width // 2,
-                         self._center[1] + self._height // 2),
-                        (self._center[0] - self._width // 2,
-                         self._center[1] + self._height // 2)]
-        # adding object to canvas and then to window._graphics
-        self._enabled = False
-        self._tag = self._window._canvas.create_polygon(
-            *self._points,
-            width=self.get_border_width(),
-            fill=self.get_fill_color(),
-            outline=self.get_border_color(),
-            state=HIDDEN
-        )
-        self._window._graphics.append([self._depth, self._tag, self])
-
-    # Adds a graphical object to the canvas.
-    def _add_to(self):
-        self._window._canvas.itemconfigure(self._tag, state=NORMAL)
-        self._enabled = True
+        self._set_box()
 
     ## Sets the width and height of the Rectangle.
     # @param width - int
     # @param height - int
     def set_side_lengths(self, width, height):
         # type checking
-        assert isinstance(width, int) and isinstance(height, int), \
-            "Make sure width and height are both ints."
+        if _validation:
+            assert isinstance(width, int) and isinstance(height, int), \
+                "Make sure width and height are both ints."
         self._width = width
         self._height = height
         # re-rendering each corner point and refreshing
-        self._points = [(self._center[0] - self._width / 2,
-                         self._center[1] - self._height / 2),
-                        (self._center[0] + self._width / 2,
-                         self._center[1] - self._height / 2),
-                        (self._center[0] + self._width / 2,
-                         self._center[1] + self._height / 2),
-                        (self._center[0] - self._width / 2,
-                         self._center[1] + self._height / 2)]
+        self._set_box()
         self._refresh()
 
+#-------------------------------------------------------------------------------
+#
+#  ParticleSystem
+#
+#-------------------------------------------------------------------------------
+
+## A group of small particles, such as sparks, smoke or rain, which can be
+# added to a Window object. Particles fly in a straight line (or fall, if there
+# is gravity) until they have lived for their lifetime, fading out as they
+# age. However many particles there are, they are all drawn together as one
+# picture, so a particle system costs about as much to draw as a single Image
+# and is drawn in front of or behind other objects according to its depth.
+# The picture only covers the part of the window the particles are in.
+#
+# Particles only move when update is called, which is usually done by a Timer:
+# @code
+# def main(window):
+#     sparks = ParticleSystem(window, gravity=(0, 200))
+#     window.add(sparks)
+#     sparks.burst(300, (200, 200), 150, "orange", 2000)
+#     # a Timer gives update how many milliseconds have passed
+#     Timer(window, 16, sparks.update).start()
+# @endcode
+#
+# Default values:
+# - particle size = 3
+# - gravity = (0, 0)
+# - center = (200, 200)
+class ParticleSystem(GraphicalObject):
+    __slots__ = ("_size", "_gravity", "_particles", "_picture_of_particles",
+                 "_box", "_photo", "_photo_of")
+
+    ## @param window - Window - the window which the object will be added to
+    # @param size - int - <b>(default: 3)</b> the width and height of each
+    # particle, in pixels
+    # @param gravity - tuple of (int * int) - <b>(default: (0, 0))</b> how
+    # much faster particles move every second, in pixels per second, in the x
+    # and y directions
+    # @param center - tuple of (int * int) - <b>(default: (200, 200))</b> where
+    # particles start if emit and burst aren't told where
+    def __init__(self, window, size=3, gravity=(0, 0), center=(200, 200)):
+        # type checking
+        if _validation:
+            assert isinstance(window, Window) and isinstance(size, int) and \
+                size > 0 and isinstance(gravity, tuple) and \
+                len(gravity) == 2 and isinstance(center, tuple) and \
+                len(center) == 2 and isinstance(center[0], int) and \
+                isinstance(center[1], int), \
+                "Make sure window is a Window, size is an int above 0, " + \
+                "gravity is a tuple of (int * int), and center is a tuple " + \
+                "of (int * int)."
+        # for inheritance
+        GraphicalObject.__init__(self)
+        # setting variables
+        self._window = window
+        self._size = size
+        self._gravity = gravity
+        self._center = center
+        # the particles, see _ParticleArrays and _ParticleLists
+        if numpy is not None:
+            self._particles = _ParticleArrays()
+        else:
+            self._particles = _ParticleLists()
+        # the particles are drawn into one picture, which is only drawn again
+        # after they've changed. it covers _box, (left, top, right, bottom),
+        # of the window.
+        self._picture_of_particles = None
+        self._box = None
+        self._photo = None
+        self._photo_of = None
+
+    # Creates the picture on the canvas and returns its tag.
+    def _create_item(self):
+        self._drawn = self._all_options()
+        return self._window._canvas.create_image(*self._coords(),
+                                                 **self._drawn)
+
+    # Returns the points which are given to the canvas, which is the top left
+    # corner of the picture.
+    def _coords(self):
+        self._picture()
+        return [(self._box[0], self._box[1])]
+
+    # Returns the kind of canvas item the object is drawn with.
+    def _kind(self):
+        return "image"
+
+    # Returns the style options which are given to the canvas.
+    def _options(self):
+        picture = self._picture()
+        if self._photo is None or self._photo_of is not picture:
+            self._photo = self._window._backend.update_photo(self._photo,
+                                                             picture)
+            self._photo_of = picture
+        return {"image": self._photo, "anchor": NW}
+
+    # Returns the picture of the particles as a PIL image, drawing it again
+    # if they've changed.
+    def _picture(self):
+        if self._picture_of_particles is None:
+            self._box = self._picture_box()
+            self._picture_of_particles = self._particles.draw(self._box,
+                                                              self._size)
+        return self._picture_of_particles
+
+    # Returns the part of the window the picture has to cover: the box
+    # around every particle, cut off at the edges of the window. The box is
+    # widened out to whole blocks of _PICTURE_BLOCK pixels, so that it only
+    # changes size now and then as the particles move, and a photo of the
+    # same size can be reused.
+    def _picture_box(self):
+        bounds = self._bounds()
+        block = _PICTURE_BLOCK
+        left = max(0, int(bounds[0] // block) * block)
+        top = max(0, int(bounds[1] // block) * block)
+        right = min(self._window._width, (int(bounds[2] // block) + 1) * block)
+        bottom = min(self._window._height,
+                     (int(bounds[3] // block) + 1) * block)
+        if right <= left or bottom <= top:
+            # none of the particles are in the window, so the picture is a
+            # single clear pixel
+            return (0, 0, 1, 1)
+        return (left, top, right, bottom)
+
+    # Returns the box around every particle.
+    def _bounds(self):
+        bounds = self._particles.bounds()
+        if bounds is None:
+            return (self._center[0], self._center[1],
+                    self._center[0], self._center[1])
+        half = self._size / 2
+        return (bounds[0] - half, bounds[1] - half,
+                bounds[2] + half, bounds[3] + half)
+
+    ## Adds one particle.
+    # @param velocity - tuple of (int * int) - how fast the particle moves, in
+    # pixels per second, in the x and y directions
+    # @param color - str - <b>(default: "black")</b> Can be either the
+    # name of a color ("yellow"), or a hex code ("#FFFF00"). An empty string
+    # is no color, and then no particle is added since it couldn't be seen.
+    # @param lifetime - int - <b>(default: 1000)</b> how long the particle
+    # lasts, in milliseconds
+    # @param position - tuple of (int * int) - <b>(default: None)</b> where the
+    # particle starts. By default it starts at the center of the system.
+    def emit(self, velocity, color="black", lifetime=1000, position=None):
+        # type checking
+        if _validation:
+            assert isinstance(velocity, tuple) and len(velocity) == 2 and \
+                isinstance(color, str) and isinstance(lifetime, int) and \
+                lifetime > 0 and (position is None or
+                                  (isinstance(position, tuple) and
+                                   len(position) == 2)), \
+                "Make sure velocity is a tuple of (int * int), color is a " + \
+                "string, lifetime is an int above 0, and position is a " + \
+                "tuple of (int * int)."
+        color = _pil_color(color)
+        if color is None:
+            return
+        if position is None:
+            position = self._center
+        self._particles.add([position], [velocity], color, lifetime)
+        self._changed()
+
+    ## Adds lots of particles at once, all starting from the same place and
+    # flying off in random directions.
+    # @param count - int - how many particles are added
+    # @param position - tuple of (int * int) - where the particles start
+    # @param speed - int - the fastest a particle can fly, in pixels per second
+    # @param color - str - <b>(default: "black")</b> Can be either the
+    # name of a color ("yellow"), or a hex code ("#FFFF00"). An empty string
+    # is no color, and then no particles are added since they couldn't be
+    # seen.
+    # @param lifetime - int - <b>(default: 1000)</b> how long each particle
+    # lasts, in milliseconds
+    def burst(self, count, position, speed, color="black", lifetime=1000):
+        # type checking
+        if _validation:
+            assert isinstance(count, int) and count >= 0 and \
+                isinstance(position, tuple) and len(position) == 2 and \
+                isinstance(speed, int) and isinstance(color, str) and \
+                isinstance(lifetime, int) and lifetime > 0, \
+                "Make sure count is an int of at least 0, position is a " + \
+                "tuple of (int * int), speed is an int, color is a " + \
+                "string, and lifetime is an int above 0."
+        color = _pil_color(color)
+        if color is None:
+            return
+        velocities = []
+        for i in range(count):
+            angle = random.uniform(0, math.pi * 2)
+            fraction = random.random()
+            velocities.append((speed * fraction * math.cos(angle),
+                               speed * fraction * math.sin(angle)))
+        self._particles.add([position] * count, velocities, color, lifetime)
+        self._changed()
+
+    ## Moves every particle forward in time. Particles which have lived for
+    # their lifetime are removed.
+    # @param dt - int - how many milliseconds have passed
+    def update(self, dt):
+        # type checking
+        if _validation:
+            assert isinstance(dt, (int, float)) and dt >= 0, \
+                "Make sure dt is a number of milliseconds, at least 0."
+        self._particles.step(dt / 1000, self._gravity)
+        self._changed()
+
+    ## Returns how many particles there are.
+    # @return count - int
+    def get_count(self):
+        return len(self._particles)
+
+    ## Removes every particle.
+    def clear(self):
+        self._particles.clear()
+        self._changed()
+
+    ## Moves where new particles start from. Particles which have already
+    # started aren't moved.
+    # @param dx - int
+    # @param dy - int
+    def move(self, dx, dy):
+        # type checking
+        if _validation:
+            assert isinstance(dx, int) and isinstance(dy, int), \
+                "Make sure dx and dy are both ints."
+        self._center = (self._center[0] + dx, self._center[1] + dy)
+
+    ## Moves where new particles start from to a point. Particles which have
+    # already started aren't moved.
+    # @param point - tuple of (int * int)
+    def move_to(self, point):
+        # type checking
+        if _validation:
+            assert isinstance(point, tuple) and len(point) == 2 and \
+                isinstance(point[0], int) and isinstance(point[1], int), \
+                "Make sure point is a tuple of (int * int)."
+        self._center = point
+
+    # Marks the picture as out of date and refreshes.
+    def _changed(self):
+        self._picture_of_particles = None
+        self._refresh()
+
+
+# how many pixels the edges of a ParticleSystem's picture are rounded out to
+_PICTURE_BLOCK = 64
+
+
+# Keeps the particles of a ParticleSystem in numpy arrays, one row per
+# particle, so every particle is moved with a handful of array operations.
+class _ParticleArrays:
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._age)
+
+    # Removes every particle.
+    def clear(self):
+        self._position = numpy.zeros((0, 2))
+        self._velocity = numpy.zeros((0, 2))
+        self._age = numpy.zeros(0)
+        self._lifetime = numpy.zeros(0)
+        self._color = numpy.zeros((0, 3), dtype=numpy.uint8)
+
+    # Adds particles which share a color and lifetime.
+    def add(self, positions, velocities, color, lifetime):
+        count = len(positions)
+        self._position = numpy.concatenate(
+            (self._position, numpy.array(positions, dtype=float)))
+        self._velocity = numpy.concatenate(
+            (self._velocity, numpy.array(velocities, dtype=float)))
+        self._age = numpy.concatenate((self._age, numpy.zeros(count)))
+        self._lifetime = numpy.concatenate(
+            (self._lifetime, numpy.full(count, float(lifetime))))
+        self._color = numpy.concatenate(
+            (self._color, numpy.tile(numpy.array(color[:3], numpy.uint8),
+                                     (count, 1))))
+
+    # Moves every particle forward by seconds and removes the ones which have
+    # lived for their lifetime.
+    def step(self, seconds, gravity):
+        self._velocity += numpy.array(gravity, dtype=float) * seconds
+        self._position += self._velocity * seconds
+        self._age += seconds * 1000
+        alive = self._age < self._lifetime
+        if not alive.all():
+            self._position = self._position[alive]
+            self._velocity = self._velocity[alive]
+            self._age = self._age[alive]
+            self._lifetime = self._lifetime[alive]
+            self._color = self._color[alive]
+
+    # Returns the box around every particle, or None if there aren't any.
+    def bounds(self):
+        if len(self._age) == 0:
+            return None
+        low = self._position.min(0)
+        high = self._position.max(0)
+        return (float(low[0]), float(low[1]), float(high[0]), float(high[1]))
+
+    # Draws the particles into a transparent picture of the part of the
+    # window in box, each one a square of side pixels which fades out as it
+    # ages.
+    def draw(self, box, side):
+        width = box[2] - box[0]
+        height = box[3] - box[1]
+        pixels = numpy.zeros((height, width, 4), dtype=numpy.uint8)
+        left = numpy.round(self._position[:, 0]).astype(int) - \
+            (side // 2 + box[0])
+        top = numpy.round(self._position[:, 1]).astype(int) - \
+            (side // 2 + box[1])
+        colors = numpy.empty((len(self._age), 4), dtype=numpy.uint8)
+        colors[:, :3] = self._color
+        colors[:, 3] = 255 * (1 - self._age / self._lifetime)
+        # each pixel of the squares is set for every particle at once
+        for dx in range(side):
+            for dy in range(side):
+                x = left + dx
+                y = top + dy
+                inside = (x >= 0) & (x < width) & (y >= 0) & (y < height)
+                pixels[y[inside], x[inside]] = colors[inside]
+        return image.fromarray(pixels, "RGBA")
+
+
+# Keeps the particles of a ParticleSystem in plain lists, for when numpy isn't
+# installed. Each particle is [x, y, x speed, y speed, age, lifetime, color].
+class _ParticleLists:
+    def __init__(self):
+        self.clear()
+
+    def __len__(self):
+        return len(self._particles)
+
+    # Removes every particle.
+    def clear(self):
+        self._particles = []
+
+    # Adds particles which share a color and lifetime.
+    def add(self, positions, velocities, color, lifetime):
+        color = tuple(color[:3])
+        for i in range(len(positions)):
+            self._particles.append([positions[i][0], positions[i][1],
+                                    velocities[i][0], velocities[i][1],
+                                    0, lifetime, color])
+
+    # Moves every particle forward by seconds and removes the ones which have
+    # lived for their lifetime.
+    def step(self, seconds, gravity):
+        gravityX = gravity[0] * seconds
+        gravityY = gravity[1] * seconds
+        alive = []
+        for particle in self._particles:
+            particle[2] += gravityX
+            particle[3] += gravityY
+            particle[0] += particle[2] * seconds
+            particle[1] += particle[3] * seconds
+            particle[4] += seconds * 1000
+            if particle[4] < particle[5]:
+                alive.append(particle)
+        self._particles = alive
+
+    # Returns the box around every particle, or None if there aren't any.
+    def bounds(self):
+        if not self._particles:
+            return None
+        xs = [particle[0] for particle in self._particles]
+        ys = [particle[1] for particle in self._particles]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    # Draws the particles into a transparent picture of the part of the
+    # window in box, each one a square of side pixels which fades out as it
+    # ages.
+    def draw(self, box, side):
+        picture = image.new("RGBA", (box[2] - box[0], box[3] - box[1]),
+                            (0, 0, 0, 0))
+        draw = idraw.Draw(picture)
+        for x, y, speedX, speedY, age, lifetime, color in self._particles:
+            left = round(x) - side // 2 - box[0]
+            top = round(y) - side // 2 - box[1]
+            alpha = int(255 * (1 - age / lifetime))
+            draw.rectangle([left, top, left + side - 1, top + side - 1],
+                           fill=color + (alpha,))
+        return picture
+
+
 #-------------------------------------------------------------------------------
 #
 #  Timer
@@ -1458,43 +4125,160 @@ class Rectangle(Fillable):
 #-------------------------------------------------------------------------------
         
 ## A class which continually runs a function after a delay.
+#
+# If the function takes a parameter, it is given the time (in milliseconds)
+# since the last time it was run, which can be used to keep animations moving
+# at the same speed however often the function actually runs. For example:
+# @code
+# def main(window):
+#     ball = Circle(window, 10, (0, 200))
+#     window.add(ball)
+#
+#     # moves the ball 100 pixels per second
+#     def step(dt):
+#         ball.move(round(dt / 10), 0)
+#
+#     timer = Timer(window, 16, step, fixed_rate=True)
+#     timer.start()
+# @endcode
+#
+# Normally the timer waits for the interval after the function finishes, so a
+# slow function makes the timer run slower. A fixed rate timer runs the
+# function on a fixed schedule instead and always gives it exactly the
+# interval. If the function falls behind, the timer runs it again right away
+# to catch up, up to max_catch_up extra times. Any runs beyond that are
+# skipped and counted as overruns.
 class Timer:
     ## @param window - Window - the window which the timer will use to start
     # and stop the animation
     # @param interval - int - the time (in milliseconds) that that the timer
-    # will wait
+    # will wait, which has to be more than 0 for a fixed rate timer
     # @param func - function - the function which will be run
-    def __init__(self, window, interval, func):
+    # @param fixed_rate - bool - <b>(default: False)</b> whether the function
+    # runs on a fixed schedule
+    # @param max_catch_up - int - <b>(default: 5)</b> how many extra times a
+    # fixed rate timer runs the function in a row when it falls behind
+    def __init__(self, window, interval, func, fixed_rate=False,
+                 max_catch_up=5):
         # type checking
         # i haven't found a good way of checking whether a func is a function
-        assert isinstance(window, Window) and isinstance(interval, int), \
-            "Make sure window is a Window, the interval is an int, and " + \
-            "the function is a function or process."
+        if _validation:
+            assert isinstance(window, Window) and isinstance(interval, int), \
+                "Make sure window is a Window, the interval is an int, and " + \
+                "the function is a function or process."
+            assert isinstance(fixed_rate, bool) and \
+                isinstance(max_catch_up, int), \
+                "Make sure fixed_rate is a bool and max_catch_up is an int."
+            assert interval > 0 or not fixed_rate, \
+                "Make sure the interval of a fixed rate timer is more than 0."
         self._window = window
-        self._func = func
         self._interval = interval
+        self._fixed_rate = fixed_rate
+        self._max_catch_up = max_catch_up
+        self._overruns = 0
+        self._tag = None
+        self._stopped = True
+        self.set_function(func)
 
     ## Sets the function which is going to be run.
     # @param func - function
     def set_function(self, func):
         # i haven't found a good way of checking whether a func is a function
         self._func = func
+        self._pass_dt = _takes_argument(func)
 
     ## Sets the interval between executions of the function.
     # @param interval - int
     def set_interval(self, interval):
-        assert isinstance(interval, int), \
-            "Make sure the interval is an int."
+        if _validation:
+            assert isinstance(interval, int), \
+                "Make sure the interval is an int."
+            assert interval > 0 or not self._fixed_rate, \
+                "Make sure the interval of a fixed rate timer is more than 0."
         self._interval = interval
 
+    ## Returns how many times a fixed rate timer has skipped running the
+    # function because it fell too far behind.
+    # @return overruns - int
+    def get_overruns(self):
+        return self._overruns
+
     ## Starts the timer.
     def start(self):
-        self._func()
-        self._tag = self._window._root.after(self._interval, self.start)
+        self._stopped = False
+        self._last = self._window._now()
+        self._deadline = self._last
+        self._tick()
 
-    ## Stops the timer.
+    ## Stops the timer. This can be called from inside the function.
     def stop(self):
-        self._window._root.after_cancel(self._tag)
+        # the flag stops a run which is in progress from scheduling the next
+        # one, since there's nothing to cancel until it does
+        self._stopped = True
+        if self._tag is not None:
+            self._window._root.after_cancel(self._tag)
+            self._tag = None
+
+    # Runs the function and schedules the next run. Nothing is scheduled if
+    # the function stopped the timer, or stopped and started it again, which
+    # has already scheduled the next run.
+    def _tick(self):
+        self._tag = None
+        if not self._fixed_rate:
+            now = self._window._now()
+            self._run(now - self._last)
+            self._last = now
+            if not self._stopped and self._tag is None:
+                self._tag = self._window._root.after(self._interval,
+                                                     self._tick)
+            return
+        # counts how many runs are due, including this one, and skips any
+        # which are more than max_catch_up behind. the interval is checked
+        # when it's given, but that can be turned off with set_validation
+        interval = max(1, self._interval)
+        now = self._window._now()
+        due = 1 + int((now - self._deadline) // interval)
+        if due > 1 + self._max_catch_up:
+            skipped = due - 1 - self._max_catch_up
+            self._overruns += skipped
+            self._deadline += skipped * interval
+            due -= skipped
+        for i in range(due):
+            self._run(interval)
+            self._deadline += interval
+            if self._stopped or self._tag is not None:
+                return
+        # the next run is scheduled from when it should happen rather than
+        # from now, so the time the function takes doesn't add up
+        delay = self._deadline - self._window._now()
+        self._tag = self._window._root.after(max(0, int(delay)), self._tick)
+
+    # Runs the function, giving it dt if it takes a parameter.
+    def _run(self, dt):
+        profiler = self._window._profiler
+        if profiler is not None:
+            started = profiler.clock()
+        if self._pass_dt:
+            self._func(dt)
+        else:
+            self._func()
+        if profiler is not None:
+            profiler.record("timers", self._func, started)
+
+
+# Returns whether a function needs to be given an argument when it's called.
+def _takes_argument(func):
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    for parameter in parameters:
+        if parameter.kind == parameter.VAR_POSITIONAL or \
+           (parameter.kind in (parameter.POSITIONAL_ONLY,
+                               parameter.POSITIONAL_OR_KEYWORD) and
+                parameter.default is parameter.empty):
+            return True
+    return False
 
 
 #-------------------------------------------------------------------------------
@@ -1514,9 +4298,10 @@ class Timer:
 def RunWithYieldDelay(window, func):
     # type checking
     # i haven't found a good way of checking whether a func is a function
-    assert isinstance(window, Window), \
-        "Make sure the window is a Window and the function is a func() -> " + \
-        "generator of int."
+    if _validation:
+        assert isinstance(window, Window), \
+            "Make sure the window is a Window and the function is a " + \
+            "func() -> generator of int."
     _RunWithYieldDelay(window, func)
 
 
@@ -1535,9 +4320,10 @@ def RunWithYieldDelay(window, func):
 # statement at the end of the function.
 class _RunWithYieldDelay:
     def __init__(self, window, func):
-        assert isinstance(window, Window), "Make sure the window is a " + \
-            "Window and the function is a function that returns a " + \
-            "generator of int."
+        if _validation:
+            assert isinstance(window, Window), "Make sure the window is a " + \
+                "Window and the function is a function that returns a " + \
+                "generator of int."
         self._func = func
         self._window = window
         self._run()
@@ -1546,12 +4332,17 @@ class _RunWithYieldDelay:
     def _run(self):
         # this will keep running with yield delay until a StopIteration is
         # raised, at which point it will stop
+        profiler = self._window._profiler
+        if profiler is not None:
+            started = profiler.clock()
         try:
             delay = next(self._func)
             if delay is None:
                 delay = 1000
         except StopIteration:
             delay = 0
+        if profiler is not None:
+            profiler.record("generators", self._func, started)
 
         if delay > 0:
             self._tag = self._window._root.after(delay, self._run)
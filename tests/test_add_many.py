@@ -0,0 +1,82 @@
+# Checks that adding a list of objects at once leaves the window the same as
+# adding them one at a time.
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+
+def _window():
+    return Window(400, 400, "white", "test", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+# Makes the same squares, at random depths, in a window.
+def _squares(window, count, seed):
+    rng = random.Random(seed)
+    squares = []
+    for i in range(count):
+        square = Square(window, 10, (rng.randrange(400), rng.randrange(400)))
+        square.set_depth(rng.randrange(5))
+        squares.append(square)
+    return squares
+
+
+# Returns the index of each square in the order they're drawn, back first.
+def _stacking(window, squares):
+    position = {square._tag: i for i, square in enumerate(squares)}
+    drawn = [position[tag] for tag in window._canvas.find_all()]
+    listed = [position[square._tag] for square in window._graphics]
+    assert drawn == listed
+    return drawn
+
+
+def _compare(before, count):
+    one = _window()
+    many = _window()
+    first = _squares(one, before + count, 1)
+    second = _squares(many, before + count, 1)
+    for square in first:
+        one.add(square)
+    for square in second[:before]:
+        many.add(square)
+    many.add_many(second[before:])
+    assert _stacking(one, first) == _stacking(many, second)
+    return many, second
+
+
+def test_empty_window():
+    _compare(0, 50)
+
+
+def test_behind_existing_objects():
+    _compare(20, 50)
+
+
+def test_in_front_of_existing_objects():
+    one = _window()
+    many = _window()
+    first = _squares(one, 30, 2)
+    second = _squares(many, 30, 2)
+    for square in first[:10] + second[:10]:
+        square.set_depth(10)
+    for square in first:
+        one.add(square)
+    for square in second[:10]:
+        many.add(square)
+    many.add_many(second[10:])
+    assert _stacking(one, first) == _stacking(many, second)
+
+
+def test_repeated_and_added_objects():
+    window = _window()
+    squares = _squares(window, 10, 3)
+    window.add(squares[0])
+    window.add_many(squares + squares[:3])
+    assert len(window._graphics) == 10
+    assert len(window._canvas.find_all()) == 10
+    assert len(window.objects_in((0, 0, 400, 400))) == 10
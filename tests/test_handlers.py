@@ -0,0 +1,77 @@
+# Checks that any object with some of the handler methods can handle events,
+# whether or not it extends EventHandler.
+
+import functools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+
+def _window():
+    return Window(400, 400, "white", "test", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+# What tkinter gives a binding, with only the fields Event reads.
+class _TkEvent:
+    x = 10
+    y = 10
+    x_root = 10
+    y_root = 10
+    num = 1
+    keysym = "a"
+    type = "4"
+
+
+# Only handles mouse presses, and doesn't extend EventHandler.
+class _PressOnly:
+    def __init__(self):
+        self.presses = []
+
+    def handle_mouse_press(self, event):
+        self.presses.append(event.get_mouse_location())
+
+
+class _Callable:
+    def __init__(self):
+        self.events = []
+
+    def __call__(self, event):
+        self.events.append(event)
+
+
+def _add(window, handler):
+    square = Square(window)
+    square.add_handler(handler)
+    window.add(square)
+    window._canvas.find_withtag = lambda tag: [square._tag]
+    return square
+
+
+def test_missing_methods_are_ignored():
+    window = _window()
+    handler = _PressOnly()
+    _add(window, handler)
+    window._dispatch_key("handle_key_press", _TkEvent())
+    window._dispatch_mouse("handle_mouse_release", _TkEvent())
+    window._dispatch_mouse("handle_mouse_press", _TkEvent())
+    assert handler.presses == [(10, 10)]
+
+
+def test_methods_without_code():
+    window = _window()
+    handler = _PressOnly()
+    keys = _Callable()
+    presses = []
+    handler.handle_key_press = keys
+    handler.handle_mouse_press = functools.partial(
+        lambda name, event: presses.append(name), "square")
+    _add(window, handler)
+    window._dispatch_key("handle_key_press", _TkEvent())
+    window._dispatch_mouse("handle_mouse_press", _TkEvent())
+    assert len(keys.events) == 1
+    assert keys.events[0].get_key() == "a"
+    assert presses == ["square"]
@@ -0,0 +1,114 @@
+# Checks that windows keep track of objects and handlers by identity, so
+# classes which define __eq__ (and so can't be hashed, or compare equal to
+# each other) work like any other.
+
+import os
+import sys
+import weakref
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+
+class _Tile(Rectangle):
+    # tiles in the same place are equal, which also makes them unhashable
+    def __eq__(self, other):
+        return isinstance(other, _Tile) and \
+            self.get_center() == other.get_center()
+
+
+class _HashableTile(Rectangle):
+    # every tile is equal to every other one and has the same hash
+    def __eq__(self, other):
+        return isinstance(other, _HashableTile)
+
+    def __hash__(self):
+        return 1
+
+
+def _window():
+    return Window(400, 400, "white", "test", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+def test_unhashable_objects():
+    window = _window()
+    first = _Tile(window, 10, 10, (50, 50))
+    second = _Tile(window, 10, 10, (50, 50))
+    window.add(first)
+    window.add(second)
+    first.move(1, 0)
+    assert len(window._graphics) == 2
+    assert len(window.objects_at((50, 50))) == 2
+    assert len(window.get_collisions([first, second])) == 1
+    window.remove(first)
+    window.remove(second)
+    assert len(window._graphics) == 0
+
+
+def test_equal_objects_stay_separate():
+    window = _window()
+    first = _HashableTile(window, 10, 10, (50, 50))
+    second = _HashableTile(window, 10, 10, (100, 100))
+    window.add_many([first, second])
+    with window.batch():
+        first.move(5, 0)
+        second.move(0, 5)
+    assert len(window._graphics) == 2
+    assert window.objects_at((55, 50)) == [first]
+    assert window.objects_at((100, 105)) == [second]
+    window.remove(second)
+    assert first in window._graphics
+    assert second not in window._graphics
+    window.remove(first)
+
+
+class _KeyCounter(EventHandler):
+    # every counter is equal to every other one, and can't be hashed
+    def __init__(self):
+        self.count = 0
+
+    def __eq__(self, other):
+        return isinstance(other, _KeyCounter)
+
+    def handle_key_press(self):
+        self.count += 1
+
+
+# What tkinter gives a binding, with only the fields Event reads.
+class _TkEvent:
+    x = 0
+    y = 0
+    x_root = 0
+    y_root = 0
+    num = "??"
+    keysym = "a"
+    type = "2"
+
+
+def test_equal_handlers_each_get_key_events():
+    window = _window()
+    first = _KeyCounter()
+    second = _KeyCounter()
+    for handler in (first, second):
+        square = Square(window)
+        square.add_handler(handler)
+        window.add(square)
+    window._dispatch_key("handle_key_press", _TkEvent())
+    assert (first.count, second.count) == (1, 1)
+    window.remove(square)
+    window._dispatch_key("handle_key_press", _TkEvent())
+    assert (first.count, second.count) == (2, 1)
+
+
+def test_objects_take_new_attributes():
+    window = _window()
+    for shape in [Square(window), Circle(window), Oval(window),
+                  Text(window, "hi"), Polygon(window, [(0, 0), (10, 0),
+                                                       (5, 5)])]:
+        shape.velocity = 3
+        window.add(shape)
+        shape.move(shape.velocity, 0)
+        assert shape.velocity == 3
+        assert weakref.ref(shape)() is shape
@@ -0,0 +1,124 @@
+# Checks that finding objects by where they are gives the same answers as
+# looking at every object, including objects far bigger than the window.
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+
+def _window():
+    return Window(400, 400, "white", "test", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+# Makes a scene of small squares with a few enormous rectangles among them.
+def _scene(window):
+    rng = random.Random(3)
+    shapes = []
+    for i in range(200):
+        center = (rng.randrange(-100, 500), rng.randrange(-100, 500))
+        shapes.append(Square(window, rng.randrange(5, 40), center))
+    shapes.append(Rectangle(window, 10 ** 6, 10 ** 6, (200, 200)))
+    shapes.append(Rectangle(window, 10 ** 6, 20, (0, 150)))
+    shapes.append(Rectangle(window, 2000, 2000, (5000, 5000)))
+    for shape in shapes:
+        window.add(shape)
+    return shapes
+
+
+def _covers(bounds, point):
+    return bounds[0] <= point[0] <= bounds[2] and \
+        bounds[1] <= point[1] <= bounds[3]
+
+
+def _boxes_overlap(first, second):
+    return first[0] <= second[2] and second[0] <= first[2] and \
+        first[1] <= second[3] and second[1] <= first[3]
+
+
+def test_large_objects_are_found():
+    window = _window()
+    shapes = _scene(window)
+    for point in [(0, 0), (200, 150), (-50, 450), (5000, 5000)]:
+        expected = {id(shape) for shape in shapes
+                    if _covers(shape._bounds(), point)}
+        assert {id(shape) for shape in window.objects_at(point)} == expected
+    for bbox in [(0, 0, 50, 50), (-10 ** 7, -10 ** 7, 10 ** 7, 10 ** 7),
+                 (4500, 4500, 4600, 4600)]:
+        expected = {id(shape) for shape in shapes
+                    if _boxes_overlap(shape._bounds(), bbox)}
+        assert {id(shape) for shape in window.objects_in(bbox)} == expected
+
+
+def test_large_objects_collide_once():
+    window = _window()
+    shapes = _scene(window)
+    pairs = window.get_collisions()
+    found = {frozenset((id(first), id(second))) for first, second in pairs}
+    assert len(found) == len(pairs)
+    expected = set()
+    for i in range(len(shapes)):
+        for j in range(i + 1, len(shapes)):
+            if _boxes_overlap(shapes[i]._bounds(), shapes[j]._bounds()):
+                expected.add(frozenset((id(shapes[i]), id(shapes[j]))))
+    # every collision found has overlapping boxes, and the enormous
+    # rectangle covers everything
+    assert found <= expected
+    background = id(shapes[-3])
+    assert sum(1 for pair in found if background in pair) == len(shapes) - 1
+
+
+def test_large_objects_move_quickly():
+    window = _window()
+    wall = Rectangle(window, 10 ** 6, 10 ** 6, (200, 200))
+    window.add(wall)
+    start = time.perf_counter()
+    for i in range(100):
+        wall.move(100, 0)
+        window.objects_at((0, 0))
+    assert time.perf_counter() - start < 1
+    assert len(window._index._cells) == 0
+
+
+# Returns whether get_collisions finds that two shapes overlap.
+def _collide(first, second):
+    window = first._window
+    window.add(first)
+    window.add(second)
+    return len(window.get_collisions()) == 1
+
+
+def test_ovals_collide_by_their_shape():
+    # each time, the bounding boxes overlap, so it's the oval's shape which
+    # decides
+    window = _window()
+    assert _collide(Oval(window, 30, 10, (100, 100)),
+                    Square(window, 6, (128, 100)))
+    window = _window()
+    assert not _collide(Oval(window, 30, 10, (100, 100)),
+                        Square(window, 6, (126, 112)))
+    window = _window()
+    oval = Oval(window, 30, 10, (100, 100))
+    oval.rotate(90)
+    assert _collide(oval, Square(window, 6, (100, 128)))
+    window = _window()
+    oval = Oval(window, 30, 10, (100, 100))
+    oval.rotate(90)
+    assert not _collide(oval, Square(window, 6, (112, 126)))
+    window = _window()
+    assert _collide(Oval(window, 30, 10, (100, 100)),
+                    Circle(window, 8, (126, 112)))
+    window = _window()
+    assert not _collide(Oval(window, 30, 10, (100, 100)),
+                        Circle(window, 5, (126, 112)))
+    window = _window()
+    assert _collide(Oval(window, 30, 10, (100, 100)),
+                    Oval(window, 10, 30, (135, 100)))
+    window = _window()
+    assert not _collide(Oval(window, 30, 10, (100, 100)),
+                        Oval(window, 4, 3, (126, 112)))
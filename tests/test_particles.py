@@ -0,0 +1,56 @@
+# Checks that particle systems draw their particles where they are, in any
+# color tkinter understands.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import cs110graphics
+from cs110graphics import *
+
+
+def _window():
+    return Window(400, 300, "white", "test", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+def _check(lists):
+    numpy = cs110graphics.numpy
+    if lists:
+        cs110graphics.numpy = None
+    try:
+        window = _window()
+        system = ParticleSystem(window, size=4)
+    finally:
+        cs110graphics.numpy = numpy
+    window.add(system)
+    system.emit((0, 0), "light blue", 1000, (250, 100))
+    system.emit((0, 0), "#FF0000", 1000, (30, 280))
+    # one particle far outside the window, which isn't drawn
+    system.emit((0, 0), "black", 1000, (5000, -5000))
+    picture = window.get_image()
+    assert picture.getpixel((250, 100)) == (173, 216, 230)
+    assert picture.getpixel((30, 280)) == (255, 0, 0)
+    assert picture.getpixel((150, 150)) == (255, 255, 255)
+    # the picture only covers the part of the window with particles in it
+    system.clear()
+    system.emit((0, 0), "black", 1000, (100, 100))
+    assert system._picture().size == (64, 64)
+    assert window.get_image().getpixel((100, 100)) == (0, 0, 0)
+    system.emit((0, 0), "black", 1000, (250, 10))
+    assert system._picture().size == (192, 128)
+    # particles with no color aren't added
+    system.emit((0, 0), "", 1000, (300, 200))
+    system.burst(10, (300, 200), 50, "")
+    assert system.get_count() == 2
+    window.get_image()
+
+
+def test_arrays():
+    if cs110graphics.numpy is not None:
+        _check(False)
+
+
+def test_lists():
+    _check(True)
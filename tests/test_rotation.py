@@ -0,0 +1,96 @@
+# Checks that turning an object all the way around a pivot, one degree at a
+# time, brings it back to exactly where it started.
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+
+def _window():
+    return Window(400, 400, "white", "test", lambda window: None,
+                  backend=HeadlessBackend())
+
+
+# Turns a shape 360 times by one degree around (200, 200) and returns the
+# canvas coordinates it had before and after.
+def _round_trip(window, shape):
+    window.add(shape)
+    shape.set_pivot((200, 200))
+    before = window._canvas.coords(shape._tag)
+    for i in range(360):
+        shape.rotate(1)
+    return before, window._canvas.coords(shape._tag)
+
+
+def _close(first, second):
+    return len(first) == len(second) and \
+        all(abs(a - b) < 1e-6 for a, b in zip(first, second))
+
+
+def test_square_round_trip():
+    window = _window()
+    square = Square(window, 40, (100, 100))
+    before, after = _round_trip(window, square)
+    assert square.get_center() == (100, 100)
+    assert square.get_pivot() == (200, 200)
+    assert _close(before, after)
+    square.move_to((150, 120))
+    assert square.get_center() == (150, 120)
+    assert _close(window._canvas.coords(square._tag),
+                  [130, 100, 170, 100, 170, 140, 130, 140])
+    square.scale(0.5)
+    assert square.get_center() == (150, 120)
+    assert _close(window._canvas.coords(square._tag),
+                  [140, 110, 160, 110, 160, 130, 140, 130])
+
+
+def test_polygon_round_trip():
+    window = _window()
+    triangle = Polygon(window, [(90, 90), (110, 90), (100, 120)])
+    before, after = _round_trip(window, triangle)
+    assert triangle.get_center() == (100, 100)
+    assert _close(before, after)
+
+
+def test_circle_round_trip():
+    window = _window()
+    circle = Circle(window, 20, (100, 100))
+    before, after = _round_trip(window, circle)
+    assert circle.get_center() == (100, 100)
+    assert _close(before, after)
+    circle.move_to((150, 120))
+    assert _close(window._canvas.coords(circle._tag), [130, 100, 170, 140])
+
+
+def test_oval_round_trip():
+    window = _window()
+    oval = Oval(window, 30, 10, (100, 100))
+    before, after = _round_trip(window, oval)
+    assert oval.get_center() == (100, 100)
+    assert _close(before, after)
+
+
+
+# Checks that the points of circles and ovals are their outlines, whether
+# they're drawn as canvas ovals or as polygons.
+def test_oval_points_are_outlines():
+    window = _window()
+    circle = Circle(window, 20, (100, 100))
+    oval = Oval(window, 30, 10, (100, 100))
+    window.add(circle)
+    window.add(oval)
+    count = len(oval._points)
+    for turn, shape, radiusX, radiusY in [(0, circle, 20, 20),
+                                          (0, oval, 30, 10),
+                                          (90, oval, 10, 30)]:
+        shape.rotate(turn)
+        points = shape._points
+        assert len(points) >= 12
+        for x, y in points:
+            distance = ((x - 100) / radiusX) ** 2 + ((y - 100) / radiusY) ** 2
+            assert abs(distance - 1) < 0.2
+    oval.rotate(30)
+    assert len(oval._points) == count
@@ -0,0 +1,86 @@
+# Checks starting and stopping timers, including from inside their function.
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from cs110graphics import *
+
+
+# The window's loop stops after 100 simulated milliseconds.
+def _window():
+    return Window(400, 400, "white", "test", lambda window: None,
+                  backend=HeadlessBackend(100))
+
+
+@pytest.mark.parametrize("fixed_rate", [False, True])
+def test_stop_inside_function(fixed_rate):
+    window = _window()
+    runs = []
+
+    def tick():
+        runs.append(1)
+        if len(runs) == 3:
+            timer.stop()
+
+    timer = Timer(window, 10, tick, fixed_rate=fixed_rate)
+    timer.start()
+    window._root.mainloop()
+    assert len(runs) == 3
+
+
+def test_restart_inside_function():
+    window = _window()
+    runs = []
+
+    def tick():
+        runs.append(1)
+        if len(runs) == 2:
+            timer.stop()
+            timer.start()
+
+    timer = Timer(window, 10, tick)
+    timer.start()
+    window._root.mainloop()
+    # runs at 0, 10, 10 (when it's started again), 20, ... 100, so the
+    # restart only schedules one next run
+    assert len(runs) == 12
+
+
+def test_stop_before_start():
+    window = _window()
+    Timer(window, 10, lambda: None).stop()
+
+
+def test_fixed_rate_needs_an_interval():
+    window = _window()
+    with pytest.raises(AssertionError):
+        Timer(window, 0, lambda: None, fixed_rate=True)
+    timer = Timer(window, 10, lambda: None, fixed_rate=True)
+    with pytest.raises(AssertionError):
+        timer.set_interval(0)
+
+
+def test_fixed_rate_without_validation():
+    window = _window()
+    runs = []
+    set_validation(False)
+    try:
+        timer = Timer(window, 0, lambda: runs.append(1), fixed_rate=True)
+        timer.start()
+    finally:
+        set_validation(True)
+    window._root.mainloop()
+    assert runs
+
+
+def test_zero_interval_finishes():
+    window = _window()
+    runs = []
+    Timer(window, 0, lambda: runs.append(1)).start()
+    window._root.mainloop()
+    assert window._root._clock == 100
+    assert 50 <= len(runs) <= 101